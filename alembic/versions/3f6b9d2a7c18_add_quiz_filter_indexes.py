@@ -0,0 +1,47 @@
+"""add quiz filter indexes
+
+Revision ID: 3f6b9d2a7c18
+Revises: a8c2e5f0d417
+Create Date: 2026-10-18 23:05:42.617390
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6b9d2a7c18"
+down_revision: Union[str, None] = "a8c2e5f0d417"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# CONCURRENTLY не блокирует запись в quiz, но не работает внутри транзакции,
+# поэтому индексы строятся в autocommit-блоке. Если построение упало, остаётся
+# INVALID-индекс: его надо удалить (DROP INDEX CONCURRENTLY) и повторить миграцию.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_subject_id_difficulty_id",
+            "quiz",
+            ["subject_id", "difficulty", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_quiz_difficulty_id",
+            "quiz",
+            ["difficulty", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name in ("ix_quiz_difficulty_id", "ix_quiz_subject_id_difficulty_id"):
+            op.drop_index(index_name, table_name="quiz", postgresql_concurrently=True, if_exists=True)
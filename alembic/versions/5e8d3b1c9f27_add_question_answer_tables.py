@@ -0,0 +1,93 @@
+"""add question answer tables
+
+Revision ID: 5e8d3b1c9f27
+Revises: 9c1f2e7a4b35
+Create Date: 2026-10-18 13:41:05.117342
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8d3b1c9f27"
+down_revision: Union[str, None] = "9c1f2e7a4b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Данные сюда не переносятся: миграция только готовит схему. Перенос делает онлайн-бэкфилл
+    # (python -m src.cli.backfill_questions) уже после переключения на QUIZ_STORAGE_LAYOUT=normalized.
+    op.create_table(
+        "question",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("quiz_id", sa.Uuid(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quiz.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_question_quiz_id_position", "question", ["quiz_id", "position"], unique=False)
+    op.create_table(
+        "answer",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("question_id", sa.Uuid(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["question_id"], ["question.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_answer_question_id_position", "answer", ["question_id", "position"], unique=False)
+    op.alter_column(
+        "quiz",
+        "questions",
+        existing_type=postgresql.ARRAY(postgresql.JSONB(astext_type=sa.Text())),
+        nullable=True,
+    )
+
+
+def downgrade() -> None:
+    # Возвращаем вопросы, успевшие переехать в таблицы, обратно в JSONB.
+    op.execute(
+        """
+        UPDATE quiz SET questions = (
+            SELECT array_agg(
+                jsonb_build_object(
+                    'id', question.id,
+                    'text', question.text,
+                    'answers', (
+                        SELECT coalesce(
+                            jsonb_agg(
+                                jsonb_build_object(
+                                    'id', answer.id, 'text', answer.text, 'is_correct', answer.is_correct
+                                )
+                                ORDER BY answer.position
+                            ),
+                            '[]'::jsonb
+                        )
+                        FROM answer WHERE answer.question_id = question.id
+                    )
+                )
+                ORDER BY question.position
+            )
+            FROM question WHERE question.quiz_id = quiz.id
+        )
+        WHERE questions IS NULL
+        """
+    )
+    op.alter_column(
+        "quiz",
+        "questions",
+        existing_type=postgresql.ARRAY(postgresql.JSONB(astext_type=sa.Text())),
+        nullable=False,
+    )
+    op.drop_index("ix_answer_question_id_position", table_name="answer")
+    op.drop_table("answer")
+    op.drop_index("ix_question_quiz_id_position", table_name="question")
+    op.drop_table("question")
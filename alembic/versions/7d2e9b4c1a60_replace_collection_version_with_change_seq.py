@@ -0,0 +1,103 @@
+"""replace collection version row with per-row change_seq
+
+Revision ID: 7d2e9b4c1a60
+Revises: f3c9a1e5b742
+Create Date: 2026-10-19 14:37:51.204116
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2e9b4c1a60"
+down_revision: Union[str, None] = "f3c9a1e5b742"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VERSIONED_COLLECTIONS = ("subject", "quiz")
+
+
+# Общая строка collection_version, которую обновлял каждый оператор, ставила все записи
+# в одну таблицу в очередь до коммита. Теперь каждая записанная строка получает свежий
+# nextval своей последовательности: nextval не транзакционный и никого не ждёт. Версия
+# списка — (count, sum(change_seq)) по видимым строкам, её считает index-only scan.
+def upgrade() -> None:
+    for collection in VERSIONED_COLLECTIONS:
+        op.execute(f"DROP TRIGGER {collection}_collection_version_bump ON {collection}")
+    op.execute("DROP FUNCTION bump_collection_version()")
+    op.drop_table("collection_version")
+
+    op.execute(
+        """
+        CREATE FUNCTION stamp_change_seq() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.change_seq := nextval(TG_TABLE_NAME || '_change_seq');
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    for collection in VERSIONED_COLLECTIONS:
+        op.execute(f"CREATE SEQUENCE {collection}_change_seq")
+        op.add_column(
+            collection,
+            sa.Column(
+                "change_seq",
+                sa.BigInteger(),
+                server_default=sa.text(f"nextval('{collection}_change_seq')"),
+                nullable=False,
+            ),
+        )
+        op.create_index(f"ix_{collection}_change_seq", collection, ["change_seq"], unique=False)
+        # Переименование предмета и правка строк вопросов обновляют строку quiz (search_vector),
+        # так что и они получают новый change_seq.
+        op.execute(
+            f"""
+            CREATE TRIGGER {collection}_change_seq_stamp
+            BEFORE INSERT OR UPDATE ON {collection}
+            FOR EACH ROW EXECUTE FUNCTION stamp_change_seq()
+            """
+        )
+
+
+def downgrade() -> None:
+    for collection in VERSIONED_COLLECTIONS:
+        op.execute(f"DROP TRIGGER {collection}_change_seq_stamp ON {collection}")
+        op.drop_index(f"ix_{collection}_change_seq", table_name=collection)
+        op.drop_column(collection, "change_seq")
+        op.execute(f"DROP SEQUENCE {collection}_change_seq")
+    op.execute("DROP FUNCTION stamp_change_seq()")
+
+    op.create_table(
+        "collection_version",
+        sa.Column("name", sa.String(length=63), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="1", nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        "INSERT INTO collection_version (name) VALUES "
+        + ", ".join(f"('{collection}')" for collection in VERSIONED_COLLECTIONS)
+    )
+    op.execute(
+        """
+        CREATE FUNCTION bump_collection_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE collection_version SET version = version + 1 WHERE name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for collection in VERSIONED_COLLECTIONS:
+        op.execute(
+            f"""
+            CREATE TRIGGER {collection}_collection_version_bump
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {collection}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_collection_version()
+            """
+        )
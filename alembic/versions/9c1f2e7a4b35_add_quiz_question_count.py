@@ -0,0 +1,35 @@
+"""add quiz question count
+
+Revision ID: 9c1f2e7a4b35
+Revises: 4bdaca1d9213
+Create Date: 2026-10-18 10:12:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1f2e7a4b35"
+down_revision: Union[str, None] = "4bdaca1d9213"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "quiz",
+        sa.Column(
+            "question_count",
+            sa.Integer(),
+            sa.Computed("cardinality(questions)", persisted=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("quiz", "question_count")
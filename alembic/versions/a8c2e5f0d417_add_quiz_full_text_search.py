@@ -0,0 +1,130 @@
+"""add quiz full text search
+
+Revision ID: a8c2e5f0d417
+Revises: d41f7a9e2c53
+Create Date: 2026-10-18 21:47:36.215804
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a8c2e5f0d417"
+down_revision: Union[str, None] = "d41f7a9e2c53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Должна совпадать с SEARCH_CONFIG в src/adapters/sqlalchemy/repositories/quiz.py.
+# В russian латиница идёт через english_stem, так что смешанные тексты тоже стеммятся.
+SEARCH_CONFIG = "russian"
+
+
+def upgrade() -> None:
+    op.add_column("quiz", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+
+    # Тексты вопросов берутся из обоих раскладов: массива quiz.questions и таблицы question.
+    op.execute(
+        f"""
+        CREATE FUNCTION quiz_search_vector(
+            p_quiz_id uuid, p_name text, p_description text, p_subject_id uuid, p_questions jsonb[]
+        ) RETURNS tsvector LANGUAGE sql STABLE AS $$
+            SELECT
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(p_name, '')), 'A')
+                || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                    (SELECT name FROM subject WHERE id = p_subject_id), ''
+                )), 'B')
+                || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(p_description, '')), 'B')
+                || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                    (SELECT string_agg(q ->> 'text', ' ') FROM unnest(p_questions) AS q), ''
+                )), 'C')
+                || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                    (SELECT string_agg(text, ' ') FROM question WHERE quiz_id = p_quiz_id), ''
+                )), 'C')
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION quiz_set_search_vector() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := quiz_search_vector(
+                NEW.id, NEW.name, NEW.description, NEW.subject_id, NEW.questions
+            );
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER quiz_search_vector_update
+        BEFORE INSERT OR UPDATE OF name, description, subject_id, questions ON quiz
+        FOR EACH ROW EXECUTE FUNCTION quiz_set_search_vector()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION subject_refresh_quiz_search_vector() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE quiz SET search_vector = quiz_search_vector(id, name, description, subject_id, questions)
+            WHERE subject_id = NEW.id;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER subject_name_search_vector_update
+        AFTER UPDATE OF name ON subject
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION subject_refresh_quiz_search_vector()
+        """
+    )
+
+    # Триггеры на уровне оператора: пачка вопросов пересчитывает каждый квиз один раз, а не построчно.
+    op.execute(
+        """
+        CREATE FUNCTION question_refresh_quiz_search_vector() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE quiz SET search_vector = quiz_search_vector(id, name, description, subject_id, questions)
+            WHERE id IN (SELECT DISTINCT quiz_id FROM changed_questions);
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for event, transition in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        op.execute(
+            f"""
+            CREATE TRIGGER question_{event.lower()}_search_vector_update
+            AFTER {event} ON question
+            REFERENCING {transition} TABLE AS changed_questions
+            FOR EACH STATEMENT EXECUTE FUNCTION question_refresh_quiz_search_vector()
+            """
+        )
+
+    op.execute(
+        "UPDATE quiz SET search_vector = quiz_search_vector(id, name, description, subject_id, questions)"
+    )
+    op.create_index("ix_quiz_search_vector", "quiz", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quiz_search_vector", table_name="quiz", postgresql_using="gin")
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER question_{event}_search_vector_update ON question")
+    op.execute("DROP FUNCTION question_refresh_quiz_search_vector()")
+    op.execute("DROP TRIGGER subject_name_search_vector_update ON subject")
+    op.execute("DROP FUNCTION subject_refresh_quiz_search_vector()")
+    op.execute("DROP TRIGGER quiz_search_vector_update ON quiz")
+    op.execute("DROP FUNCTION quiz_set_search_vector()")
+    op.execute("DROP FUNCTION quiz_search_vector(uuid, text, text, uuid, jsonb[])")
+    op.drop_column("quiz", "search_vector")
@@ -0,0 +1,54 @@
+"""add attempt tables and quiz version
+
+Revision ID: b7a4c2d81e06
+Revises: 5e8d3b1c9f27
+Create Date: 2026-10-18 16:02:47.530911
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7a4c2d81e06"
+down_revision: Union[str, None] = "5e8d3b1c9f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("quiz", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    op.create_table(
+        "attempt",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("quiz_id", sa.Uuid(), nullable=False),
+        sa.Column("quiz_version", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("question_count", sa.Integer(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quiz.id"], onupdate="RESTRICT", ondelete="RESTRICT"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_attempt_user_id_quiz_id", "attempt", ["user_id", "quiz_id"], unique=False)
+    op.create_table(
+        "attempt_answer",
+        sa.Column("attempt_id", sa.Uuid(), nullable=False),
+        sa.Column("question_id", sa.Uuid(), nullable=False),
+        sa.Column("answer_ids", sa.ARRAY(sa.Uuid()), nullable=False),
+        sa.Column("answered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["attempt_id"], ["attempt.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("attempt_id", "question_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("attempt_answer")
+    op.drop_index("ix_attempt_user_id_quiz_id", table_name="attempt")
+    op.drop_table("attempt")
+    op.drop_column("quiz", "version")
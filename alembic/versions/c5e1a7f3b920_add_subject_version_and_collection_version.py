@@ -0,0 +1,67 @@
+"""add subject version and collection version
+
+Revision ID: c5e1a7f3b920
+Revises: 3f6b9d2a7c18
+Create Date: 2026-10-19 00:12:08.394517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e1a7f3b920"
+down_revision: Union[str, None] = "3f6b9d2a7c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VERSIONED_COLLECTIONS = ("subject", "quiz")
+
+
+def upgrade() -> None:
+    op.add_column("subject", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+    op.create_table(
+        "collection_version",
+        sa.Column("name", sa.String(length=63), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="1", nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.execute(
+        "INSERT INTO collection_version (name) VALUES "
+        + ", ".join(f"('{collection}')" for collection in VERSIONED_COLLECTIONS)
+    )
+
+    # На уровне оператора: пачка строк увеличивает версию один раз. Версия меняется в той же
+    # транзакции, что и данные, и видна вместе с ними. Строка версии заблокирована до коммита,
+    # так что параллельные записи в одну таблицу идут по очереди — для админских таблиц это приемлемо.
+    op.execute(
+        """
+        CREATE FUNCTION bump_collection_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE collection_version SET version = version + 1 WHERE name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    for collection in VERSIONED_COLLECTIONS:
+        op.execute(
+            f"""
+            CREATE TRIGGER {collection}_collection_version_bump
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {collection}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_collection_version()
+            """
+        )
+
+
+def downgrade() -> None:
+    for collection in VERSIONED_COLLECTIONS:
+        op.execute(f"DROP TRIGGER {collection}_collection_version_bump ON {collection}")
+    op.execute("DROP FUNCTION bump_collection_version()")
+    op.drop_table("collection_version")
+    op.drop_column("subject", "version")
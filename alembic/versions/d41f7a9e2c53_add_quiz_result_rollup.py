@@ -0,0 +1,56 @@
+"""add quiz result rollup
+
+Revision ID: d41f7a9e2c53
+Revises: b7a4c2d81e06
+Create Date: 2026-10-18 19:24:11.803265
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7a9e2c53"
+down_revision: Union[str, None] = "b7a4c2d81e06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_result_rollup",
+        sa.Column("quiz_id", sa.Uuid(), nullable=False),
+        sa.Column("subject_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "difficulty",
+            postgresql.ENUM("EASY", "MEDIUM", "HARD", name="difficulty", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("attempt_count", sa.BigInteger(), nullable=False),
+        sa.Column("score_sum", sa.BigInteger(), nullable=False),
+        sa.Column("question_count_sum", sa.BigInteger(), nullable=False),
+        sa.Column("last_finished_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quiz.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subject.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("quiz_id", "subject_id", "difficulty"),
+    )
+    # Уже завершённые попытки относим к текущим предмету и сложности квиза.
+    op.execute(
+        """
+        INSERT INTO quiz_result_rollup
+            (quiz_id, subject_id, difficulty, attempt_count, score_sum, question_count_sum, last_finished_at)
+        SELECT quiz.id, quiz.subject_id, quiz.difficulty,
+            count(*), sum(attempt.score), sum(attempt.question_count), max(attempt.finished_at)
+        FROM attempt JOIN quiz ON quiz.id = attempt.quiz_id
+        WHERE attempt.finished_at IS NOT NULL
+        GROUP BY quiz.id, quiz.subject_id, quiz.difficulty
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quiz_result_rollup")
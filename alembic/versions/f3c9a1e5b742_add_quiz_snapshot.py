@@ -0,0 +1,76 @@
+"""add quiz snapshot
+
+Revision ID: f3c9a1e5b742
+Revises: e2b8d4f6a0c1
+Create Date: 2026-10-19 11:02:14.318420
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c9a1e5b742"
+down_revision: Union[str, None] = "e2b8d4f6a0c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_snapshot",
+        sa.Column("quiz_id", sa.Uuid(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("time", sa.Interval(), nullable=False),
+        sa.Column("questions", postgresql.ARRAY(postgresql.JSONB(astext_type=sa.Text())), nullable=False),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quiz.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("quiz_id", "version"),
+    )
+    # Незавершённым попыткам на текущей версии квиза нужен её снимок: из массива или из таблиц
+    # question/answer, если квиз уже перенесён в них. Вопросов более старых версий в базе нет.
+    op.execute(
+        """
+        INSERT INTO quiz_snapshot (quiz_id, version, time, questions)
+        SELECT quiz.id, quiz.version, quiz.time, COALESCE(
+            quiz.questions,
+            ARRAY(
+                SELECT jsonb_build_object(
+                    'id', question.id,
+                    'text', question.text,
+                    'answers', COALESCE(
+                        (
+                            SELECT jsonb_agg(
+                                jsonb_build_object(
+                                    'id', answer.id, 'text', answer.text, 'is_correct', answer.is_correct
+                                )
+                                ORDER BY answer.position
+                            )
+                            FROM answer
+                            WHERE answer.question_id = question.id
+                        ),
+                        '[]'::jsonb
+                    )
+                )
+                FROM question
+                WHERE question.quiz_id = quiz.id
+                ORDER BY question.position
+            )
+        )
+        FROM quiz
+        WHERE EXISTS (
+            SELECT 1
+            FROM attempt
+            WHERE attempt.quiz_id = quiz.id
+                AND attempt.quiz_version = quiz.version
+                AND attempt.finished_at IS NULL
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quiz_snapshot")
@@ -0,0 +1,110 @@
+"""
+Оценка пачки попыток одного квиза: BatchGrader против цикла по попыткам.
+
+    python -m benchmarks.batch_grading
+
+Квиз из 20 вопросов по 4 ответа, в каждой попытке отвечены все вопросы.
+Оба варианта считают одно и то же: баллы, правильность по вопросам и частичный балл.
+"""
+import gc
+import random
+import time
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from src.application.domain.attempt import AnswerKey
+from src.application.domain.grading import BatchGrader
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+
+
+SUBMISSION_COUNTS = (10_000, 100_000)
+QUESTION_COUNT = 20
+ANSWER_COUNT = 4
+
+
+def make_quiz() -> Quiz:
+    return Quiz(
+        id=uuid4(),
+        name="Quiz",
+        description="Quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.MEDIUM,
+        subject=Subject(id=uuid4(), name="Subject", description="Subject"),
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Question",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Answer", is_correct=number < 1 + question_number % 2)
+                    for number in range(ANSWER_COUNT)
+                ],
+            )
+            for question_number in range(QUESTION_COUNT)
+        ],
+    )
+
+
+def make_submissions(quiz: Quiz, count: int) -> list[dict[UUID, frozenset[UUID]]]:
+    rng = random.Random(42)
+    return [
+        {
+            question.id: frozenset(answer.id for answer in rng.sample(question.answers, rng.randint(1, 2)))
+            for question in quiz.questions
+        }
+        for _ in range(count)
+    ]
+
+
+def grade_naive(key: AnswerKey, submissions: list[dict[UUID, frozenset[UUID]]]) -> list[tuple]:
+    grades = []
+    for submission in submissions:
+        question_correct, question_credit = [], []
+        for question in key.questions:
+            correct = key.correct_answers[question.id]
+            chosen = submission.get(question.id, frozenset())
+            question_correct.append(chosen == correct)
+            right = len(chosen & correct)
+            question_credit.append(max(right - (len(chosen) - right), 0) / len(correct))
+        grades.append((sum(question_correct), question_correct, question_credit, sum(question_credit)))
+    return grades
+
+
+def best_time(function, *args) -> float:
+    timings = []
+    for _ in range(3):
+        gc.collect()
+        started = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    quiz = make_quiz()
+    key = AnswerKey.from_quiz(quiz, quiz_version=1)
+    grader = BatchGrader.from_quiz(quiz)
+    print(f"quiz: {QUESTION_COUNT} questions x {ANSWER_COUNT} answers")
+
+    for count in SUBMISSION_COUNTS:
+        submissions = make_submissions(quiz, count)
+        naive = best_time(grade_naive, key, submissions)
+        encode = best_time(grader.encode, submissions)
+        chosen = grader.encode(submissions)
+        vectorized = best_time(grader.grade_encoded, chosen)
+
+        expected = grade_naive(key, submissions)
+        grades = grader.grade_encoded(chosen)
+        assert grades.scores.tolist() == [grade[0] for grade in expected]
+        assert np.allclose(grades.partial_credit, [grade[3] for grade in expected])
+
+        print(
+            f"{count} submissions: naive loop {naive * 1000:.1f} ms, "
+            f"encode {encode * 1000:.1f} ms + grade {vectorized * 1000:.1f} ms "
+            f"({naive / (encode + vectorized):.1f}x, grading alone {naive / vectorized:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Сравнение общих convert_* функций с ConverterRegistry на квизах реального размера.
+
+    python -m benchmarks.converters
+"""
+import timeit
+from datetime import timedelta
+from uuid import uuid4
+
+from src.adapters.sqlalchemy.converters import serializable_converters
+from src.adapters.sqlalchemy.mappers import convert_dataclass_to_dict, convert_dict_to_serializable
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+
+
+# (вопросов, ответов на вопрос)
+QUIZ_SIZES = [(10, 4), (100, 4), (100, 20)]
+
+
+def make_quiz(question_count: int, answer_count: int) -> Quiz:
+    return Quiz(
+        id=uuid4(),
+        name="Benchmark quiz",
+        description="Benchmark quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.MEDIUM,
+        subject=Subject(id=uuid4(), name="Subject", description="Subject"),
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text=f"Question {question_number}",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text=f"Answer {answer_number}", is_correct=answer_number == 0)
+                    for answer_number in range(answer_count)
+                ],
+            )
+            for question_number in range(question_count)
+        ],
+    )
+
+
+def convert_generic(quiz: Quiz):
+    return convert_dict_to_serializable(convert_dataclass_to_dict(quiz.questions))
+
+
+def convert_registry(quiz: Quiz):
+    return serializable_converters.convert(quiz.questions)
+
+
+def best_of(function, quiz: Quiz, number: int) -> float:
+    return min(timeit.repeat(lambda: function(quiz), number=number, repeat=5)) / number
+
+
+def main():
+    print(f"{'questions x answers':>20} {'generic, ms':>12} {'registry, ms':>13} {'speedup':>8}")
+    for question_count, answer_count in QUIZ_SIZES:
+        quiz = make_quiz(question_count, answer_count)
+        assert convert_generic(quiz) == convert_registry(quiz)
+        number = max(1, 20000 // (question_count * answer_count))
+        generic = best_of(convert_generic, quiz, number)
+        registry = best_of(convert_registry, quiz, number)
+        print(
+            f"{f'{question_count} x {answer_count}':>20} {generic * 1000:>12.3f} {registry * 1000:>13.3f} "
+            f"{generic / registry:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Загрузка 10k квизов из строк хранилища в доменные объекты: время и память.
+
+    python -m benchmarks.domain_loading
+
+Строки — легковесные заглушки QuizModel с JSONB-вопросами, так что меряется
+только маппинг в домен, без базы и без ORM.
+"""
+import gc
+import time
+import tracemalloc
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.adapters.sqlalchemy.mappers import QuizSQLAlchemyMapper
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+
+
+QUIZ_COUNT = 10_000
+QUESTION_COUNT = 10
+ANSWER_COUNT = 4
+
+
+def make_rows() -> list[SimpleNamespace]:
+    subject = SimpleNamespace(id=uuid4(), name="Subject", description="Subject")
+    return [
+        SimpleNamespace(
+            id=uuid4(),
+            name="Quiz",
+            description="Quiz",
+            time=timedelta(minutes=30),
+            difficulty=Difficulty.MEDIUM,
+            subject=subject,
+            questions=[
+                {
+                    "id": str(uuid4()),
+                    "text": f"Question {question_number}",
+                    "answers": [
+                        {
+                            "id": str(uuid4()),
+                            "text": f"Answer {answer_number}",
+                            "is_correct": answer_number == 0,
+                        }
+                        for answer_number in range(ANSWER_COUNT)
+                    ],
+                }
+                for question_number in range(QUESTION_COUNT)
+            ],
+        )
+        for _ in range(QUIZ_COUNT)
+    ]
+
+
+def load(mapper: QuizSQLAlchemyMapper, rows: list[SimpleNamespace]) -> list:
+    return [mapper.model_to_domain(row) for row in rows]
+
+
+def build_validated(parts: list[tuple]) -> list[Quiz]:
+    return [
+        Quiz(
+            id=quiz_id,
+            name="Quiz",
+            description="Quiz",
+            _time=timedelta(minutes=30),
+            difficulty=Difficulty.MEDIUM,
+            subject=subject,
+            _questions=[
+                ChoiceQuestion(id=question_id, text="Question", _answers=answers)
+                for question_id, answers in questions
+            ],
+        )
+        for quiz_id, subject, questions in parts
+    ]
+
+
+def build_trusted(parts: list[tuple]) -> list[Quiz]:
+    return [
+        Quiz.reconstitute(
+            id=quiz_id,
+            name="Quiz",
+            description="Quiz",
+            time=timedelta(minutes=30),
+            difficulty=Difficulty.MEDIUM,
+            subject=subject,
+            questions=[
+                ChoiceQuestion.reconstitute(id=question_id, text="Question", answers=answers)
+                for question_id, answers in questions
+            ],
+        )
+        for quiz_id, subject, questions in parts
+    ]
+
+
+def best_time(function, *args) -> float:
+    timings = []
+    for _ in range(5):
+        gc.collect()
+        started = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    mapper = QuizSQLAlchemyMapper()
+    rows = make_rows()
+    load(mapper, rows[:100])
+
+    timings = []
+    for _ in range(5):
+        gc.collect()
+        started = time.perf_counter()
+        load(mapper, rows)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    quizzes = load(mapper, rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{len(quizzes)} quizzes x {QUESTION_COUNT} questions x {ANSWER_COUNT} answers")
+    print(f"load time: best {min(timings) * 1000:.1f} ms, median {sorted(timings)[2] * 1000:.1f} ms")
+    print(f"memory: retained {retained / 2 ** 20:.1f} MiB, peak {peak / 2 ** 20:.1f} MiB")
+
+    # Только сборка объектов из готовых частей: сколько стоит повторная валидация.
+    subject = Subject(id=uuid4(), name="Subject", description="Subject")
+    answers = [
+        ChoiceAnswer(id=uuid4(), text="Answer", is_correct=number == 0) for number in range(ANSWER_COUNT)
+    ]
+    parts = [
+        (uuid4(), subject, [(uuid4(), answers) for _ in range(QUESTION_COUNT)]) for _ in range(QUIZ_COUNT)
+    ]
+    validated = best_time(build_validated, parts)
+    trusted = best_time(build_trusted, parts)
+    print(f"construction: validated {validated * 1000:.1f} ms, reconstitute {trusted * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Цена сбора метрик на запрос: отметка начала, запись в гистограмму запросов,
+обёртка метода репозитория, пара обработчиков событий курсора и журнал запросов
+(отпечаток и статистика) на каждый SQL-запрос.
+
+    python -m benchmarks.metrics_overhead
+
+Бюджет — единицы микросекунд на запрос; сервер и база тут не участвуют.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from src.adapters.sqlalchemy.instrumentation import (
+    _after_cursor_execute,
+    _before_cursor_execute,
+    track_operations,
+)
+from src.adapters.sqlalchemy.query_log import QueryLog
+from src.api.metrics import observe_request, start_request_timer
+
+
+ITERATIONS = 200_000
+# Сколько SQL-запросов в среднем делает один запрос к API.
+QUERIES_PER_REQUEST = 2
+
+
+@track_operations("benchmark")
+class Repository:
+    async def get(self):
+        return None
+
+
+class PlainRepository:
+    async def get(self):
+        return None
+
+
+def make_request():
+    route = SimpleNamespace(path="api/quiz/<quiz_id:uuid>")
+    return SimpleNamespace(ctx=SimpleNamespace(), route=route, method="GET")
+
+
+async def per_call(function, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await function()
+    return (time.perf_counter() - started) / iterations
+
+
+async def main():
+    response = SimpleNamespace(status=200)
+
+    async def request_timing():
+        request = make_request()
+        await start_request_timer(request)
+        await observe_request(request, response)
+
+    async def request_baseline():
+        make_request()
+
+    async def query_events():
+        context = SimpleNamespace()
+        _before_cursor_execute(None, None, "", None, context, False)
+        _after_cursor_execute(None, None, "", None, context, False)
+
+    async def query_baseline():
+        SimpleNamespace()
+
+    # Порог недостижим: меряется путь обычного, не медленного запроса.
+    query_log = QueryLog(slow_seconds=60)
+    statement = "SELECT quiz.id, quiz.name FROM quiz WHERE quiz.id IN ($1, $2, $3) LIMIT $4"
+
+    async def query_logging():
+        query_log.observe(statement, 0.001, "benchmark.get", (1, 2, 3, 4))
+
+    tracked, plain = Repository(), PlainRepository()
+    # (название, с метриками, та же работа без них)
+    pairs = [
+        ("request timer + histogram", request_timing, request_baseline),
+        ("repository method wrapper", tracked.get, plain.get),
+        ("cursor events, per query", query_events, query_baseline),
+        ("query log, per query", query_logging, query_baseline),
+    ]
+    rows = [
+        (name, await per_call(measured, ITERATIONS), await per_call(baseline, ITERATIONS))
+        for name, measured, baseline in pairs
+    ]
+    print(f"{'':>28} {'overhead, us':>13}")
+    total = 0.0
+    for name, measured, baseline in rows:
+        overhead = max(0.0, measured - baseline) * 1e6
+        total += overhead * (QUERIES_PER_REQUEST if name.endswith("per query") else 1)
+        print(f"{name:>28} {overhead:>13.2f}")
+    print(f"{f'request with {QUERIES_PER_REQUEST} queries':>28} {total:>13.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
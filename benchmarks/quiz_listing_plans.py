@@ -0,0 +1,134 @@
+"""
+Планы запросов каталога квизов с фильтрами на синтетической таблице: без индексов и с ними.
+
+    python -m benchmarks.quiz_listing_plans
+
+Нужна база с применёнными миграциями (настройки подключения из src.config); запускать
+на dev-базе, не на рабочей. Всё делается в одной транзакции, которая в конце
+откатывается: вставка 1M квизов, ANALYZE, EXPLAIN (ANALYZE, BUFFERS) запросов из
+select_summary_page, затем DROP INDEX и те же запросы ещё раз. Ещё показывается
+проверка RESTRICT при удалении предмета, на который не ссылается ни один квиз.
+"""
+import asyncio
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.adapters.sqlalchemy.connect import engine
+from src.adapters.sqlalchemy.repositories.quiz import select_summary_page
+from src.application.domain.quiz import Difficulty
+from src.application.ports.quiz import QuizSummaryFilter
+
+
+QUIZ_COUNT = 1_000_000
+SUBJECT_COUNT = 200
+PAGE_LIMIT = 51
+FILTER_INDEXES = ("ix_quiz_subject_id_difficulty_id", "ix_quiz_difficulty_id")
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (ANALYZE, BUFFERS) " + compiler.process(element.statement, **kw)
+
+
+async def fill(conn: AsyncConnection) -> UUID:
+    # Триггер search_vector на миллионе строк считал бы tsvector дольше самой вставки.
+    await conn.execute(text("ALTER TABLE quiz DISABLE TRIGGER quiz_search_vector_update"))
+    await conn.execute(
+        text(
+            "INSERT INTO subject (id, name, description) "
+            "SELECT gen_random_uuid(), 'subject ' || n, 'benchmark' FROM generate_series(1, :count) AS n"
+        ),
+        {"count": SUBJECT_COUNT},
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO quiz (id, name, description, time, difficulty, subject_id, questions)
+            SELECT
+                gen_random_uuid(),
+                'quiz ' || n,
+                'benchmark',
+                make_interval(mins => 1 + n % 60),
+                (ARRAY['EASY', 'MEDIUM', 'HARD'])[1 + n % 3]::difficulty,
+                subjects.ids[1 + n % cardinality(subjects.ids)],
+                '{}'
+            FROM generate_series(1, :count) AS n,
+                (SELECT array_agg(id) AS ids FROM subject WHERE description = 'benchmark') AS subjects
+            """
+        ),
+        {"count": QUIZ_COUNT},
+    )
+    await conn.execute(text("ANALYZE subject"))
+    await conn.execute(text("ANALYZE quiz"))
+    return await conn.scalar(text("SELECT id FROM subject WHERE description = 'benchmark' LIMIT 1"))
+
+
+def cases(subject_id: UUID) -> dict[str, QuizSummaryFilter]:
+    return {
+        "subject + difficulty": QuizSummaryFilter(subject_id=subject_id, difficulty=Difficulty.HARD),
+        "difficulty": QuizSummaryFilter(difficulty=Difficulty.HARD),
+        "subject": QuizSummaryFilter(subject_id=subject_id),
+        "subject + difficulty + time range": QuizSummaryFilter(
+            subject_id=subject_id,
+            difficulty=Difficulty.HARD,
+            min_time=timedelta(minutes=10),
+            max_time=timedelta(minutes=20),
+        ),
+    }
+
+
+async def explain(conn: AsyncConnection, statement) -> list[str]:
+    return list((await conn.execute(statement)).scalars())
+
+
+async def print_plans(conn: AsyncConnection, subject_id: UUID) -> None:
+    for name, filters in cases(subject_id).items():
+        plan = await explain(conn, Explain(select_summary_page(PAGE_LIMIT, filters=filters)))
+        print(f"--- {name}")
+        print("\n".join(plan))
+
+    empty_subject_id = await conn.scalar(
+        text("INSERT INTO subject (id, name) VALUES (gen_random_uuid(), 'empty') RETURNING id")
+    )
+    await conn.execute(text("SAVEPOINT restrict_check"))
+    plan = await explain(
+        conn, text("EXPLAIN (ANALYZE) DELETE FROM subject WHERE id = :id").bindparams(id=empty_subject_id)
+    )
+    await conn.execute(text("ROLLBACK TO SAVEPOINT restrict_check"))
+    print("--- delete subject (RESTRICT check on quiz.subject_id)")
+    print("\n".join(line for line in plan if "Trigger" in line or "Execution" in line))
+
+
+async def main():
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            print(f"filling {QUIZ_COUNT} quizzes over {SUBJECT_COUNT} subjects...")
+            subject_id = await fill(conn)
+
+            print("\n===== with filter indexes")
+            await print_plans(conn, subject_id)
+
+            for index in FILTER_INDEXES:
+                await conn.execute(text(f"DROP INDEX {index}"))
+            print("\n===== without filter indexes")
+            await print_plans(conn, subject_id)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from uuid import UUID
+
+from src.application.ports.attempt_state import AnswerEvent, AttemptStateStore, Durability
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_newer(event: AnswerEvent, current: AnswerEvent | None) -> bool:
+    return current is None or current.answered_at <= event.answered_at
+
+
+class InMemoryAttemptStateStore:
+    """
+    Answers in a dict of this process. For tests and a single-process local run;
+    answers of finished attempts are never dropped.
+    """
+
+    def __init__(self) -> None:
+        self._answers: dict[UUID, dict[UUID, AnswerEvent]] = {}
+
+    async def save_answers(self, events: list[AnswerEvent]) -> None:
+        for event in events:
+            answers = self._answers.setdefault(event.attempt_id, {})
+            if is_newer(event, answers.get(event.question_id)):
+                answers[event.question_id] = event
+
+    async def get_answers(self, attempt_id: UUID) -> dict[UUID, frozenset[UUID]]:
+        return {
+            question_id: event.answer_ids for question_id, event in self._answers.get(attempt_id, {}).items()
+        }
+
+    async def flush(self) -> int:
+        return 0
+
+
+class WriteBehindAttemptStateStore:
+    """
+    Buffers answers in front of another store and writes them in batches: when
+    batch_size answers are pending, or every flush interval from run_flusher().
+    A re-answered question replaces its pending event, so only the last choice is written.
+
+    Буфер свой у каждого процесса: в режиме BUFFERED ответ, данный через другой воркер,
+    виден остальным только после его сброса, т.е. с задержкой до интервала сброса.
+    Если это недопустимо (экзамен с несколькими воркерами), нужен режим SYNC.
+    """
+
+    def __init__(self, store: AttemptStateStore, durability: Durability, batch_size: int) -> None:
+        self.store = store
+        self.durability = durability
+        self.batch_size = batch_size
+        self._pending: dict[UUID, dict[UUID, AnswerEvent]] = {}
+        self._pending_count = 0
+        # Пачка, которая пишется прямо сейчас: её ответы тоже должны быть видны в get_answers.
+        self._in_flight: dict[UUID, dict[UUID, AnswerEvent]] = {}
+        self._flush_lock = asyncio.Lock()
+
+    async def save_answers(self, events: list[AnswerEvent]) -> None:
+        if self.durability is Durability.SYNC:
+            await self.store.save_answers(events)
+            return
+        self._buffer(events)
+        # Если сброс не удался, ответы остаются в буфере, а ошибка уходит клиенту:
+        # при лежащей базе буфер не растёт бесконечно, а повтор ответа безопасен.
+        if self._pending_count >= self.batch_size:
+            await self.flush()
+
+    async def get_answers(self, attempt_id: UUID) -> dict[UUID, frozenset[UUID]]:
+        answers = await self.store.get_answers(attempt_id)
+        for buffered in (self._in_flight, self._pending):
+            for question_id, event in buffered.get(attempt_id, {}).items():
+                answers[question_id] = event.answer_ids
+        return answers
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending_count:
+                return 0
+            self._in_flight, self._pending, self._pending_count = self._pending, {}, 0
+            events = [event for answers in self._in_flight.values() for event in answers.values()]
+            try:
+                await self.store.save_answers(events)
+            except BaseException:
+                # Возвращаем пачку в буфер, не затирая ответы, пришедшие во время записи.
+                self._buffer(events)
+                raise
+            finally:
+                self._in_flight = {}
+            return len(events)
+
+    async def run_flusher(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                written = await self.flush()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Attempt answers flush failed, will retry")
+                continue
+            if written:
+                logger.debug("Flushed %s attempt answers", written)
+
+    def _buffer(self, events: list[AnswerEvent]) -> None:
+        for event in events:
+            answers = self._pending.setdefault(event.attempt_id, {})
+            current = answers.get(event.question_id)
+            if current is None:
+                self._pending_count += 1
+            if is_newer(event, current):
+                answers[event.question_id] = event
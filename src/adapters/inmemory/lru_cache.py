@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional
+
+from src.application.ports.cache import CacheStats
+
+
+class VersionedLRUCache:
+    """
+    In-process LRU with size and TTL bounds.
+
+    Инвалидация видна только в своём процессе: у других воркеров запись
+    доживёт максимум до TTL.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock: Callable[[], float] = monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._version = 0
+        # Версия последней инвалидации ключа. Ограничена по размеру: для вытесненных
+        # ключей консервативно считаем, что их инвалидировали в _invalidated_floor.
+        self._invalidated_at: OrderedDict[Hashable, int] = OrderedDict()
+        self._invalidated_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, version: int) -> None:
+        if self._invalidated_at.get(key, self._invalidated_floor) > version:
+            return
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._version += 1
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        self._invalidated_at[key] = self._version
+        self._invalidated_at.move_to_end(key)
+        while len(self._invalidated_at) > self.max_size:
+            _, dropped_version = self._invalidated_at.popitem(last=False)
+            self._invalidated_floor = max(self._invalidated_floor, dropped_version)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            invalidations=self.invalidations,
+            size=len(self._entries),
+            max_size=self.max_size,
+        )
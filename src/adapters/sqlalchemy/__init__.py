@@ -1,2 +1,9 @@
 from .models import QuizModel
 from .models import SubjectModel
+from .models import QuestionModel
+from .models import AnswerModel
+from .models import QuizSnapshotModel
+from .models import AttemptModel
+from .models import AttemptAnswerModel
+from .models import QuizResultRollupModel
+from .models import IdempotencyKeyModel
@@ -0,0 +1,66 @@
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.sqlalchemy.instrumentation import track_operations
+from src.adapters.sqlalchemy.models import AttemptAnswerModel
+from src.adapters.sqlalchemy.repositories.quiz_admin_repo import MAX_QUERY_PARAMS
+from src.application.ports.attempt_state import AnswerEvent
+
+
+@track_operations("attempt_state")
+class AttemptStateStoreSqlAlchemy:
+    """
+    Answers in the attempt_answer table. Works outside the request's unit of work:
+    buffered answers are written by a background task, so the store opens its own sessions.
+    """
+
+    def __init__(self, session_maker: Callable[[], AsyncSession]) -> None:
+        self.session_maker = session_maker
+
+    async def save_answers(self, events: list[AnswerEvent]) -> None:
+        # Один INSERT ... ON CONFLICT не может обновить строку дважды, оставляем последний ответ.
+        latest: dict[tuple[UUID, UUID], AnswerEvent] = {}
+        for event in events:
+            current = latest.get((event.attempt_id, event.question_id))
+            if current is None or current.answered_at <= event.answered_at:
+                latest[(event.attempt_id, event.question_id)] = event
+        rows = [
+            {
+                "attempt_id": event.attempt_id,
+                "question_id": event.question_id,
+                "answer_ids": sorted(event.answer_ids),
+                "answered_at": event.answered_at,
+            }
+            for event in latest.values()
+        ]
+        if not rows:
+            return
+        chunk_size = MAX_QUERY_PARAMS // len(rows[0])
+        async with self.session_maker() as session, session.begin():
+            for start in range(0, len(rows), chunk_size):
+                query = pg_insert(AttemptAnswerModel).values(rows[start:start + chunk_size])
+                await session.execute(
+                    query.on_conflict_do_update(
+                        index_elements=[AttemptAnswerModel.attempt_id, AttemptAnswerModel.question_id],
+                        set_={
+                            "answer_ids": query.excluded.answer_ids,
+                            "answered_at": query.excluded.answered_at,
+                        },
+                        # Пачка другого воркера могла опоздать: более старый ответ не затирает новый.
+                        where=AttemptAnswerModel.answered_at <= query.excluded.answered_at,
+                    )
+                )
+
+    async def get_answers(self, attempt_id: UUID) -> dict[UUID, frozenset[UUID]]:
+        async with self.session_maker() as session:
+            rows = await session.execute(
+                select(AttemptAnswerModel.question_id, AttemptAnswerModel.answer_ids)
+                .where(AttemptAnswerModel.attempt_id == attempt_id)
+            )
+            return {row.question_id: frozenset(row.answer_ids) for row in rows}
+
+    async def flush(self) -> int:
+        return 0
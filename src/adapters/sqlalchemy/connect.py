@@ -1,21 +1,102 @@
 
 from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
-from src.config import POSTGRE_DB_NAME, POSTGRE_HOST, POSTGRE_PASSWORD, POSTGRE_PORT, POSTGRE_USERNAME
+from src.adapters.sqlalchemy.instrumentation import instrument_engine
+from src.adapters.sqlalchemy.pool import InstrumentedAsyncQueuePool
+from src.adapters.sqlalchemy.query_log import QueryLog
+from src.adapters.sqlalchemy.routing import RoutingSession
+from src.config import (
+    DB_ECHO,
+    DB_EXPLAIN_SAMPLE_RATE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_QUERY_STATS_MAX_FINGERPRINTS,
+    DB_QUERY_STATS_WINDOW,
+    DB_SLOW_QUERY_SECONDS,
+    DB_STATEMENT_CACHE_SIZE,
+    POSTGRE_DB_NAME,
+    POSTGRE_HOST,
+    POSTGRE_PASSWORD,
+    POSTGRE_PORT,
+    POSTGRE_REPLICA_DB_NAME,
+    POSTGRE_REPLICA_HOST,
+    POSTGRE_REPLICA_PASSWORD,
+    POSTGRE_REPLICA_PORT,
+    POSTGRE_REPLICA_USERNAME,
+    POSTGRE_USERNAME,
+)
+
+
+def make_database_url(host, port, db_name, username, password) -> str:
+    return f"postgresql+asyncpg://{username}:{password}@{host}:{port}/{db_name}"
 
 
-DATABASE_URL = f"postgresql+asyncpg://{POSTGRE_USERNAME}:{POSTGRE_PASSWORD}@" \
-               f"{POSTGRE_HOST}:{POSTGRE_PORT}/{POSTGRE_DB_NAME}"
+# Общий для primary и реплики: отпечатки запросов одни и те же.
+query_log = QueryLog(
+    DB_SLOW_QUERY_SECONDS,
+    max_fingerprints=DB_QUERY_STATS_MAX_FINGERPRINTS,
+    window=DB_QUERY_STATS_WINDOW,
+    explain_sample_rate=DB_EXPLAIN_SAMPLE_RATE,
+)
+
 
+def make_engine(url: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        url,
+        echo=DB_ECHO,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        # Первый — кэш asyncpg, второй — кэш подготовленных запросов диалекта алхимии.
+        # За pgbouncer в режиме transaction оба надо выключать (0).
+        connect_args={
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        },
+    )
+    instrument_engine(async_engine.sync_engine)
+    query_log.listen(async_engine.sync_engine)
+    return async_engine
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+DATABASE_URL = make_database_url(
+    POSTGRE_HOST, POSTGRE_PORT, POSTGRE_DB_NAME, POSTGRE_USERNAME, POSTGRE_PASSWORD
+)
+
+engine = make_engine(DATABASE_URL)
+
+# Без отдельной реплики read-only запросы идут в тот же primary.
+if POSTGRE_REPLICA_HOST:
+    replica_engine = make_engine(
+        make_database_url(
+            POSTGRE_REPLICA_HOST,
+            POSTGRE_REPLICA_PORT,
+            POSTGRE_REPLICA_DB_NAME,
+            POSTGRE_REPLICA_USERNAME,
+            POSTGRE_REPLICA_PASSWORD,
+        )
+    )
+else:
+    replica_engine = engine
 
 async_session_maker = sessionmaker(
-    engine, class_=AsyncSession
+    class_=AsyncSession, sync_session_class=RoutingSession, primary=engine, replica=replica_engine
 )
 
+
+async def dispose_engines():
+    await engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
+
 convention = {
     "ix": "ix_%(column_0_label)s",
     "uq": "uq_%(table_name)s_%(column_0_N_name)s",
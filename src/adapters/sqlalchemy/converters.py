@@ -0,0 +1,96 @@
+"""
+Конвертеры dataclass -> dict, которые генерируются один раз на класс.
+
+Общие convert_dataclass_to_dict / convert_dict_to_serializable на каждом объекте
+заново зовут fields(), getattr, lstrip и цепочку isinstance. Здесь всё это
+разбирается по аннотациям при первом обращении к классу, а дальше работает
+сгенерированная функция вида `lambda obj: {"id": str(obj.id), ...}`.
+"""
+from dataclasses import fields, is_dataclass
+from datetime import timedelta
+from enum import Enum
+from typing import Any, Callable, get_args, get_origin, get_type_hints
+from uuid import UUID
+
+
+_PLAIN_TYPES = (str, int, float, bool)
+
+
+class ConverterRegistry:
+    """
+    serializable=False повторяет convert_dataclass_to_dict: вложенные dataclass и списки
+    становятся dict и list, остальные значения не трогаются.
+    serializable=True вдобавок делает то же, что convert_dict_to_serializable:
+    UUID -> str, timedelta -> секунды, Enum -> value.
+    """
+
+    def __init__(self, serializable: bool):
+        self.serializable = serializable
+        self._converters: dict[type, Callable[[Any], dict]] = {}
+
+    def convert(self, obj):
+        converter = self._converters.get(type(obj))
+        if converter is not None:
+            return converter(obj)
+        if isinstance(obj, list):
+            return [self.convert(item) for item in obj]
+        if isinstance(obj, dict):
+            return {key: self.convert(value) for key, value in obj.items()}
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return self.converter_for(type(obj))(obj)
+        return self._convert_value(obj)
+
+    def converter_for(self, cls: type) -> Callable[[Any], dict]:
+        converter = self._converters.get(cls)
+        if converter is None:
+            converter = self._converters[cls] = self._build(cls)
+        return converter
+
+    def _convert_value(self, value):
+        if not self.serializable:
+            return value
+        if isinstance(value, UUID):
+            return str(value)
+        if isinstance(value, timedelta):
+            return value.total_seconds()
+        if isinstance(value, Enum):
+            return value.value
+        return value
+
+    def _build(self, cls: type) -> Callable[[Any], dict]:
+        hints = get_type_hints(cls)
+        items = [
+            f"{field.name.lstrip('_')!r}: {self._expression(hints.get(field.name, Any), f'obj.{field.name}')}"
+            for field in fields(cls)
+        ]
+        function_name = f"convert_{cls.__name__}"
+        source = f"def {function_name}(obj):\n    return {{{', '.join(items)}}}\n"
+        namespace = {"convert": self.convert}
+        exec(source, namespace)  # pylint: disable=W0122
+        return namespace[function_name]
+
+    def _expression(self, annotation, value: str, depth: int = 0) -> str:
+        """
+        Python expression converting `value` of the annotated type;
+        unknown types fall back to convert().
+        """
+        if get_origin(annotation) is list:
+            item_type = (get_args(annotation) or (Any,))[0]
+            item = f"item{depth}"
+            return f"[{self._expression(item_type, item, depth + 1)} for {item} in {value}]"
+        if annotation in _PLAIN_TYPES:
+            return value
+        # Вложенные dataclass идут через convert(): по аннотации нельзя, там бывает базовый класс
+        # (Quiz._questions: list[BaseQuestion]), а конвертер нужен для фактического.
+        if isinstance(annotation, type) and not is_dataclass(annotation):
+            if issubclass(annotation, UUID):
+                return f"str({value})" if self.serializable else value
+            if issubclass(annotation, timedelta):
+                return f"{value}.total_seconds()" if self.serializable else value
+            if issubclass(annotation, Enum):
+                return f"{value}.value" if self.serializable else value
+        return f"convert({value})"
+
+
+dict_converters = ConverterRegistry(serializable=False)
+serializable_converters = ConverterRegistry(serializable=True)
@@ -1,6 +1,18 @@
-from typing import Any
+from typing import Any, Optional
 
-from src.application.domain.exceptions import DuplicateItem, ItemDataConflict, ItemNotFound, ReferencedItem
+from asyncpg.exceptions import DataError as AsyncpgDataError
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from src.application.domain.exceptions import (
+    DuplicateItem,
+    ItemDataConflict,
+    ItemNotFound,
+    ReferencedItem,
+    UnprocessableItem,
+)
+
+# Коды, которые sqlalchemy_asyncpg_exception_mapper переводит в свои исключения.
+MAPPED_PGCODES = ("23505", "23503", "23502")
 
 
 async def sqlalchemy_asyncpg_exception_mapper(exc: Exception):
@@ -40,3 +52,46 @@ async def raise_item_not_found(key_name: str, key_value: Any, cause_entity: str)
 
 async def raise_item_data_conflict(detail):
     raise ItemDataConflict(detail=detail)
+
+
+def is_serialization_failure(exc: Optional[BaseException]) -> bool:
+    """REPEATABLE READ or SERIALIZABLE transaction collided with a concurrent one (40001)."""
+    return isinstance(exc, DBAPIError) and getattr(exc.orig, "pgcode", None) == "40001"
+
+
+def _asyncpg_error(exc: BaseException) -> BaseException:
+    """asyncpg exception behind a SQLAlchemy one; COPY raises asyncpg exceptions as they are."""
+    if isinstance(exc, DBAPIError):
+        return exc.orig.__cause__ or exc.orig
+    return exc
+
+
+def is_item_data_error(exc: Optional[BaseException]) -> bool:
+    """
+    The statement failed on the values of its own row: integrity (23xxx) or data (22xxx) error,
+    or a value asyncpg could not encode. After a rollback to savepoint the transaction is usable,
+    so bulk and batch operations report it for that item instead of failing as a whole.
+    """
+    error = _asyncpg_error(exc) if exc is not None else None
+    if isinstance(error, AsyncpgDataError):
+        return True
+    sqlstate = getattr(error, "sqlstate", None)
+    return sqlstate is not None and sqlstate[:2] in ("22", "23")
+
+
+async def sqlalchemy_item_error_mapper(exc: DBAPIError):
+    """
+    Like sqlalchemy_asyncpg_exception_mapper, but any item data error (see is_item_data_error) becomes
+    ItemDataConflict or UnprocessableItem. Other errors (connection, serialization failure) re-raise.
+    """
+    if not is_item_data_error(exc):
+        raise exc
+    if getattr(exc.orig, "pgcode", None) in MAPPED_PGCODES:
+        await sqlalchemy_asyncpg_exception_mapper(exc)
+
+    error = _asyncpg_error(exc)
+    detail = getattr(error, "detail", None) or str(error)
+    cause_entity = getattr(error, "table_name", None)
+    if isinstance(exc, IntegrityError):
+        raise ItemDataConflict(detail=detail, cause_entity=cause_entity) from exc
+    raise UnprocessableItem(detail=detail, cause_entity=cause_entity) from exc
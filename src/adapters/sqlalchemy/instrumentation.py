@@ -0,0 +1,95 @@
+"""
+Метрики базы: время запросов по методам репозиториев, коммиты и откаты UoW, ожидание пула.
+
+Метод репозитория, помеченный track_operations, кладёт своё имя в contextvar db_operation,
+а обработчики событий engine читают его при каждом запросе. greenlet_spawn алхимии
+переносит контекст asyncio-задачи в greenlet, где выполняется курсор, так что имя видно
+и там. Вложенные вызовы (репозиторий через admin_repo) учитываются по внешнему методу.
+"""
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.metrics import FAST_BUCKETS, counter, histogram
+
+
+UNKNOWN_OPERATION = "unknown"
+# Запросы EXPLAIN журнала запросов: служебные, в метрики запросов приложения не попадают.
+EXPLAIN_OPERATION = "query_log.explain"
+
+db_operation: ContextVar[Optional[str]] = ContextVar("db_operation", default=None)
+
+QUERY_DURATION = histogram(
+    "db_query_duration_seconds",
+    "Database statement latency by repository method",
+    ("operation",),
+    FAST_BUCKETS,
+)
+UOW_COMMITS = counter("uow_commits_total", "Unit of work commits")
+UOW_ROLLBACKS = counter(
+    "uow_rollbacks_total",
+    "Unit of work rollbacks: explicit rollback(), error inside the unit of work, failed savepoint",
+    ("reason",),
+)
+POOL_WAIT = histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection", buckets=FAST_BUCKETS
+)
+POOL_TIMEOUTS = counter("db_pool_timeouts_total", "Connection checkouts that hit the pool timeout")
+
+
+def track_operations(prefix: str):
+    """Class decorator: public async methods report their queries as '<prefix>.<method>'."""
+
+    def decorate(cls):
+        for name, method in list(vars(cls).items()):
+            if not name.startswith("_") and iscoroutinefunction(method):
+                setattr(cls, name, _tracked(f"{prefix}.{name}", method))
+        return cls
+
+    return decorate
+
+
+def _tracked(operation: str, method):
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        if db_operation.get() is not None:
+            return await method(*args, **kwargs)
+        token = db_operation.set(operation)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            db_operation.reset(token)
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # ExecutionContext свой у каждого выполнения: ни стека, ни чистки после упавших запросов.
+    if context is not None:
+        context.metrics_started = perf_counter()
+
+
+def statement_seconds(context) -> Optional[float]:
+    """Time since before_cursor_execute of this execution, for other after_cursor_execute listeners."""
+    started = getattr(context, "metrics_started", None)
+    return None if started is None else perf_counter() - started
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = statement_seconds(context)
+    operation = db_operation.get()
+    if seconds is not None and operation != EXPLAIN_OPERATION:
+        QUERY_DURATION.observe((operation or UNKNOWN_OPERATION,), seconds)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Sync engine (AsyncEngine.sync_engine) whose statements go into db_query_duration_seconds."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -6,7 +6,9 @@ from uuid import UUID
 from sqlalchemy import Enum
 
 from src.adapters.sqlalchemy.connect import Base
-from src.adapters.sqlalchemy.models import QuizModel, SubjectModel
+from src.adapters.sqlalchemy.converters import dict_converters, serializable_converters
+from src.adapters.sqlalchemy.models import AttemptModel, QuestionModel, QuizModel, SubjectModel
+from src.application.domain.attempt import Attempt
 from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Quiz, Subject
 
 
@@ -48,7 +50,7 @@ class SQLAlchemyMapper(Protocol):
 
 class SubjectSQLAlchemyMapper(SQLAlchemyMapper):
     def domain_to_dict(self, domain_object: Subject) -> dict:
-        return convert_dataclass_to_dict(domain_object)
+        return dict_converters.convert(domain_object)
 
     def model_to_domain(self, model: SubjectModel):
         return Subject(id=UUID(str(model.id)), name=model.name, description=model.description)
@@ -56,33 +58,124 @@ class SubjectSQLAlchemyMapper(SQLAlchemyMapper):
 
 class QuizSQLAlchemyMapper(SQLAlchemyMapper):
     def domain_to_dict(self, domain_object: Quiz) -> dict:
-        dict_quiz = convert_dataclass_to_dict(domain_object)
-        dict_quiz['questions'] = convert_dict_to_serializable(dict_quiz['questions'])
-        dict_quiz['subject_id'] = dict_quiz.pop('subject')["id"]
-        return dict_quiz
+        return {
+            "id": domain_object.id,
+            "name": domain_object.name,
+            "description": domain_object.description,
+            "time": domain_object.time,
+            "difficulty": domain_object.difficulty,
+            "subject_id": domain_object.subject.id,
+            "questions": self.questions_to_documents(domain_object.questions),
+        }
+
+    @staticmethod
+    def questions_to_documents(questions: list[ChoiceQuestion]) -> list[dict]:
+        return serializable_converters.convert(questions)
 
     def model_to_domain(self, model: QuizModel):
-        """Needs subject eager/lazy loading to work."""
-        questions = []
-        for question in model.questions:
-            answers = []
-            for answer in question["answers"]:
-                answers.append(
-                    ChoiceAnswer(id=UUID(answer["id"]), text=answer["text"], is_correct=answer["is_correct"])
-                )
-            questions.append(
-                ChoiceQuestion(id=UUID(question["id"]), text=question["text"], _answers=answers)
-            )
+        """
+        Needs subject eager/lazy loading to work.
+        Rows were validated on write, so the domain objects are reconstituted without re-checking.
+        """
+        questions = self.questions_to_domain(model)
         subject = Subject(
             id=model.subject.id, name=model.subject.name, description=model.subject.description
         )
 
-        return Quiz(
-            id=UUID(str(model.id)),
+        return Quiz.reconstitute(
+            id=model.id,
             name=model.name,
             description=model.description,
-            _time=model.time,
+            time=model.time,
             difficulty=model.difficulty,
             subject=subject,
-            _questions=questions,
+            questions=questions,
+        )
+
+    def questions_to_domain(self, model: QuizModel) -> list[ChoiceQuestion]:
+        return [self.question_document_to_domain(question) for question in model.questions]
+
+    @staticmethod
+    def question_document_to_domain(question: dict) -> ChoiceQuestion:
+        answers = []
+        for answer in question["answers"]:
+            answers.append(
+                ChoiceAnswer(id=UUID(answer["id"]), text=answer["text"], is_correct=answer["is_correct"])
+            )
+        return ChoiceQuestion.reconstitute(id=UUID(question["id"]), text=question["text"], answers=answers)
+
+
+class NormalizedQuizSQLAlchemyMapper(QuizSQLAlchemyMapper):
+    """
+    Quiz row without the questions array; questions and answers are separate rows.
+    A row that still has the array (not backfilled yet) is read from the array.
+    """
+
+    @staticmethod
+    def questions_to_documents(questions: list[ChoiceQuestion]) -> None:
+        return None
+
+    def questions_to_domain(self, model: QuizModel) -> list[ChoiceQuestion]:
+        if model.questions is not None:
+            return super().questions_to_domain(model)
+        return [self.question_model_to_domain(question) for question in model.normalized_questions]
+
+    @staticmethod
+    def question_model_to_domain(question: QuestionModel) -> ChoiceQuestion:
+        answers = [
+            ChoiceAnswer(id=answer.id, text=answer.text, is_correct=answer.is_correct)
+            for answer in question.answers
+        ]
+        return ChoiceQuestion.reconstitute(id=question.id, text=question.text, answers=answers)
+
+    @staticmethod
+    def question_to_rows(quiz_id: UUID, position: int, question: ChoiceQuestion) -> tuple[dict, list[dict]]:
+        question_row = {"id": question.id, "quiz_id": quiz_id, "position": position, "text": question.text}
+        answer_rows = [
+            {
+                "id": answer.id,
+                "question_id": question.id,
+                "position": answer_position,
+                "text": answer.text,
+                "is_correct": answer.is_correct,
+            }
+            for answer_position, answer in enumerate(question.answers)
+        ]
+        return question_row, answer_rows
+
+    def questions_to_rows(self, quiz: Quiz) -> tuple[list[dict], list[dict]]:
+        question_rows, answer_rows = [], []
+        for position, question in enumerate(quiz.questions):
+            question_row, question_answer_rows = self.question_to_rows(quiz.id, position, question)
+            question_rows.append(question_row)
+            answer_rows.extend(question_answer_rows)
+        return question_rows, answer_rows
+
+
+class AttemptSQLAlchemyMapper(SQLAlchemyMapper):
+    def domain_to_dict(self, domain_object: Attempt) -> dict:
+        # Ответы живут в attempt_answer и пишутся по одному, в строку попытки они не входят.
+        return {
+            "id": domain_object.id,
+            "quiz_id": domain_object.quiz_id,
+            "quiz_version": domain_object.quiz_version,
+            "user_id": domain_object.user_id,
+            "started_at": domain_object.started_at,
+            "deadline": domain_object.deadline,
+            "question_count": domain_object.question_count,
+            "finished_at": domain_object.finished_at,
+            "score": domain_object.score,
+        }
+
+    def model_to_domain(self, model: AttemptModel) -> Attempt:
+        return Attempt(
+            id=model.id,
+            quiz_id=model.quiz_id,
+            quiz_version=model.quiz_version,
+            user_id=model.user_id,
+            started_at=model.started_at,
+            deadline=model.deadline,
+            question_count=model.question_count,
+            finished_at=model.finished_at,
+            score=model.score,
         )
@@ -1,8 +1,24 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
-from sqlalchemy import Enum, ForeignKey, Interval, String, Text, Uuid
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Computed,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Interval,
+    LargeBinary,
+    String,
+    Text,
+    Uuid,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.application.domain.quiz import Difficulty
 from src.adapters.sqlalchemy.connect import Base
@@ -10,15 +26,28 @@ from src.adapters.sqlalchemy.connect import Base
 
 class SubjectModel(Base):
     __tablename__ = "subject"
+    __table_args__ = (Index("ix_subject_change_seq", "change_seq"),)
 
     id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    # Свежий nextval на каждую запись строки (триггер, миграция 7d2e9b4c1a60); из него версия списка.
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("nextval('subject_change_seq')")
+    )
     quizzes: Mapped[list["QuizModel"]] = relationship(back_populates="subject", lazy="raise")
 
 
 class QuizModel(Base):
     __tablename__ = "quiz"
+    __table_args__ = (
+        Index("ix_quiz_search_vector", "search_vector", postgresql_using="gin"),
+        # Фильтры каталога с keyset по id; первый заодно нужен проверке RESTRICT при удалении предмета.
+        Index("ix_quiz_subject_id_difficulty_id", "subject_id", "difficulty", "id"),
+        Index("ix_quiz_difficulty_id", "difficulty", "id"),
+        Index("ix_quiz_change_seq", "change_seq"),
+    )
 
     id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -28,5 +57,134 @@ class QuizModel(Base):
     subject_id: Mapped[str] = mapped_column(
         Uuid(as_uuid=True), ForeignKey("subject.id", ondelete="RESTRICT", onupdate="RESTRICT"), nullable=False
     )
-    questions: Mapped[list[JSONB]] = mapped_column(ARRAY(JSONB), nullable=False)
+    # NULL, когда вопросы лежат в таблицах question/answer (QUIZ_STORAGE_LAYOUT=normalized).
+    questions: Mapped[Optional[list[JSONB]]] = mapped_column(ARRAY(JSONB), nullable=True)
+    # Вычисляется базой, чтобы списки квизов не тянули и не разбирали questions ради количества.
+    question_count: Mapped[Optional[int]] = mapped_column(
+        Integer, Computed("cardinality(questions)", persisted=True), nullable=True
+    )
+    # Растёт на каждом изменении квиза; по (id, version) кэшируются ключи ответов.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    # Поддерживается триггерами (миграция a8c2e5f0d417): название, описание, предмет и тексты вопросов.
+    # deferred — чтобы обычные чтения квиза его не тянули.
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+    # Как у subject; триггеры search_vector переписывают строку и при правке предмета и вопросов.
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default=text("nextval('quiz_change_seq')")
+    )
     subject: Mapped[Optional[SubjectModel]] = relationship(back_populates="quizzes", lazy="raise")
+    normalized_questions: Mapped[list["QuestionModel"]] = relationship(
+        back_populates="quiz", lazy="raise", order_by="QuestionModel.position", passive_deletes=True
+    )
+
+
+class QuestionModel(Base):
+    __tablename__ = "question"
+    __table_args__ = (Index("ix_question_quiz_id_position", "quiz_id", "position"),)
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, nullable=False)
+    quiz_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("quiz.id", ondelete="CASCADE"), nullable=False
+    )
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    quiz: Mapped[QuizModel] = relationship(back_populates="normalized_questions", lazy="raise")
+    answers: Mapped[list["AnswerModel"]] = relationship(
+        back_populates="question", lazy="raise", order_by="AnswerModel.position", passive_deletes=True
+    )
+
+
+class AnswerModel(Base):
+    __tablename__ = "answer"
+    __table_args__ = (Index("ix_answer_question_id_position", "question_id", "position"),)
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, nullable=False)
+    question_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("question.id", ondelete="CASCADE"), nullable=False
+    )
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    is_correct: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    question: Mapped[QuestionModel] = relationship(back_populates="answers", lazy="raise")
+
+
+class QuizSnapshotModel(Base):
+    """Вопросы версии квиза, на которой начинались попытки: по ним проверяются ответы и считается балл."""
+
+    __tablename__ = "quiz_snapshot"
+
+    quiz_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("quiz.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    version: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    time: Mapped[timedelta] = mapped_column(Interval, nullable=False)
+    # Тот же формат, что у quiz.questions.
+    questions: Mapped[list[JSONB]] = mapped_column(ARRAY(JSONB), nullable=False)
+
+
+class AttemptModel(Base):
+    __tablename__ = "attempt"
+    __table_args__ = (Index("ix_attempt_user_id_quiz_id", "user_id", "quiz_id"),)
+
+    id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, nullable=False)
+    quiz_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("quiz.id", ondelete="RESTRICT", onupdate="RESTRICT"), nullable=False
+    )
+    quiz_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    user_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    deadline: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    question_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+
+class AttemptAnswerModel(Base):
+    __tablename__ = "attempt_answer"
+
+    attempt_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("attempt.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    question_id: Mapped[UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, nullable=False)
+    answer_ids: Mapped[list[UUID]] = mapped_column(ARRAY(Uuid(as_uuid=True)), nullable=False)
+    answered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class QuizResultRollupModel(Base):
+    """
+    Итоги завершённых попыток, которые дописываются при каждом завершении.
+    Квиз с тех пор мог сменить предмет или сложность: попытка учтена там, где квиз был на момент завершения.
+    """
+
+    __tablename__ = "quiz_result_rollup"
+
+    quiz_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("quiz.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    subject_id: Mapped[UUID] = mapped_column(
+        Uuid(as_uuid=True), ForeignKey("subject.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    difficulty: Mapped[Difficulty] = mapped_column(Enum(Difficulty), primary_key=True, nullable=False)
+    attempt_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    score_sum: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    question_count_sum: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    last_finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class IdempotencyKeyModel(Base):
+    """
+    Ответы на запросы с Idempotency-Key: повтор запроса получает сохранённый ответ,
+    не трогая основные таблицы. Строки старше IDEMPOTENCY_KEY_TTL_SECONDS считаются
+    отсутствующими, их понемногу удаляет каждое следующее сохранение.
+    """
+
+    __tablename__ = "idempotency_key"
+    __table_args__ = (Index("ix_idempotency_key_created_at", "created_at"),)
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status: Mapped[int] = mapped_column(Integer, nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
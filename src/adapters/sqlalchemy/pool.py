@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.adapters.sqlalchemy.instrumentation import POOL_TIMEOUTS, POOL_WAIT
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    acquired: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that also measures how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self._observe_wait(perf_counter() - started, timed_out=True)
+            raise
+        self._observe_wait(perf_counter() - started, timed_out=False)
+        return connection
+
+    def _observe_wait(self, seconds: float, timed_out: bool) -> None:
+        with self._stats_lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.acquired += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            POOL_WAIT.observe((), seconds)
+            if timed_out:
+                POOL_TIMEOUTS.inc()
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            idle=self.checkedin(),
+            # QueuePool.overflow() отрицательный, пока пул не заполнен до pool_size.
+            overflow=max(0, self.overflow()),
+            acquired=self.acquired,
+            timeouts=self.timeouts,
+            wait_seconds_total=self.wait_seconds_total,
+            wait_seconds_max=self.wait_seconds_max,
+        )
@@ -0,0 +1,242 @@
+"""
+Журнал запросов вместо echo=True: статистика по отпечаткам запросов и лог только медленных.
+
+Отпечаток — текст запроса без литералов и параметров, со свёрнутыми списками IN (...) и
+VALUES, поэтому один и тот же запрос с разным числом id попадает в одну строку.
+Для части медленных SELECT фоновая задача снимает EXPLAIN (ANALYZE, BUFFERS) на отдельном
+соединении: ANALYZE выполняет запрос ещё раз, так что в production это не включается.
+В план подставлены значения параметров, поэтому из условий плана они вырезаются так же,
+как из отпечатка, до того как план попадёт в лог или в /api/monitoring.
+"""
+import asyncio
+import logging
+import random
+import re
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import sha1
+from math import ceil
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.adapters.sqlalchemy.instrumentation import (
+    EXPLAIN_OPERATION,
+    UNKNOWN_OPERATION,
+    db_operation,
+    statement_seconds,
+)
+
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_OR_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|%s|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_GROUP = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_WHITESPACE = re.compile(r"\s+")
+_ROW_LOCK = re.compile(r"\bFOR (?:NO KEY )?(?:UPDATE|SHARE|KEY SHARE)\b", re.IGNORECASE)
+# Строка плана с выражением (Index Cond, Filter, Join Filter...): числа в ней — значения, а не статистика.
+_PLAN_CONDITION = re.compile(
+    r"^([ \t]*(?!Rows Removed)(?=\w)[\w -]*(?:Cond|Filter): )(.*)$", re.MULTILINE
+)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    """(short id, normalized text). Cached: SQLAlchemy sends the same compiled strings again and again."""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_OR_PARAMETER.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?, ...)", normalized)
+    normalized = _REPEATED_GROUP.sub(r"\1, ...", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return sha1(normalized.encode()).hexdigest()[:16], normalized
+
+
+def redact_plan(plan: str) -> str:
+    """
+    Replaces string literals everywhere and numbers inside condition lines with ?.
+    Costs, row counts, timings and buffers of plan nodes stay as they are.
+    """
+    plan = _STRING_LITERAL.sub("?", plan)
+    return _PLAN_CONDITION.sub(
+        lambda match: match.group(1) + _NUMBER_OR_PARAMETER.sub("?", match.group(2)), plan
+    )
+
+
+def is_explainable(normalized: str) -> bool:
+    # Только чтение без блокировок строк: ANALYZE выполняет запрос по-настоящему.
+    return normalized[:7].upper() == "SELECT " and not _ROW_LOCK.search(normalized)
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    statement: str
+    # Метод репозитория, который выполнял запрос последним.
+    operation: str
+    calls: int
+    slow_calls: int
+    total_seconds: float
+    max_seconds: float
+    # По последним DB_QUERY_STATS_WINDOW выполнениям.
+    p95_seconds: float
+    plan: Optional[str]
+
+
+@dataclass
+class QueryLogStats:
+    slow_query_seconds: float
+    explain_sample_rate: float
+    # Выполнения запросов, не попавших в статистику, когда отпечатков уже максимум.
+    untracked_calls: int
+    queries: list[QueryStats]
+
+
+class _Entry:
+    __slots__ = (
+        "statement", "operation", "calls", "slow_calls", "total_seconds", "max_seconds", "recent", "plan"
+    )
+
+    def __init__(self, statement: str, window: int):
+        self.statement = statement
+        self.operation = UNKNOWN_OPERATION
+        self.calls = 0
+        self.slow_calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+        self.plan: Optional[str] = None
+
+    def p95(self) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[ceil(len(ordered) * 0.95) - 1]
+
+
+class QueryLog:
+    """
+    Listener on after_cursor_execute (timing comes from instrumentation's before_cursor_execute).
+    Like the metrics, everything is written from the event loop thread, without locks.
+    """
+
+    def __init__(
+        self,
+        slow_seconds: float,
+        max_fingerprints: int = 500,
+        window: int = 256,
+        explain_sample_rate: float = 0.0,
+        max_pending_explains: int = 32,
+        sample: Callable[[], float] = random.random,
+    ):
+        self.slow_seconds = slow_seconds
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self.explain_sample_rate = explain_sample_rate
+        self.max_pending_explains = max_pending_explains
+        self.sample = sample
+        self.untracked_calls = 0
+        self._queries: dict[str, _Entry] = {}
+        # Отпечаток -> (запрос, параметры): не больше одного EXPLAIN на отпечаток за проход.
+        self._pending: dict[str, tuple[str, Any]] = {}
+
+    def listen(self, engine: Engine) -> None:
+        if not event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        seconds = statement_seconds(context)
+        operation = db_operation.get()
+        if seconds is None or operation == EXPLAIN_OPERATION:
+            return
+        self.observe(statement, seconds, operation or UNKNOWN_OPERATION, None if executemany else parameters)
+
+    def observe(self, statement: str, seconds: float, operation: str, parameters: Any = None) -> None:
+        """parameters are kept only for a sampled EXPLAIN and never logged."""
+        fingerprint, normalized = fingerprint_statement(statement)
+        entry = self._queries.get(fingerprint)
+        if entry is None:
+            if len(self._queries) < self.max_fingerprints:
+                entry = self._queries[fingerprint] = _Entry(normalized, self.window)
+            else:
+                self.untracked_calls += 1
+        if entry is not None:
+            entry.operation = operation
+            entry.calls += 1
+            entry.total_seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+            entry.recent.append(seconds)
+        if seconds < self.slow_seconds:
+            return
+
+        if entry is not None:
+            entry.slow_calls += 1
+        logger.warning("Slow query %.3fs in %s [%s]: %s", seconds, operation, fingerprint, normalized)
+        if (
+            self.explain_sample_rate > 0
+            and parameters is not None
+            and fingerprint not in self._pending
+            and len(self._pending) < self.max_pending_explains
+            and is_explainable(normalized)
+            and self.sample() < self.explain_sample_rate
+        ):
+            self._pending[fingerprint] = (statement, parameters)
+
+    async def explain_pending(self, engine: AsyncEngine) -> int:
+        pending, self._pending = self._pending, {}
+        token = db_operation.set(EXPLAIN_OPERATION)
+        try:
+            for fingerprint, (statement, parameters) in pending.items():
+                try:
+                    plan = await explain(engine, statement, parameters)
+                except Exception:  # pylint: disable=W0718
+                    logger.warning("EXPLAIN of slow query [%s] failed", fingerprint, exc_info=True)
+                    continue
+                entry = self._queries.get(fingerprint)
+                if entry is not None:
+                    entry.plan = plan
+                logger.info("Plan of slow query [%s]:\n%s", fingerprint, plan)
+        finally:
+            db_operation.reset(token)
+        return len(pending)
+
+    async def run_explainer(self, engine: AsyncEngine, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await self.explain_pending(engine)
+
+    def stats(self) -> QueryLogStats:
+        queries = [
+            QueryStats(
+                fingerprint=fingerprint,
+                statement=entry.statement,
+                operation=entry.operation,
+                calls=entry.calls,
+                slow_calls=entry.slow_calls,
+                total_seconds=entry.total_seconds,
+                max_seconds=entry.max_seconds,
+                p95_seconds=entry.p95(),
+                plan=entry.plan,
+            )
+            for fingerprint, entry in self._queries.items()
+        ]
+        queries.sort(key=lambda query: query.total_seconds, reverse=True)
+        return QueryLogStats(
+            slow_query_seconds=self.slow_seconds,
+            explain_sample_rate=self.explain_sample_rate,
+            untracked_calls=self.untracked_calls,
+            queries=queries,
+        )
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters: Any) -> str:
+    async with engine.connect() as connection:
+        result = await connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        plan = "\n".join(row[0] for row in result)
+        # Объясняются только SELECT, но транзакцию всё равно не фиксируем.
+        await connection.rollback()
+    return redact_plan(plan)
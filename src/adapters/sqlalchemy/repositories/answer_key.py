@@ -0,0 +1,39 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.sqlalchemy.instrumentation import track_operations
+from src.adapters.sqlalchemy.mappers import QuizSQLAlchemyMapper
+from src.adapters.sqlalchemy.models import QuizSnapshotModel
+from src.application.domain.attempt import AnswerKey
+
+
+@track_operations("answer_key")
+class AnswerKeyRepositorySqlAlchemy:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.model = QuizSnapshotModel
+
+    async def add_if_absent(self, key: AnswerKey) -> None:
+        # Версия квиза неизменна: снимок, записанный параллельной попыткой, точно такой же.
+        await self.session.execute(
+            pg_insert(self.model)
+            .values(
+                quiz_id=key.quiz_id,
+                version=key.quiz_version,
+                time=key.time,
+                questions=QuizSQLAlchemyMapper.questions_to_documents(key.questions),
+            )
+            .on_conflict_do_nothing(index_elements=[self.model.quiz_id, self.model.version])
+        )
+
+    async def get(self, quiz_id: UUID, quiz_version: int) -> Optional[AnswerKey]:
+        row = await self.session.scalar(
+            select(self.model).where(self.model.quiz_id == quiz_id, self.model.version == quiz_version)
+        )
+        if row is None:
+            return None
+        questions = [QuizSQLAlchemyMapper.question_document_to_domain(question) for question in row.questions]
+        return AnswerKey.from_questions(row.quiz_id, row.version, row.time, questions)
@@ -0,0 +1,57 @@
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.sqlalchemy.exc_mappers import raise_item_data_conflict, raise_item_not_found
+from src.adapters.sqlalchemy.instrumentation import track_operations
+from src.adapters.sqlalchemy.mappers import AttemptSQLAlchemyMapper
+from src.adapters.sqlalchemy.models import AttemptModel
+from src.adapters.sqlalchemy.repositories.quiz_admin_repo import AdminRepositorySqlAlchemy
+from src.application.domain.attempt import Attempt
+
+
+@track_operations("attempt")
+class AttemptRepositorySqlAlchemy:
+    def __init__(self, session: AsyncSession):
+        self.dict_mapper = AttemptSQLAlchemyMapper()
+        self.admin_repo = AdminRepositorySqlAlchemy(
+            model=AttemptModel,
+            model_key_field=AttemptModel.id,
+            session=session,
+            dict_mapper=self.dict_mapper,
+        )
+        self.session = session
+        self.model = AttemptModel
+
+    async def add_one(self, attempt: Attempt) -> UUID:
+        return await self.admin_repo.add_one(attempt)
+
+    async def get_by_id(self, attempt_id: UUID) -> Attempt:
+        attempt = await self.session.get(self.model, attempt_id)
+        if attempt is None:
+            await raise_item_not_found(self.model.id, attempt_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(attempt)
+
+    async def finish(self, attempt: Attempt) -> UUID:
+        # Условие на finished_at закрывает гонку двух одновременных завершений.
+        row_id = await self.session.scalar(
+            update(self.model)
+            .returning(self.model.id)
+            .where(self.model.id == attempt.id, self.model.finished_at.is_(None))
+            .values(finished_at=attempt.finished_at, score=attempt.score)
+        )
+        if row_id is None:
+            await raise_item_data_conflict(f"Attempt ({attempt.id}) is already finished")
+        return row_id
+
+    async def get_finished(self, quiz_id: UUID, user_id: int) -> list[Attempt]:
+        attempts = await self.session.scalars(
+            select(self.model)
+            .where(
+                self.model.user_id == user_id,
+                self.model.quiz_id == quiz_id,
+                self.model.finished_at.is_not(None),
+            )
+            .order_by(self.model.finished_at)
+        )
+        return [self.dict_mapper.model_to_domain(attempt) for attempt in attempts]
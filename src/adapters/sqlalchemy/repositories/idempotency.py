@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.sqlalchemy.instrumentation import track_operations
+from src.adapters.sqlalchemy.models import IdempotencyKeyModel
+from src.application.ports.idempotency import StoredResponse
+
+
+# Сколько просроченных ключей удаляет одно сохранение: уборка идёт вместе с записью и не растёт с таблицей.
+PURGE_BATCH_SIZE = 100
+
+
+@track_operations("idempotency")
+class IdempotencyRepositorySqlAlchemy:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.model = IdempotencyKeyModel
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        row = await self.session.scalar(select(self.model).where(self.model.key == key))
+        if row is None:
+            return None
+        return StoredResponse(
+            fingerprint=row.fingerprint, status=row.status, body=row.body, created_at=row.created_at
+        )
+
+    async def save(self, key: str, response: StoredResponse, expired_before: datetime) -> None:
+        model = self.model
+        query = pg_insert(model).values(
+            key=key,
+            fingerprint=response.fingerprint,
+            status=response.status,
+            body=response.body,
+            created_at=response.created_at,
+        )
+        excluded = query.excluded
+        # Параллельный повтор мог сохранить ответ первым: его и оставляем, если он не просрочен.
+        await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[model.key],
+                set_={
+                    "fingerprint": excluded.fingerprint,
+                    "status": excluded.status,
+                    "body": excluded.body,
+                    "created_at": excluded.created_at,
+                },
+                where=model.created_at < expired_before,
+            )
+        )
+        expired_keys = (
+            select(model.key)
+            .where(model.created_at < expired_before)
+            .limit(PURGE_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        await self.session.execute(delete(model).where(model.key.in_(expired_keys)))
@@ -1,19 +1,145 @@
+from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Float, LargeBinary, Text, and_, case, cast, extract, func, literal, literal_column, or_, select
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from src.adapters.sqlalchemy.exc_mappers import raise_item_not_found
+from src.adapters.sqlalchemy.converters import serializable_converters
+from src.adapters.sqlalchemy.instrumentation import track_operations
 from src.adapters.sqlalchemy.mappers import QuizSQLAlchemyMapper
 from src.adapters.sqlalchemy.repositories.quiz_admin_repo import AdminRepositorySqlAlchemy
-from src.application.domain.quiz import Quiz
-from src.adapters.sqlalchemy.models import QuizModel
+from src.application.domain.exceptions import ItemDataConflict, StaleItemVersion
+from src.application.domain.quiz import ChoiceQuestion, Difficulty, Quiz
+from src.application.ports.bulk import BulkItemResult
+from src.application.ports.quiz import QuizSearchHit, QuizSummary, QuizSummaryFilter
+from src.adapters.sqlalchemy.models import QuizModel, SubjectModel
 
 
+def jsonb_object(**fields):
+    """jsonb_build_object with the keys inlined: asyncpg can't infer types of bound keys."""
+    arguments = []
+    for key, value in fields.items():
+        arguments += [literal_column(f"'{key}'"), value]
+    return func.jsonb_build_object(*arguments)
+
+
+def difficulty_value(column):
+    """
+    Postgres enum stores Difficulty names (EASY), the API speaks its values (easy).
+    Literals are inlined for the same reason as in jsonb_object.
+    """
+    label = cast(column, Text)
+    return case(
+        *[
+            (label == literal_column(f"'{item.name}'"), literal_column(f"'{item.value}'"))
+            for item in Difficulty
+        ]
+    )
+
+
+def select_summary_page(
+    limit: int,
+    after_id: Optional[UUID] = None,
+    filters: Optional[QuizSummaryFilter] = None,
+    question_count=QuizModel.question_count,
+):
+    """
+    Catalog page in id order. Equality filters are served by ix_quiz_subject_id_difficulty_id
+    and ix_quiz_difficulty_id, which also give the id order, so a page stops after `limit` rows.
+    """
+    query = (
+        select(
+            QuizModel.id,
+            QuizModel.name,
+            QuizModel.time,
+            QuizModel.difficulty,
+            SubjectModel.name.label("subject_name"),
+            question_count.label("question_count"),
+        )
+        .join(SubjectModel, QuizModel.subject_id == SubjectModel.id)
+        .order_by(QuizModel.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        query = query.where(QuizModel.id > after_id)
+    if filters is not None:
+        if filters.subject_id is not None:
+            query = query.where(QuizModel.subject_id == filters.subject_id)
+        if filters.difficulty is not None:
+            query = query.where(QuizModel.difficulty == filters.difficulty)
+        if filters.min_time is not None:
+            query = query.where(QuizModel.time >= filters.min_time)
+        if filters.max_time is not None:
+            query = query.where(QuizModel.time <= filters.max_time)
+    return query
+
+
+# Должна совпадать с конфигурацией в триггерах quiz.search_vector (миграция a8c2e5f0d417),
+# иначе запрос стеммится не так, как документ.
+SEARCH_CONFIG = "russian"
+
+
+def select_search_page(search_text: str, limit: int, after: Optional[tuple[float, UUID]] = None):
+    """
+    Ranked page of quizzes matching a websearch-style query. `@@` goes through the GIN index
+    on quiz.search_vector; ties in rank are broken by id so the (rank, id) keyset is stable.
+    """
+    query = func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'::regconfig"), search_text)
+    rank = func.ts_rank_cd(QuizModel.search_vector, query, type_=Float)
+    statement = (
+        select(
+            QuizModel.id,
+            QuizModel.name,
+            SubjectModel.name.label("subject_name"),
+            QuizModel.difficulty,
+            rank.label("rank"),
+        )
+        .join(SubjectModel, QuizModel.subject_id == SubjectModel.id)
+        .where(QuizModel.search_vector.op("@@")(query))
+        .order_by(rank.desc(), QuizModel.id)
+        .limit(limit)
+    )
+    if after is not None:
+        after_rank, after_id = after
+        # rank — real; сравниваем с float8, чтобы значение из курсора совпало с ним точно.
+        after_rank = literal(after_rank, Float)
+        statement = statement.where(or_(rank < after_rank, and_(rank == after_rank, QuizModel.id > after_id)))
+    return statement
+
+
+def select_quiz_document(quiz_id: UUID, questions):
+    """
+    The whole GET /quiz/<id> response built by Postgres and returned as UTF-8 bytes,
+    so the handler can send it without decoding. `questions` is a jsonb array expression.
+    """
+    document = jsonb_object(
+        id=QuizModel.id,
+        name=QuizModel.name,
+        description=QuizModel.description,
+        time=cast(extract("epoch", QuizModel.time), Float),
+        difficulty=difficulty_value(QuizModel.difficulty),
+        subject=jsonb_object(
+            id=SubjectModel.id, name=SubjectModel.name, description=SubjectModel.description
+        ),
+        questions=questions,
+    )
+    return (
+        select(func.convert_to(cast(document, Text), "UTF8", type_=LargeBinary))
+        .join(SubjectModel, QuizModel.subject_id == SubjectModel.id)
+        .where(QuizModel.id == quiz_id)
+    )
+
+
+@track_operations("quiz")
 class QuizRepositorySqlAlchemy:
     def __init__(self, session: AsyncSession):
         self.admin_repo = AdminRepositorySqlAlchemy(
             model=QuizModel,
             model_key_field=QuizModel.id,
+            version_field=QuizModel.version,
             session=session,
             dict_mapper=QuizSQLAlchemyMapper()
         )
@@ -24,12 +150,125 @@ class QuizRepositorySqlAlchemy:
     async def add_one(self, quiz: Quiz) -> UUID:
         return await self.admin_repo.add_one(quiz)
 
+    async def add_many(self, quizzes: list[Quiz]) -> list[BulkItemResult]:
+        return await self.admin_repo.add_many(quizzes)
+
     async def get_all(self) -> list[Quiz]:
         quizzes = await self.session.scalars(select(self.model).options(joinedload(self.model.subject)))
         return (self.dict_mapper.model_to_domain(quiz) for quiz in quizzes)
 
-    async def update_one(self, quiz_id: UUID, new_quiz: Quiz) -> UUID:
-        return await self.admin_repo.update_one(quiz_id, new_quiz)
+    async def get_by_id(self, quiz_id: UUID) -> Quiz:
+        quiz = await self.session.scalar(
+            select(self.model).options(joinedload(self.model.subject)).where(self.model.id == quiz_id)
+        )
+        if quiz is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(quiz)
+
+    async def get_by_id_with_version(self, quiz_id: UUID) -> tuple[Quiz, int]:
+        quiz = await self.session.scalar(
+            select(self.model).options(joinedload(self.model.subject)).where(self.model.id == quiz_id)
+        )
+        if quiz is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(quiz), quiz.version
+
+    async def get_by_id_with_document_version(self, quiz_id: UUID) -> tuple[Quiz, tuple[int, int]]:
+        quiz = await self.session.scalar(
+            select(self.model).options(joinedload(self.model.subject)).where(self.model.id == quiz_id)
+        )
+        if quiz is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(quiz), (quiz.version, quiz.subject.version)
+
+    async def get_version(self, quiz_id: UUID) -> int:
+        version = await self.session.scalar(select(self.model.version).where(self.model.id == quiz_id))
+        if version is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return version
+
+    async def get_document_version(self, quiz_id: UUID) -> tuple[int, int]:
+        versions = (
+            await self.session.execute(
+                select(self.model.version, SubjectModel.version)
+                .join(SubjectModel, self.model.subject_id == SubjectModel.id)
+                .where(self.model.id == quiz_id)
+            )
+        ).first()
+        if versions is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return tuple(versions)
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        return await self.admin_repo.get_collection_version()
+
+    async def get_document_by_id(self, quiz_id: UUID) -> bytes:
+        document = await self.session.scalar(
+            select_quiz_document(quiz_id, func.to_jsonb(self.model.questions))
+        )
+        if document is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return document
+
+    async def get_summary_page(
+        self, limit: int, after_id: Optional[UUID] = None, filters: Optional[QuizSummaryFilter] = None
+    ) -> list[QuizSummary]:
+        rows = await self.session.execute(select_summary_page(limit, after_id, filters))
+        return [QuizSummary(**row._asdict()) for row in rows]
+
+    async def search(
+        self, search_text: str, limit: int, after: Optional[tuple[float, UUID]] = None
+    ) -> list[QuizSearchHit]:
+        rows = await self.session.execute(select_search_page(search_text, limit, after))
+        return [QuizSearchHit(**row._asdict()) for row in rows]
+
+    async def get_question(self, quiz_id: UUID, question_id: UUID) -> ChoiceQuestion:
+        questions = await self.session.scalar(select(self.model.questions).where(self.model.id == quiz_id))
+        if questions is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        for question in questions:
+            if question["id"] == str(question_id):
+                return self.dict_mapper.question_document_to_domain(question)
+        await raise_item_not_found("id", question_id, "ChoiceQuestion")
+
+    async def update_question(
+        self, quiz_id: UUID, question: ChoiceQuestion, expected_version: Optional[int] = None
+    ) -> UUID:
+        """The array is one value, so a one-question edit still rewrites all of it.
+
+        No row lock: the write is a CAS on the version the array was read at (or on expected_version).
+        """
+        row = (
+            await self.session.execute(
+                select(self.model.questions, self.model.version).where(self.model.id == quiz_id)
+            )
+        ).first()
+        if row is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        questions, read_version = row
+        for position, old_question in enumerate(questions):
+            if old_question["id"] == str(question.id):
+                questions[position] = serializable_converters.convert(question)
+                break
+        else:
+            await raise_item_not_found("id", question.id, "ChoiceQuestion")
+        try:
+            await self.admin_repo.update_fields(
+                quiz_id,
+                {"questions": questions},
+                read_version if expected_version is None else expected_version,
+            )
+        except StaleItemVersion as e:
+            if expected_version is not None:
+                raise
+            raise ItemDataConflict(
+                detail=f"Quiz ({quiz_id}) was changed concurrently, retry the update",
+                cause_entity=self.model.__name__,
+            ) from e
+        return question.id
+
+    async def update_one(self, quiz_id: UUID, new_quiz: Quiz, expected_version: Optional[int] = None) -> UUID:
+        return await self.admin_repo.update_one(quiz_id, new_quiz, expected_version)
 
     async def delete_one(self, quiz_id: UUID) -> UUID:
         return await self.admin_repo.delete_one(quiz_id)
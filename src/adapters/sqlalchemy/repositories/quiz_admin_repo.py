@@ -1,10 +1,26 @@
-from sqlalchemy import delete, insert, select, update
-from sqlalchemy.exc import IntegrityError
+from typing import Awaitable, Callable, Optional
+
+from asyncpg.exceptions import DataError as AsyncpgDataError, PostgresError
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 from src.adapters.sqlalchemy.mappers import SQLAlchemyMapper
 from src.adapters.sqlalchemy.connect import Base
-from src.adapters.sqlalchemy.exc_mappers import raise_item_not_found, sqlalchemy_asyncpg_exception_mapper
+from src.adapters.sqlalchemy.exc_mappers import (
+    is_item_data_error,
+    raise_item_not_found,
+    sqlalchemy_asyncpg_exception_mapper,
+    sqlalchemy_item_error_mapper,
+)
+from src.application.domain.exceptions import BaseCoreException, StaleItemVersion, UnprocessableItem
+from src.application.ports.bulk import BulkItemResult
+from src.config import BULK_COPY_THRESHOLD
+
+
+# Ограничение протокола Postgres на число параметров в одном запросе.
+MAX_QUERY_PARAMS = 32767
 
 
 class AdminRepositorySqlAlchemy:
@@ -12,12 +28,25 @@ class AdminRepositorySqlAlchemy:
     model_key_field: InstrumentedAttribute
     session: AsyncSession
     dict_mapper: SQLAlchemyMapper
+    copy_threshold: int
+    version_field: Optional[InstrumentedAttribute]
 
-    def __init__(self, model, model_key_field, session, dict_mapper) -> None:
+    def __init__(
+        self,
+        model,
+        model_key_field,
+        session,
+        dict_mapper,
+        copy_threshold=BULK_COPY_THRESHOLD,
+        version_field=None,
+    ) -> None:
         self.model = model
         self.model_key_field = model_key_field
         self.session = session
         self.dict_mapper = dict_mapper
+        self.copy_threshold = copy_threshold
+        # Если задано, каждое update_one увеличивает это поле на единицу.
+        self.version_field = version_field
 
     async def add_one(self, domain_object):
         try:
@@ -30,25 +59,181 @@ class AdminRepositorySqlAlchemy:
         except IntegrityError as e:
             await sqlalchemy_asyncpg_exception_mapper(e)
 
+    async def add_one_if_absent(self, domain_object):
+        """
+        INSERT ... ON CONFLICT (key) DO NOTHING: repeating the insert of the same object writes nothing
+        and still returns the key. If the row with this key holds other values, UnprocessableItem:
+        the key was reused for another object. Other unique constraints raise as in add_one.
+        """
+        values = self.dict_mapper.domain_to_dict(domain_object)
+        key = values[self.model_key_field.key]
+        try:
+            query = pg_insert(self.model).values(values).returning(self.model_key_field)
+            row_id = await self.session.scalar(
+                query.on_conflict_do_nothing(index_elements=[self.model_key_field])
+            )
+            if row_id is None:
+                await self._check_same_row(key, values)
+            return str(key)
+
+        except IntegrityError as e:
+            await sqlalchemy_asyncpg_exception_mapper(e)
+
+    async def _check_same_row(self, key, values: dict):
+        """
+        Nothing was inserted, so the row with this key is already committed
+        (ON CONFLICT waits for a concurrent insert) and the next statement sees it.
+        """
+        row = await self.session.scalar(select(self.model).where(self.model_key_field == key))
+        if row is None:
+            # Строку успели удалить между вставкой и чтением: повтор создания всё равно не состоялся.
+            await raise_item_not_found(self.model_key_field, key, self.model.__name__)
+        changed = sorted(name for name, value in values.items() if getattr(row, name) != value)
+        if changed:
+            raise UnprocessableItem(
+                detail=f"Key ({self.model_key_field.key})=({key}) already belongs to an object "
+                f"with other {', '.join(changed)}.",
+                cause_entity=self.model.__name__,
+            )
+
+    async def add_many(
+        self,
+        domain_objects,
+        add_children: Optional[Callable[[list], Awaitable[None]]] = None,
+    ) -> list[BulkItemResult]:
+        """
+        All rows go in one multi-row INSERT (COPY from copy_threshold rows) inside a savepoint.
+        If it fails on the data of some row, rows are retried one by one in their own savepoints
+        to report which ones are bad. add_children(objects) writes dependent rows of the objects
+        in the same savepoint and must let database errors through, so a bad child fails only
+        its own object.
+        """
+        rows = [self.dict_mapper.domain_to_dict(domain_object) for domain_object in domain_objects]
+        if not rows:
+            return []
+        try:
+            async with self.session.begin_nested():
+                if len(rows) >= self.copy_threshold:
+                    await self._copy_rows(rows)
+                else:
+                    await self._insert_rows(rows)
+                if add_children is not None:
+                    await add_children(domain_objects)
+            return [BulkItemResult(id=row[self.model_key_field.key]) for row in rows]
+
+        except (DBAPIError, PostgresError, AsyncpgDataError) as e:
+            if not is_item_data_error(e):
+                raise
+            return [
+                await self._add_one_in_savepoint(row, domain_object, add_children)
+                for row, domain_object in zip(rows, domain_objects)
+            ]
+
+    async def _insert_rows(self, rows: list[dict]):
+        chunk_size = max(1, MAX_QUERY_PARAMS // len(rows[0]))
+        for start in range(0, len(rows), chunk_size):
+            await self.session.execute(insert(self.model).values(rows[start:start + chunk_size]))
+
+    async def _copy_rows(self, rows: list[dict]):
+        connection = await self.session.connection()
+        dialect = connection.dialect
+        table = self.model.__table__
+        columns = [column for column in table.columns if column.computed is None and column.key in rows[0]]
+        # COPY идёт мимо алхимии, поэтому значения приводим к виду драйвера её же bind-процессорами.
+        processors = [column.type.dialect_impl(dialect).bind_processor(dialect) for column in columns]
+        records = [
+            tuple(
+                processor(row[column.key]) if processor else row[column.key]
+                for column, processor in zip(columns, processors)
+            )
+            for row in rows
+        ]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=[column.name for column in columns]
+        )
+
+    async def _add_one_in_savepoint(self, row: dict, domain_object, add_children) -> BulkItemResult:
+        try:
+            async with self.session.begin_nested():
+                row_id = await self.session.scalar(insert(self.model).returning(self.model_key_field), row)
+                if add_children is not None:
+                    await add_children([domain_object])
+            return BulkItemResult(id=row_id)
+
+        except DBAPIError as e:
+            try:
+                await sqlalchemy_item_error_mapper(e)
+            except BaseCoreException as core_exception:
+                return BulkItemResult(error=core_exception)
+
     async def get_all(self):
         quizzes = await self.session.scalars(select(self.model))
         return (self.dict_mapper.model_to_domain(quiz) for quiz in quizzes)
 
-    async def update_one(self, key, updated_domain_object):
+    async def get_by_keys(self, keys):
+        rows = await self.session.scalars(select(self.model).where(self.model_key_field.in_(keys)))
+        return [self.dict_mapper.model_to_domain(row) for row in rows]
+
+    async def get_page(self, limit, after_key=None):
+        """Keyset pagination: cost per page doesn't depend on how deep the page is."""
+        query = select(self.model).order_by(self.model_key_field).limit(limit)
+        if after_key is not None:
+            query = query.where(self.model_key_field > after_key)
+        rows = await self.session.scalars(query)
+        return [self.dict_mapper.model_to_domain(row) for row in rows]
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        """
+        (row count, sum of change_seq) over the rows this transaction sees. A trigger gives every
+        written row a fresh, larger change_seq, so an insert or delete changes the count and an update
+        raises the sum, whatever order writers commit in. No shared row: writers don't wait on each other.
+        """
+        versions = await self.session.execute(
+            select(func.count(), func.coalesce(func.sum(self.model.change_seq), 0)).select_from(self.model)
+        )
+        return tuple(versions.one())
+
+    async def update_one(self, key, updated_domain_object, expected_version: Optional[int] = None):
+        """
+        With expected_version it is a compare-and-swap: the row is written only if its version_field
+        still equals expected_version, otherwise StaleItemVersion. No row locks are taken.
+        """
+        return await self.update_fields(
+            key, self.dict_mapper.domain_to_dict(updated_domain_object), expected_version
+        )
+
+    async def update_fields(self, key, values: dict, expected_version: Optional[int] = None):
+        """update_one for part of the columns; with empty values it only bumps version_field (under CAS)."""
+        values = dict(values)
+        if self.version_field is not None:
+            values[self.version_field.key] = self.version_field + 1
+        query = update(self.model).returning(self.model_key_field).where(self.model_key_field == key)
+        if expected_version is not None:
+            query = query.where(self.version_field == expected_version)
         try:
-            row_id = await self.session.scalar(
-                update(self.model)
-                .returning(self.model_key_field)
-                .where(self.model_key_field == key)
-                .values(self.dict_mapper.domain_to_dict(updated_domain_object))
-            )
+            row_id = await self.session.scalar(query.values(values))
             if row_id is None:
+                if expected_version is not None:
+                    await self._raise_stale_version(key, expected_version)
                 await raise_item_not_found(self.model_key_field, key, self.model.__name__)
             return row_id
 
         except IntegrityError as e:
             await sqlalchemy_asyncpg_exception_mapper(e)
 
+    async def _raise_stale_version(self, key, expected_version: int):
+        """UPDATE matched nothing: either the row is gone or another writer bumped its version."""
+        current_version = await self.session.scalar(
+            select(self.version_field).where(self.model_key_field == key)
+        )
+        if current_version is not None:
+            raise StaleItemVersion(
+                detail=f"Key ({self.model_key_field.key})=({key}) is at version {current_version}, "
+                f"not {expected_version}.",
+                cause_entity=self.model.__name__,
+            )
+
     async def delete_one(self, object_id):
         try:
             row_id = await self.session.scalar(
@@ -0,0 +1,371 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import ARRAY, Uuid, bindparam, delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from src.adapters.sqlalchemy.exc_mappers import raise_item_not_found, sqlalchemy_asyncpg_exception_mapper
+from src.adapters.sqlalchemy.instrumentation import track_operations
+from src.adapters.sqlalchemy.mappers import NormalizedQuizSQLAlchemyMapper
+from src.adapters.sqlalchemy.models import AnswerModel, QuestionModel, QuizModel, SubjectModel
+from src.adapters.sqlalchemy.repositories.quiz import (
+    jsonb_object,
+    select_quiz_document,
+    select_search_page,
+    select_summary_page,
+)
+from src.adapters.sqlalchemy.repositories.quiz_admin_repo import AdminRepositorySqlAlchemy
+from src.application.domain.exceptions import ItemDataConflict
+from src.application.domain.quiz import ChoiceQuestion, Quiz
+from src.application.ports.bulk import BulkItemResult
+from src.application.ports.quiz import QuizSearchHit, QuizSummary, QuizSummaryFilter
+
+
+_LOCK_JSONB_QUIZZES = text(
+    "SELECT id FROM quiz WHERE id = ANY(:quiz_ids) AND questions IS NOT NULL FOR UPDATE"
+).bindparams(bindparam("quiz_ids", type_=ARRAY(Uuid)))
+
+_DELETE_LEFTOVER_QUESTIONS = text(
+    "DELETE FROM question WHERE quiz_id = ANY(:quiz_ids)"
+).bindparams(bindparam("quiz_ids", type_=ARRAY(Uuid)))
+
+_COPY_QUESTIONS = text(
+    """
+    INSERT INTO question (id, quiz_id, position, text)
+    SELECT (q.doc ->> 'id')::uuid, quiz.id, q.ord - 1, q.doc ->> 'text'
+    FROM quiz, unnest(quiz.questions) WITH ORDINALITY AS q(doc, ord)
+    WHERE quiz.id = ANY(:quiz_ids)
+    """
+).bindparams(bindparam("quiz_ids", type_=ARRAY(Uuid)))
+
+_COPY_ANSWERS = text(
+    """
+    INSERT INTO answer (id, question_id, position, text, is_correct)
+    SELECT
+        (a.doc ->> 'id')::uuid, (q.doc ->> 'id')::uuid, a.ord - 1, a.doc ->> 'text',
+        (a.doc ->> 'is_correct')::boolean
+    FROM quiz,
+        unnest(quiz.questions) AS q(doc),
+        jsonb_array_elements(q.doc -> 'answers') WITH ORDINALITY AS a(doc, ord)
+    WHERE quiz.id = ANY(:quiz_ids)
+    """
+).bindparams(bindparam("quiz_ids", type_=ARRAY(Uuid)))
+
+_CLEAR_QUESTIONS = text(
+    "UPDATE quiz SET questions = NULL WHERE id = ANY(:quiz_ids)"
+).bindparams(bindparam("quiz_ids", type_=ARRAY(Uuid)))
+
+
+async def move_questions_to_tables(session: AsyncSession, quiz_ids: list[UUID]) -> int:
+    """
+    Moves questions of the given quizzes from the JSONB array into question/answer rows.
+    Quizzes that are already normalized are skipped. Runs in the caller's transaction.
+    """
+    locked_ids = list(await session.scalars(_LOCK_JSONB_QUIZZES, {"quiz_ids": quiz_ids}))
+    if not locked_ids:
+        return 0
+    params = {"quiz_ids": locked_ids}
+    await session.execute(_DELETE_LEFTOVER_QUESTIONS, params)
+    await session.execute(_COPY_QUESTIONS, params)
+    await session.execute(_COPY_ANSWERS, params)
+    await session.execute(_CLEAR_QUESTIONS, params)
+    return len(locked_ids)
+
+
+@track_operations("quiz")
+class QuizRepositoryNormalizedSqlAlchemy:
+    """
+    QuizRepository over the question/answer tables (QUIZ_STORAGE_LAYOUT=normalized).
+    Updates rewrite only changed rows, so a one-question edit doesn't rewrite the whole quiz.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.dict_mapper = NormalizedQuizSQLAlchemyMapper()
+        self.admin_repo = AdminRepositorySqlAlchemy(
+            model=QuizModel,
+            model_key_field=QuizModel.id,
+            version_field=QuizModel.version,
+            session=session,
+            dict_mapper=self.dict_mapper,
+        )
+        self.session = session
+        self.model = QuizModel
+
+    async def add_one(self, quiz: Quiz) -> UUID:
+        row_id = await self.admin_repo.add_one(quiz)
+        try:
+            await self._insert_questions([quiz])
+
+        except IntegrityError as e:
+            await sqlalchemy_asyncpg_exception_mapper(e)
+        return row_id
+
+    async def add_many(self, quizzes: list[Quiz]) -> list[BulkItemResult]:
+        # Вопросы пишутся в savepoint своего квиза: квиз с плохим вопросом не остаётся без вопросов.
+        return await self.admin_repo.add_many(quizzes, add_children=self._insert_questions)
+
+    async def get_all(self) -> list[Quiz]:
+        quizzes = await self.session.scalars(self._select_quiz())
+        return (self.dict_mapper.model_to_domain(quiz) for quiz in quizzes)
+
+    async def get_by_id(self, quiz_id: UUID) -> Quiz:
+        quiz = await self.session.scalar(self._select_quiz().where(self.model.id == quiz_id))
+        if quiz is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(quiz)
+
+    async def get_by_id_with_version(self, quiz_id: UUID) -> tuple[Quiz, int]:
+        quiz = await self.session.scalar(self._select_quiz().where(self.model.id == quiz_id))
+        if quiz is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(quiz), quiz.version
+
+    async def get_by_id_with_document_version(self, quiz_id: UUID) -> tuple[Quiz, tuple[int, int]]:
+        quiz = await self.session.scalar(self._select_quiz().where(self.model.id == quiz_id))
+        if quiz is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(quiz), (quiz.version, quiz.subject.version)
+
+    async def get_version(self, quiz_id: UUID) -> int:
+        version = await self.session.scalar(select(self.model.version).where(self.model.id == quiz_id))
+        if version is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return version
+
+    async def get_document_version(self, quiz_id: UUID) -> tuple[int, int]:
+        versions = (
+            await self.session.execute(
+                select(self.model.version, SubjectModel.version)
+                .join(SubjectModel, self.model.subject_id == SubjectModel.id)
+                .where(self.model.id == quiz_id)
+            )
+        ).first()
+        if versions is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return tuple(versions)
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        return await self.admin_repo.get_collection_version()
+
+    async def get_document_by_id(self, quiz_id: UUID) -> bytes:
+        answers = (
+            select(
+                func.coalesce(
+                    func.jsonb_agg(
+                        aggregate_order_by(
+                            jsonb_object(
+                                id=AnswerModel.id, is_correct=AnswerModel.is_correct, text=AnswerModel.text
+                            ),
+                            AnswerModel.position,
+                        )
+                    ),
+                    text("'[]'::jsonb"),
+                )
+            )
+            .where(AnswerModel.question_id == QuestionModel.id)
+            .scalar_subquery()
+        )
+        questions = (
+            select(
+                func.coalesce(
+                    func.jsonb_agg(
+                        aggregate_order_by(
+                            jsonb_object(id=QuestionModel.id, text=QuestionModel.text, answers=answers),
+                            QuestionModel.position,
+                        )
+                    ),
+                    text("'[]'::jsonb"),
+                )
+            )
+            .where(QuestionModel.quiz_id == self.model.id)
+            .correlate(self.model)
+            .scalar_subquery()
+        )
+        # Ещё не перенесённый квиз отдаём из массива, как и в get_by_id.
+        document = await self.session.scalar(
+            select_quiz_document(quiz_id, func.coalesce(func.to_jsonb(self.model.questions), questions))
+        )
+        if document is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return document
+
+    async def get_summary_page(
+        self, limit: int, after_id: Optional[UUID] = None, filters: Optional[QuizSummaryFilter] = None
+    ) -> list[QuizSummary]:
+        question_count = (
+            select(func.count())
+            .where(QuestionModel.quiz_id == self.model.id)
+            .correlate(self.model)
+            .scalar_subquery()
+        )
+        query = select_summary_page(
+            limit, after_id, filters, question_count=func.coalesce(self.model.question_count, question_count)
+        )
+        rows = await self.session.execute(query)
+        return [QuizSummary(**row._asdict()) for row in rows]
+
+    async def search(
+        self, search_text: str, limit: int, after: Optional[tuple[float, UUID]] = None
+    ) -> list[QuizSearchHit]:
+        # search_vector собирается триггерами из обоих раскладов вопросов, запрос тот же.
+        rows = await self.session.execute(select_search_page(search_text, limit, after))
+        return [QuizSearchHit(**row._asdict()) for row in rows]
+
+    async def get_question(self, quiz_id: UUID, question_id: UUID) -> ChoiceQuestion:
+        questions = await self._get_jsonb_questions(quiz_id)
+        if questions is not None:
+            for question in questions:
+                if question["id"] == str(question_id):
+                    return self.dict_mapper.question_document_to_domain(question)
+        else:
+            question = await self.session.scalar(
+                select(QuestionModel)
+                .options(selectinload(QuestionModel.answers))
+                .where(QuestionModel.quiz_id == quiz_id, QuestionModel.id == question_id)
+            )
+            if question is not None:
+                return self.dict_mapper.question_model_to_domain(question)
+        await raise_item_not_found(QuestionModel.id, question_id, QuestionModel.__name__)
+
+    async def update_question(
+        self, quiz_id: UUID, question: ChoiceQuestion, expected_version: Optional[int] = None
+    ) -> UUID:
+        # Как в update_one: сначала CAS по quiz.version, потом строки. Квиз ещё в JSONB - переносим в таблицы.
+        await self.admin_repo.update_fields(quiz_id, {}, expected_version)
+        if await self._get_jsonb_questions(quiz_id) is not None:
+            await move_questions_to_tables(self.session, [quiz_id])
+        position = await self.session.scalar(
+            select(QuestionModel.position)
+            .where(QuestionModel.quiz_id == quiz_id, QuestionModel.id == question.id)
+        )
+        if position is None:
+            await raise_item_not_found(QuestionModel.id, question.id, QuestionModel.__name__)
+
+        question_row, answer_rows = self.dict_mapper.question_to_rows(quiz_id, position, question)
+        await self._sync_rows(quiz_id, [question_row], answer_rows)
+        return question.id
+
+    async def update_one(
+        self, quiz_id: UUID, new_quiz: Quiz, expected_version: Optional[int] = None
+    ) -> UUID:
+        # Строки вопросов трогаем только после CAS по quiz.version: он и защищает их от чужой правки.
+        row_id = await self.admin_repo.update_one(quiz_id, new_quiz, expected_version)
+        question_rows, answer_rows = self.dict_mapper.questions_to_rows(new_quiz)
+        await self.session.execute(
+            delete(QuestionModel).where(
+                QuestionModel.quiz_id == quiz_id,
+                QuestionModel.id.not_in([row["id"] for row in question_rows]),
+            )
+        )
+        await self._sync_rows(quiz_id, question_rows, answer_rows)
+        return row_id
+
+    async def delete_one(self, quiz_id: UUID) -> UUID:
+        # Строки вопросов и ответов удалит ON DELETE CASCADE.
+        return await self.admin_repo.delete_one(quiz_id)
+
+    def _select_quiz(self):
+        return select(self.model).options(
+            joinedload(self.model.subject),
+            selectinload(self.model.normalized_questions).selectinload(QuestionModel.answers),
+        )
+
+    async def _get_jsonb_questions(self, quiz_id: UUID) -> Optional[list[dict]]:
+        row = (
+            await self.session.execute(select(self.model.questions).where(self.model.id == quiz_id))
+        ).first()
+        if row is None:
+            await raise_item_not_found(self.model.id, quiz_id, self.model.__name__)
+        return row.questions
+
+    async def _insert_questions(self, quizzes: list[Quiz]) -> None:
+        """IntegrityError is left to the caller: add_many turns it into a per-quiz error."""
+        question_rows, answer_rows = [], []
+        for quiz in quizzes:
+            quiz_question_rows, quiz_answer_rows = self.dict_mapper.questions_to_rows(quiz)
+            question_rows.extend(quiz_question_rows)
+            answer_rows.extend(quiz_answer_rows)
+        if not question_rows:
+            return
+        await self.session.execute(insert(QuestionModel), question_rows)
+        await self.session.execute(insert(AnswerModel), answer_rows)
+
+    async def _sync_rows(self, quiz_id: UUID, question_rows: list[dict], answer_rows: list[dict]) -> None:
+        """
+        Deletes answers that are gone and upserts only new or changed question/answer rows.
+        Rows are looked up and overwritten only within quiz_id: an id taken from another quiz
+        is a conflict, not a move of that question or answer into this quiz.
+        """
+        quiz_question_ids = select(QuestionModel.id).where(QuestionModel.quiz_id == quiz_id)
+        question_ids = [row["id"] for row in question_rows]
+        await self.session.execute(
+            delete(AnswerModel).where(
+                AnswerModel.question_id.in_(quiz_question_ids.where(QuestionModel.id.in_(question_ids))),
+                AnswerModel.id.not_in([row["id"] for row in answer_rows]),
+            )
+        )
+        existing_questions = {
+            row.id: row
+            for row in await self.session.execute(
+                select(QuestionModel.id, QuestionModel.quiz_id, QuestionModel.position, QuestionModel.text)
+                .where(QuestionModel.quiz_id == quiz_id, QuestionModel.id.in_(question_ids))
+            )
+        }
+        existing_answers = {
+            row.id: row
+            for row in await self.session.execute(
+                select(
+                    AnswerModel.id,
+                    AnswerModel.question_id,
+                    AnswerModel.position,
+                    AnswerModel.text,
+                    AnswerModel.is_correct,
+                ).where(AnswerModel.question_id.in_(quiz_question_ids))
+            )
+        }
+        try:
+            await self._upsert(
+                QuestionModel,
+                self._changed(question_rows, existing_questions),
+                lambda excluded: QuestionModel.quiz_id == excluded.quiz_id,
+            )
+            await self._upsert(
+                AnswerModel,
+                self._changed(answer_rows, existing_answers),
+                lambda _: AnswerModel.question_id.in_(quiz_question_ids),
+            )
+
+        except IntegrityError as e:
+            await sqlalchemy_asyncpg_exception_mapper(e)
+
+    @staticmethod
+    def _changed(rows: list[dict], existing: dict) -> list[dict]:
+        return [
+            row for row in rows
+            if row["id"] not in existing or existing[row["id"]]._asdict() != row
+        ]
+
+    async def _upsert(self, model, rows: list[dict], same_quiz) -> None:
+        """same_quiz(excluded) limits DO UPDATE to rows of this quiz; a skipped row is ItemDataConflict."""
+        if not rows:
+            return
+        statement = pg_insert(model)
+        columns = [key for key in rows[0] if key != "id"]
+        written_ids = set(
+            await self.session.scalars(
+                statement.on_conflict_do_update(
+                    index_elements=[model.id],
+                    set_={column: statement.excluded[column] for column in columns},
+                    where=same_quiz(statement.excluded),
+                ).returning(model.id),
+                rows,
+            )
+        )
+        foreign_ids = [row["id"] for row in rows if row["id"] not in written_ids]
+        if foreign_ids:
+            raise ItemDataConflict(
+                detail=f"Key (id)=({foreign_ids[0]}) already belongs to another quiz.",
+                cause_entity=model.__name__,
+            )
@@ -0,0 +1,115 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.sqlalchemy.instrumentation import track_operations
+from src.adapters.sqlalchemy.models import QuizModel, QuizResultRollupModel, SubjectModel
+from src.application.domain.attempt import Attempt
+from src.application.ports.quiz_result import (
+    DifficultyResultSummary,
+    QuizResultSummary,
+    SubjectResultSummary,
+)
+
+
+def summed_totals(*group_by):
+    """Totals of the rollup rows per group; sum() of bigint is numeric in Postgres, so cast back."""
+    rollup = QuizResultRollupModel
+    return select(
+        *group_by,
+        cast(func.sum(rollup.attempt_count), BigInteger).label("attempt_count"),
+        cast(func.sum(rollup.score_sum), BigInteger).label("score_sum"),
+        cast(func.sum(rollup.question_count_sum), BigInteger).label("question_count_sum"),
+    ).group_by(*group_by)
+
+
+def averages(totals) -> list:
+    score_sum = cast(totals.c.score_sum, Float)
+    return [
+        totals.c.attempt_count,
+        (score_sum / cast(totals.c.attempt_count, Float)).label("average_score"),
+        func.coalesce(
+            score_sum / func.nullif(cast(totals.c.question_count_sum, Float), 0, type_=Float), 0.0
+        ).label("average_correct_ratio"),
+    ]
+
+
+@track_operations("quiz_result")
+class QuizResultRepositorySqlAlchemy:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.model = QuizResultRollupModel
+
+    async def add_finished_attempt(self, attempt: Attempt) -> None:
+        # Предмет и сложность берём из квиза в той же транзакции, одним запросом.
+        rows = select(
+            QuizModel.id,
+            QuizModel.subject_id,
+            QuizModel.difficulty,
+            literal(1, BigInteger),
+            literal(attempt.score, BigInteger),
+            literal(attempt.question_count, Integer),
+            literal(attempt.finished_at, DateTime(timezone=True)),
+        ).where(QuizModel.id == attempt.quiz_id)
+        query = pg_insert(self.model).from_select(
+            [
+                self.model.quiz_id,
+                self.model.subject_id,
+                self.model.difficulty,
+                self.model.attempt_count,
+                self.model.score_sum,
+                self.model.question_count_sum,
+                self.model.last_finished_at,
+            ],
+            rows,
+        )
+        model, excluded = self.model, query.excluded
+        await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[model.quiz_id, model.subject_id, model.difficulty],
+                set_={
+                    "attempt_count": model.attempt_count + excluded.attempt_count,
+                    "score_sum": model.score_sum + excluded.score_sum,
+                    "question_count_sum": model.question_count_sum + excluded.question_count_sum,
+                    "last_finished_at": func.greatest(model.last_finished_at, excluded.last_finished_at),
+                },
+            )
+        )
+
+    async def get_quiz_page(self, limit: int, after_id: Optional[UUID] = None) -> list[QuizResultSummary]:
+        # Страница выбирается по первичному ключу итогов, до соединения с квизами.
+        totals_query = summed_totals(self.model.quiz_id).order_by(self.model.quiz_id).limit(limit)
+        if after_id is not None:
+            totals_query = totals_query.where(self.model.quiz_id > after_id)
+        totals = totals_query.subquery()
+        rows = await self.session.execute(
+            select(
+                QuizModel.id,
+                QuizModel.name,
+                SubjectModel.name.label("subject_name"),
+                QuizModel.difficulty,
+                *averages(totals),
+            )
+            .join(QuizModel, QuizModel.id == totals.c.quiz_id)
+            .join(SubjectModel, SubjectModel.id == QuizModel.subject_id)
+            .order_by(QuizModel.id)
+        )
+        return [QuizResultSummary(**row._asdict()) for row in rows]
+
+    async def get_by_subject(self) -> list[SubjectResultSummary]:
+        totals = summed_totals(self.model.subject_id).subquery()
+        rows = await self.session.execute(
+            select(SubjectModel.id, SubjectModel.name, *averages(totals))
+            .join(SubjectModel, SubjectModel.id == totals.c.subject_id)
+            .order_by(SubjectModel.name)
+        )
+        return [SubjectResultSummary(**row._asdict()) for row in rows]
+
+    async def get_by_difficulty(self) -> list[DifficultyResultSummary]:
+        totals = summed_totals(self.model.difficulty).subquery()
+        rows = await self.session.execute(
+            select(totals.c.difficulty, *averages(totals)).order_by(totals.c.difficulty)
+        )
+        return [DifficultyResultSummary(**row._asdict()) for row in rows]
@@ -1,19 +1,26 @@
+from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.sqlalchemy.exc_mappers import raise_item_not_found
+from src.adapters.sqlalchemy.instrumentation import track_operations
 from src.adapters.sqlalchemy.mappers import SubjectSQLAlchemyMapper
 from src.adapters.sqlalchemy.repositories.quiz_admin_repo import AdminRepositorySqlAlchemy
 from src.application.domain.quiz import Subject
+from src.application.ports.bulk import BulkItemResult
 from src.adapters.sqlalchemy.models import SubjectModel
 
 
+@track_operations("subject")
 class SubjectRepositorySqlAlchemy:
     def __init__(self, session: AsyncSession):
         self.admin_repo = AdminRepositorySqlAlchemy(
             model=SubjectModel,
             model_key_field=SubjectModel.id,
             session=session,
-            dict_mapper=SubjectSQLAlchemyMapper()
+            dict_mapper=SubjectSQLAlchemyMapper(),
+            version_field=SubjectModel.version,
         )
         self.session = session
         self.model = SubjectModel
@@ -22,11 +29,34 @@ class SubjectRepositorySqlAlchemy:
     async def add_one(self, subject: Subject) -> UUID:
         return await self.admin_repo.add_one(subject)
 
+    async def add_one_if_absent(self, subject: Subject) -> UUID:
+        return await self.admin_repo.add_one_if_absent(subject)
+
+    async def add_many(self, subjects: list[Subject]) -> list[BulkItemResult]:
+        return await self.admin_repo.add_many(subjects)
+
     async def get_all(self) -> list[Subject]:
         return await self.admin_repo.get_all()
 
-    async def update_one(self, subject_id: UUID, new_subject: Subject) -> UUID:
-        return await self.admin_repo.update_one(subject_id, new_subject)
+    async def get_by_ids(self, subject_ids: list[UUID]) -> list[Subject]:
+        return await self.admin_repo.get_by_keys(subject_ids)
+
+    async def get_page(self, limit: int, after_id: Optional[UUID] = None) -> list[Subject]:
+        return await self.admin_repo.get_page(limit, after_id)
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        return await self.admin_repo.get_collection_version()
+
+    async def get_by_id_with_version(self, subject_id: UUID) -> tuple[Subject, int]:
+        subject = await self.session.scalar(select(self.model).where(self.model.id == subject_id))
+        if subject is None:
+            await raise_item_not_found(self.model.id, subject_id, self.model.__name__)
+        return self.dict_mapper.model_to_domain(subject), subject.version
+
+    async def update_one(
+        self, subject_id: UUID, new_subject: Subject, expected_version: Optional[int] = None
+    ) -> UUID:
+        return await self.admin_repo.update_one(subject_id, new_subject, expected_version)
 
     async def delete_one(self, subject_id: UUID) -> UUID:
         return await self.admin_repo.delete_one(subject_id)
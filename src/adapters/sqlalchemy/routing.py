@@ -0,0 +1,34 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+
+# Ключи Session.info, через которые UoW и API управляют маршрутизацией.
+READ_ONLY = "read_only"
+PIN_PRIMARY = "pin_primary"
+WROTE = "wrote"
+# Сессия хоть раз начинала транзакцию, то есть брала соединение из пула.
+USED = "used"
+
+
+class RoutingSession(Session):
+    """
+    Sends read-only units of work to the replica and everything else to the primary.
+    A session pinned to the primary (read-your-writes) never goes to the replica.
+    The bind is picked when a transaction starts, so one transaction never spans both.
+    """
+
+    def __init__(self, primary: AsyncEngine, replica: AsyncEngine, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary.sync_engine
+        self.replica = replica.sync_engine
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get(READ_ONLY) and not self.info.get(PIN_PRIMARY):
+            return self.replica
+        return self.primary
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _mark_used(session: Session, transaction, connection) -> None:
+    session.info[USED] = True
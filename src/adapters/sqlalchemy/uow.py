@@ -1,21 +1,84 @@
-
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.application.ports.uow import UnitOfWork
+from src.adapters.sqlalchemy.exc_mappers import (
+    is_item_data_error,
+    is_serialization_failure,
+    sqlalchemy_item_error_mapper,
+)
+from src.adapters.sqlalchemy.instrumentation import UOW_COMMITS, UOW_ROLLBACKS
+from src.adapters.sqlalchemy.routing import READ_ONLY, WROTE
+from src.application.domain.exceptions import ItemDataConflict
+from src.application.ports.uow import IsolationLevel, UnitOfWork
 
 
 class SqlAlchemyUnitOfWork(UnitOfWork):
     def __init__(self, async_session: AsyncSession):
         self.async_session = async_session
+        self._commit_callbacks: list[Callable[[], Any]] = []
+        self._read_only = False
+        self._isolation_level: Optional[IsolationLevel] = None
 
     async def __aenter__(self):
+        # RoutingSession выбирает engine по этому флагу в начале транзакции.
+        self.async_session.info[READ_ONLY] = self._read_only
         await self.async_session.__aenter__()
+        if self._isolation_level is not None:
+            # Уровень задаётся до первого запроса транзакции, поэтому соединение берётся сразу.
+            await self.async_session.connection(
+                execution_options={"isolation_level": self._isolation_level.value}
+            )
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
+        self._commit_callbacks.clear()
+        self._read_only = False
+        self._isolation_level = None
+        self.async_session.info[READ_ONLY] = False
+        if exc_type is not None:
+            UOW_ROLLBACKS.inc(("error",))
         await self.async_session.__aexit__(exc_type, exc_value, traceback)
+        if is_serialization_failure(exc_value):
+            raise ItemDataConflict(
+                detail="Transaction conflicted with a concurrent one and was rolled back, retry it"
+            ) from exc_value
+
+    def read_only(self) -> "SqlAlchemyUnitOfWork":
+        self._read_only = True
+        return self
+
+    def with_isolation(self, level: IsolationLevel) -> "SqlAlchemyUnitOfWork":
+        self._isolation_level = level
+        return self
+
+    @asynccontextmanager
+    async def savepoint(self):
+        callback_count = len(self._commit_callbacks)
+        try:
+            async with self.async_session.begin_nested():
+                yield self
+        except BaseException as e:
+            UOW_ROLLBACKS.inc(("savepoint",))
+            del self._commit_callbacks[callback_count:]
+            # Ошибка в данных операции откатана вместе с savepoint: наружу — исключение ядра.
+            if isinstance(e, DBAPIError) and is_item_data_error(e):
+                await sqlalchemy_item_error_mapper(e)
+            raise
 
     async def commit(self):
         await self.async_session.commit()
+        UOW_COMMITS.inc()
+        if not self._read_only:
+            self.async_session.info[WROTE] = True
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        for callback in callbacks:
+            callback()
 
     async def rollback(self):
+        self._commit_callbacks.clear()
         await self.async_session.rollback()
+        UOW_ROLLBACKS.inc(("explicit",))
+
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        self._commit_callbacks.append(callback)
@@ -1,5 +1,8 @@
 from sanic import Blueprint
+from src.api.monitoring import monitoring
 from src.api.quiz_admin import quiz_admin
+from src.api.quiz_ongoing import quiz_ongoing
+from src.api.quiz_results import quiz_results
 
 
-api = Blueprint.group(quiz_admin, url_prefix="/api")
+api = Blueprint.group(quiz_admin, quiz_ongoing, quiz_results, monitoring, url_prefix="/api")
@@ -0,0 +1,100 @@
+"""
+Сжатие ответов gzip/deflate по Accept-Encoding.
+
+Сжимаются только ответы с телом не меньше COMPRESSION_MIN_SIZE и сжимаемым типом.
+Если у ответа есть ETag, тело для этой версии уже неизменно, поэтому сжатый
+результат запоминается по (путь, query, ETag, кодировка) и повторно не сжимается.
+"""
+import gzip
+import zlib
+from typing import Optional
+
+from sanic import HTTPResponse, Request
+
+from src.config import COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE
+
+
+# При равных q предпочитаем первую.
+SUPPORTED_ENCODINGS = ("gzip", "deflate")
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding the client accepts (q > 0), or None."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+    wildcard = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "gzip":
+        # mtime=0: одинаковое тело даёт одинаковые байты.
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    # В HTTP "deflate" — это zlib-обёртка (RFC 1950), а не голый deflate.
+    return zlib.compress(body, level)
+
+
+def is_compressible(response: HTTPResponse) -> bool:
+    content_type = response.content_type or response.headers.get("content-type", "")
+    return (
+        response.status == 200
+        and isinstance(response.body, bytes)
+        and "content-encoding" not in response.headers
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+def add_vary(response: HTTPResponse, header: str) -> None:
+    vary = response.headers.get("vary")
+    if not vary:
+        response.headers["vary"] = header
+    elif header.lower() not in (item.strip().lower() for item in vary.split(",")):
+        response.headers["vary"] = f"{vary}, {header}"
+
+
+async def compress_response(request: Request, response: HTTPResponse) -> None:
+    if not is_compressible(response):
+        return
+    # Ответ зависит от Accept-Encoding, даже если этот клиент получит его несжатым.
+    add_vary(response, "Accept-Encoding")
+    body = response.body
+    if len(body) < COMPRESSION_MIN_SIZE:
+        return
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding is None:
+        return
+
+    etag = response.headers.get("etag")
+    cache = request.app.ctx.compressed_body_cache
+    key = (request.path, request.query_string, etag, encoding)
+    compressed = cache.get(key) if etag else None
+    if compressed is None:
+        compressed = compress(body, encoding, COMPRESSION_LEVEL)
+        if etag:
+            cache.put(key, compressed, cache.version())
+
+    response.body = compressed
+    response.headers["content-encoding"] = encoding
+    response.headers.pop("content-length", None)
+    if etag and not etag.startswith("W/"):
+        # Сжатое представление побайтно другое, сильный ETag для него был бы неверен.
+        # If-None-Match сравнивается слабо, так что W/ совпадёт с тем же ETag без W/.
+        response.headers["etag"] = f"W/{etag}"
@@ -0,0 +1,62 @@
+"""
+Условный GET по версиям из базы. Сначала читается версия (один дешёвый запрос),
+и только если клиент прислал другую — сами данные. Версия читается раньше данных,
+поэтому данные в ответе не старше ETag: в худшем случае клиент лишний раз перезапросит.
+
+Условная запись: версия из If-Match уходит в compare-and-swap UPDATE, без блокировок строк.
+"""
+import re
+from typing import Optional
+
+from sanic import HTTPResponse, Request, empty
+
+from src.application.domain.exceptions import MalformedRequest, StaleItemVersion
+
+
+ETAG_VERSIONS = re.compile(r'"(\d+)(?:\.\d+)*"')
+# Список entity-tag по RFC 9110: ["W/"]"<символы без кавычек и пробелов>" через запятую.
+ENTITY_TAG = r'(?:W/)?"[^"\s]*"'
+ENTITY_TAG_LIST = re.compile(rf"\s*{ENTITY_TAG}\s*(?:,\s*{ENTITY_TAG}\s*)*")
+
+
+def make_etag(*versions) -> str:
+    """Strong ETag: the same versions always give byte-identical responses."""
+    return '"' + ".".join(str(version) for version in versions) + '"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    # Для If-None-Match сравнение слабое: W/ у тегов клиента не мешает совпадению.
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> HTTPResponse:
+    return empty(status=304, headers={"ETag": etag})
+
+
+def with_etag(response: HTTPResponse, etag: str) -> HTTPResponse:
+    response.headers["ETag"] = etag
+    return response
+
+
+def if_match_version(request: Request) -> Optional[int]:
+    """
+    Version an update must be based on, from If-Match with one ETag made by make_etag. Its first part
+    is the version of the item itself: for a quiz ETag "3.7" it is quiz version 3, the subject version
+    only makes the representation. None (no header or "*") means an unconditional update.
+    A header that is not a list of ETags is MalformedRequest (400); well-formed ETags that are not
+    one version of this item can never match it, so they are StaleItemVersion (412).
+    """
+    header = request.headers.get("If-Match")
+    if header is None or header.strip() == "*":
+        return None
+    if ENTITY_TAG_LIST.fullmatch(header) is None:
+        raise MalformedRequest(detail=f"If-Match ({header}) is not a list of ETags")
+    # W/ снимаем: ETag ослабляется только при сжатии ответа, версия за ним та же.
+    match = ETAG_VERSIONS.fullmatch(header.strip().removeprefix("W/"))
+    if match is None:
+        raise StaleItemVersion(detail=f"If-Match ({header}) is not one ETag of this item")
+    return int(match.group(1))
@@ -0,0 +1,33 @@
+from sanic import Request, json
+
+from src.application.domain.exceptions import (
+    BaseCoreException,
+    DuplicateItem,
+    ForbiddenResourceForUser,
+    ItemDataConflict,
+    ItemNotFound,
+    MalformedRequest,
+    ReferencedItem,
+    StaleItemVersion,
+    UnprocessableItem,
+)
+
+
+STATUS_BY_EXCEPTION = {
+    ItemNotFound: 404,
+    DuplicateItem: 409,
+    ItemDataConflict: 409,
+    # Версия из If-Match уже не текущая.
+    StaleItemVersion: 412,
+    ReferencedItem: 409,
+    UnprocessableItem: 422,
+    MalformedRequest: 400,
+    ForbiddenResourceForUser: 403,
+}
+
+
+async def core_exception_handler(_: Request, exc: BaseCoreException):
+    return json(
+        {"message": exc.message, "detail": exc.detail, "cause_entity": exc.cause_entity},
+        status=STATUS_BY_EXCEPTION.get(type(exc), 400),
+    )
@@ -0,0 +1,55 @@
+"""
+Idempotency-Key для создающих POST. Клиент повторяет запрос с тем же ключом после таймаута,
+и повтор получает сохранённый ответ первого запроса (с заголовком Idempotent-Replayed),
+а не создаёт объект ещё раз. Сохраняются только успешные ответы: ошибку повтор перепроверит.
+"""
+from hashlib import sha256
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from sanic import HTTPResponse, Request, raw
+
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.idempotency import IdempotencyService
+
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def request_fingerprint(request: Request) -> str:
+    return sha256(f"{request.method} {request.path}\n".encode() + (request.body or b"")).hexdigest()
+
+
+async def run_idempotent(
+    request: Request,
+    idempotency: IdempotencyService,
+    create: Callable[[Optional[UUID]], Awaitable[HTTPResponse]],
+) -> HTTPResponse:
+    """
+    create gets the id for the new object: derived from the key, or None without the header
+    (then the request is not idempotent and create picks the id itself).
+    """
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None:
+        return await create(None)
+    if not 0 < len(key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise UnprocessableItem(
+            detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters",
+            cause_entity="IdempotencyKey",
+        )
+
+    fingerprint = request_fingerprint(request)
+    stored = await idempotency.get_response(key, fingerprint)
+    if stored is not None:
+        return raw(
+            stored.body,
+            status=stored.status,
+            content_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    response = await create(idempotency.object_id(key))
+    if 200 <= response.status < 300:
+        await idempotency.save_response(key, fingerprint, response.status, response.body)
+    return response
@@ -0,0 +1,49 @@
+"""
+/metrics в формате Prometheus и время обработки запросов по маршруту, методу и статусу.
+
+Отсчёт начинается по сигналу http.lifecycle.request, сразу после разбора заголовков,
+поэтому учитываются и 404, и ошибки в request-middleware. Маршрут в метке — шаблон пути
+(/api/quiz/<quiz_id:uuid>), а не сам путь: иначе число серий росло бы с каждым id.
+"""
+from time import perf_counter
+
+from sanic import Blueprint, HTTPResponse, Request, text
+from sanic_ext import openapi
+
+from src.metrics import REGISTRY, histogram
+
+
+UNMATCHED_ROUTE = "unmatched"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+REQUEST_DURATION = histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status",
+    ("route", "method", "status"),
+)
+
+metrics = Blueprint("metrics")
+
+
+async def start_request_timer(request: Request) -> None:
+    request.ctx.started = perf_counter()
+
+
+async def observe_request(request: Request, response: HTTPResponse) -> None:
+    started = getattr(request.ctx, "started", None)
+    if started is None:
+        return
+    route = request.route
+    REQUEST_DURATION.observe(
+        (f"/{route.path}" if route is not None else UNMATCHED_ROUTE, request.method, response.status),
+        perf_counter() - started,
+    )
+
+
+@metrics.get("/metrics")
+@openapi.definition(
+    summary="Request, database query, unit of work and connection pool metrics of this worker",
+    tag="Monitoring",
+)
+async def export_metrics(_: Request):
+    return text(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,72 @@
+from dataclasses import asdict
+
+from sanic import Blueprint, Request, json
+from sanic_ext import openapi
+
+from src.adapters.sqlalchemy.pool import InstrumentedAsyncQueuePool, PoolStats
+from src.adapters.sqlalchemy.query_log import QueryLog, QueryLogStats
+from src.api.request_session import RequestSessions, RequestSessionStats
+from src.application.ports.cache import CacheStats, CompressedBodyCache, IdempotencyCache, QuizCache
+
+
+monitoring = Blueprint("monitoring", url_prefix="/monitoring")
+
+
+@monitoring.get("/quiz-cache")
+@openapi.definition(
+    response={"application/json": CacheStats},
+    summary="Quiz cache hit/miss/eviction counters of this worker",
+    tag="Monitoring",
+)
+async def quiz_cache_stats(_: Request, cache: QuizCache):
+    return json(asdict(cache.stats()))
+
+
+@monitoring.get("/compression-cache")
+@openapi.definition(
+    response={"application/json": CacheStats},
+    summary="Compressed response body cache counters of this worker",
+    tag="Monitoring",
+)
+async def compression_cache_stats(_: Request, cache: CompressedBodyCache):
+    return json(asdict(cache.stats()))
+
+
+@monitoring.get("/idempotency-cache")
+@openapi.definition(
+    response={"application/json": CacheStats},
+    summary="Recent Idempotency-Key responses cached by this worker",
+    tag="Monitoring",
+)
+async def idempotency_cache_stats(_: Request, cache: IdempotencyCache):
+    return json(asdict(cache.stats()))
+
+
+@monitoring.get("/db-pool")
+@openapi.definition(
+    response={"application/json": PoolStats},
+    summary="Connection pool usage and connection wait time of this worker",
+    tag="Monitoring",
+)
+async def db_pool_stats(_: Request, pool: InstrumentedAsyncQueuePool):
+    return json(asdict(pool.stats()))
+
+
+@monitoring.get("/db-sessions")
+@openapi.definition(
+    response={"application/json": RequestSessionStats},
+    summary="Request-scoped database sessions of this worker: opened, never used, left in a transaction",
+    tag="Monitoring",
+)
+async def db_session_stats(_: Request, sessions: RequestSessions):
+    return json(asdict(sessions.stats()))
+
+
+@monitoring.get("/db-queries")
+@openapi.definition(
+    response={"application/json": QueryLogStats},
+    summary="Statement fingerprints of this worker by total time: calls, slow calls, p95 and sampled plans",
+    tag="Monitoring",
+)
+async def db_query_stats(_: Request, query_log: QueryLog):
+    return json(asdict(query_log.stats()))
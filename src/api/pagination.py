@@ -0,0 +1,69 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from struct import error as StructError, pack, unpack
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+
+def encode_cursor(key: Optional[UUID]) -> Optional[str]:
+    if key is None:
+        return None
+    return urlsafe_b64encode(key.bytes).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> UUID:
+    try:
+        return UUID(bytes=urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (BinasciiError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_ranked_cursor(key: Optional[tuple[float, UUID]]) -> Optional[str]:
+    if key is None:
+        return None
+    rank, key_id = key
+    return urlsafe_b64encode(pack(">d", rank) + key_id.bytes).rstrip(b"=").decode()
+
+
+def decode_ranked_cursor(cursor: str) -> tuple[float, UUID]:
+    try:
+        data = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        (rank,) = unpack(">d", data[:8])
+        return rank, UUID(bytes=data[8:])
+    except (BinasciiError, StructError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class PageQueryModel(BaseModel):
+    """Клиент не должен знать, что внутри курсора, поэтому ключ отдаётся в base64."""
+
+    limit: int = Field(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT)
+    cursor: Optional[UUID] = None
+
+    @field_validator("cursor", mode="before")
+    @classmethod
+    def _decode_cursor(cls, value):
+        if value is None or isinstance(value, UUID):
+            return value
+        return decode_cursor(value)
+
+
+class SearchQueryModel(BaseModel):
+    """Курсор поиска несёт ранг последнего результата вместе с id."""
+
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(default=DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT)
+    cursor: Optional[tuple[float, UUID]] = None
+
+    @field_validator("cursor", mode="before")
+    @classmethod
+    def _decode_cursor(cls, value):
+        if value is None or isinstance(value, tuple):
+            return value
+        return decode_ranked_cursor(value)
@@ -1,13 +1,30 @@
 from dataclasses import dataclass
 from datetime import timedelta
 from uuid import UUID
-from typing import List
-from sanic import Blueprint, Request, json
+from typing import List, Optional
+from sanic import Blueprint, Request, json, raw
 from sanic_ext import validate, openapi
 from sanic_ext.extensions.openapi.definitions import Response
-from pydantic import BaseModel
-from src.application.quiz_admin import SubjectAdminService, SubjectDTO
+from pydantic import BaseModel, Field, model_validator
+from src.api.idempotency import IDEMPOTENCY_KEY_HEADER, run_idempotent
+from src.api.conditional import if_match_version, is_not_modified, make_etag, not_modified, with_etag
+from src.api.pagination import PageQueryModel, SearchQueryModel, encode_cursor, encode_ranked_cursor
+from src.application.idempotency import IdempotencyService
+from src.application.admin_batch import AdminBatchService, BatchAction, BatchEntity, BatchOperation
+from src.application.quiz_admin import (
+    ChoiceAnswerAdminDTO,
+    ChoiceQuestionAdminDTO,
+    QuizAdminDTO,
+    QuizAdminService,
+    SubjectAdminService,
+    SubjectDTO,
+)
+from src.application.quiz_import import ImportReport, QuizImportService
 from src.application.domain.quiz import Difficulty, Subject
+from src.application.ports.bulk import BulkItemResult
+from src.application.ports.quiz import QuizSummaryFilter
+from src.application.ports.uow import IsolationLevel
+from src.config import BULK_MAX_ITEMS
 
 
 quiz_admin = Blueprint("quiz-admin", url_prefix="/quiz-admin")
@@ -18,12 +35,19 @@ class SubjectModel(BaseModel):
     description: str
 
 
+class SubjectBulkModel(BaseModel):
+    items: List[SubjectModel] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
 class ChoiceAnswerModel(BaseModel):
+    # id из GET квиза: без него PUT выдал бы ответу новый id, и строка ответа переписалась бы целиком.
+    id: Optional[UUID] = None
     is_correct: bool
     text: str
 
 
 class ChoiceQuestionModel(BaseModel):
+    id: Optional[UUID] = None
     text: str
     answers: List[ChoiceAnswerModel]
 
@@ -37,11 +61,123 @@ class QuizModel(BaseModel):
     questions: List[ChoiceQuestionModel]
 
 
+def question_model_to_dto(question: ChoiceQuestionModel) -> ChoiceQuestionAdminDTO:
+    return ChoiceQuestionAdminDTO(
+        id=question.id,
+        text=question.text,
+        answers=[
+            ChoiceAnswerAdminDTO(id=answer.id, is_correct=answer.is_correct, text=answer.text)
+            for answer in question.answers
+        ],
+    )
+
+
+def quiz_model_to_dto(quiz: QuizModel) -> QuizAdminDTO:
+    return QuizAdminDTO(
+        name=quiz.name,
+        description=quiz.description,
+        time=quiz.time,
+        difficulty=quiz.difficulty,
+        subject=quiz.subject,
+        questions=[question_model_to_dto(question) for question in quiz.questions],
+    )
+
+
+class BatchOperationModel(BaseModel):
+    action: BatchAction
+    entity: BatchEntity
+    # Для update и delete.
+    id: Optional[UUID] = None
+    # Для update: как If-Match, первая часть ETag объекта.
+    version: Optional[int] = None
+    # Для create и update: поле с именем entity.
+    subject: Optional[SubjectModel] = None
+    quiz: Optional[QuizModel] = None
+
+    @model_validator(mode="after")
+    def check_fields(self) -> "BatchOperationModel":
+        if self.action is not BatchAction.CREATE and self.id is None:
+            raise ValueError(f"id is required to {self.action.value}")
+        if self.action is not BatchAction.DELETE and getattr(self, self.entity.value) is None:
+            raise ValueError(f"{self.entity.value} is required to {self.action.value}")
+        return self
+
+    def to_operation(self) -> BatchOperation:
+        dto = None
+        if self.action is not BatchAction.DELETE:
+            if self.entity is BatchEntity.SUBJECT:
+                dto = SubjectDTO(**self.subject.model_dump())
+            else:
+                dto = quiz_model_to_dto(self.quiz)
+        return BatchOperation(
+            action=self.action, entity=self.entity, object_id=self.id, dto=dto, expected_version=self.version
+        )
+
+
+class BatchModel(BaseModel):
+    isolation: IsolationLevel = IsolationLevel.READ_COMMITTED
+    operations: List[BatchOperationModel] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+# Больше timedelta не вмещает: без границы такой фильтр падал бы с OverflowError и 500 вместо 400.
+MAX_TIME_FILTER_SECONDS = timedelta.max.days * 24 * 60 * 60
+
+
+class QuizSummaryQueryModel(PageQueryModel):
+    subject_id: Optional[UUID] = None
+    difficulty: Optional[Difficulty] = None
+    # Длительность квиза в секундах, как и time в ответе; границы включаются.
+    min_time: Optional[float] = Field(default=None, ge=0, le=MAX_TIME_FILTER_SECONDS, allow_inf_nan=False)
+    max_time: Optional[float] = Field(default=None, ge=0, le=MAX_TIME_FILTER_SECONDS, allow_inf_nan=False)
+
+    def to_filter(self) -> QuizSummaryFilter:
+        return QuizSummaryFilter(
+            subject_id=self.subject_id,
+            difficulty=self.difficulty,
+            min_time=timedelta(seconds=self.min_time) if self.min_time is not None else None,
+            max_time=timedelta(seconds=self.max_time) if self.max_time is not None else None,
+        )
+
+
 @dataclass
 class UuidResponseModel:
     id: UUID
 
 
+@dataclass
+class ErrorResponseModel:
+    message: str
+    detail: Optional[str]
+    cause_entity: Optional[str]
+
+
+@dataclass
+class BulkItemResponseModel:
+    id: Optional[UUID]
+    error: Optional[ErrorResponseModel]
+
+
+@dataclass
+class BulkResponseModel:
+    items: list[BulkItemResponseModel]
+
+
+def bulk_response(results: list[BulkItemResult], success_status: int = 201):
+    items = [
+        BulkItemResponseModel(
+            id=result.id,
+            error=ErrorResponseModel(
+                message=result.error.message,
+                detail=result.error.detail,
+                cause_entity=result.error.cause_entity,
+            ) if result.error else None,
+        )
+        for result in results
+    ]
+    status = 207 if any(item.error for item in items) else success_status
+    return json(BulkResponseModel(items=items), status=status)
+
+
 @dataclass
 class SubjectResponseModel:
     id: UUID
@@ -49,7 +185,70 @@ class SubjectResponseModel:
     description: str
 
 
+@dataclass
+class SubjectPageResponseModel:
+    items: list[SubjectResponseModel]
+    next_cursor: Optional[str]
+
+
+@dataclass
+class QuizSummaryResponseModel:
+    id: UUID
+    name: str
+    time: timedelta
+    difficulty: Difficulty
+    subject_name: str
+    question_count: int
+
+
+@dataclass
+class QuizSummaryPageResponseModel:
+    items: list[QuizSummaryResponseModel]
+    next_cursor: Optional[str]
+
+
+@dataclass
+class QuizSearchHitResponseModel:
+    id: UUID
+    name: str
+    subject_name: str
+    difficulty: Difficulty
+    rank: float
+
+
+@dataclass
+class QuizSearchPageResponseModel:
+    items: list[QuizSearchHitResponseModel]
+    next_cursor: Optional[str]
+
+
+@dataclass
+class ChoiceAnswerResponseModel:
+    id: UUID
+    is_correct: bool
+    text: str
+
+
+@dataclass
+class ChoiceQuestionResponseModel:
+    id: UUID
+    text: str
+    answers: list[ChoiceAnswerResponseModel]
+
+
+@dataclass
+class QuizResponseModel:
+    id: UUID
+    name: str
+    description: str
+    time: timedelta
+    difficulty: Difficulty
+    subject: SubjectResponseModel
+    questions: list[ChoiceQuestionResponseModel]
+
+
 openapi_subject_create = openapi.definition(
+    parameter={"name": IDEMPOTENCY_KEY_HEADER, "schema": str, "required": False, "location": "header"},
     body={"application/json": SubjectModel.model_json_schema(ref_template="#/components/schemas/{model}")},
     response=[
         Response(
@@ -57,36 +256,91 @@ openapi_subject_create = openapi.definition(
             content={
                 "application/json": UuidResponseModel,
             },
-            description="Success create",
-        )
+            description="Success create; a retry with the same Idempotency-Key gets the same response",
+        ),
+        Response(
+            status="422",
+            description="The Idempotency-Key was already used with another request or for another subject",
+        ),
     ],
     summary="Create a new subject",
     tag="Subject",
 )
 
 
+openapi_subject_create_bulk = openapi.definition(
+    body={
+        "application/json": SubjectBulkModel.model_json_schema(ref_template="#/components/schemas/{model}")
+    },
+    response=[
+        Response(
+            status="201",
+            content={
+                "application/json": BulkResponseModel,
+            },
+            description="All subjects created",
+        ),
+        Response(
+            status="207",
+            content={
+                "application/json": BulkResponseModel,
+            },
+            description="Some subjects were not created, see error of each item",
+        ),
+    ],
+    summary="Create many subjects in one transaction",
+    tag="Subject",
+)
+
+
 openapi_subject_getall = openapi.definition(
+    parameter=[
+        {"name": "limit", "schema": int, "required": False, "location": "query"},
+        {"name": "cursor", "schema": str, "required": False, "location": "query"},
+    ],
     response=[
         Response(
             status="200",
             content={
-                "application/json": list[SubjectResponseModel],
+                "application/json": SubjectPageResponseModel,
             },
             description="Success response",
-        )
+        ),
+        Response(status="304", description="Not modified since the ETag in If-None-Match"),
     ],
-    summary="Get all subjects",
+    summary="Get a page of subjects",
     tag="Subject",
 )
 
 
-openapi_subject_update = openapi.definition(
+openapi_subject_get = openapi.definition(
     parameter={
         "name": "subject_id",
         "schema": UUID,
         "required": True,
         "location": "path",
     },
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": SubjectResponseModel,
+            },
+            description="Success response, the ETag is what PUT takes in If-Match",
+        ),
+        Response(status="404", description="Subject not found"),
+        Response(status="304", description="Not modified since the ETag in If-None-Match"),
+    ],
+    summary="Get a subject by id",
+    tag="Subject",
+)
+
+
+openapi_subject_update = openapi.definition(
+    parameter=[
+        {"name": "subject_id", "schema": UUID, "required": True, "location": "path"},
+        {"name": "If-Match", "schema": str, "required": False, "location": "header"},
+    ],
     body={"application/json": SubjectModel.model_json_schema(ref_template="#/components/schemas/{model}")},
     response=[
         Response(
@@ -95,9 +349,12 @@ openapi_subject_update = openapi.definition(
                 "application/json": UuidResponseModel,
             },
             description="Success response",
-        )
+        ),
+        Response(status="404", description="Subject not found"),
+        Response(status="400", description="If-Match is not a list of ETags"),
+        Response(status="412", description="Subject was changed after the version in If-Match"),
     ],
-    summary="Update a subject",
+    summary="Update a subject; with If-Match only if it is still at that version",
     tag="Subject",
 )
 
@@ -105,23 +362,57 @@ openapi_subject_update = openapi.definition(
 @quiz_admin.post("/subject")
 @openapi_subject_create
 @validate(json=SubjectModel)
-async def create_subject(_: Request, body: SubjectModel, subject_service: SubjectAdminService):
-    subject_id = await subject_service.create_one(SubjectDTO(**body.model_dump()))
-    return json(UuidResponseModel(id=subject_id), status=201)
+async def create_subject(
+    request: Request,
+    body: SubjectModel,
+    subject_service: SubjectAdminService,
+    idempotency: IdempotencyService,
+):
+    async def create(subject_id: Optional[UUID]):
+        dto = SubjectDTO(**body.model_dump(), id=subject_id)
+        created_id = await subject_service.create_one(dto, if_absent=subject_id is not None)
+        return json(UuidResponseModel(id=created_id), status=201)
+
+    return await run_idempotent(request, idempotency, create)
+
+
+@quiz_admin.post("/subject/bulk")
+@openapi_subject_create_bulk
+@validate(json=SubjectBulkModel)
+async def create_subjects(_: Request, body: SubjectBulkModel, subject_service: SubjectAdminService):
+    results = await subject_service.create_many([SubjectDTO(**item.model_dump()) for item in body.items])
+    return bulk_response(results)
 
 
 @quiz_admin.get("/subject")
 @openapi_subject_getall
-async def get(_: Request, subject_service: SubjectAdminService):
-    subjects = await subject_service.get_all()
-    return json(subjects)
+@validate(query=PageQueryModel)
+async def get(request: Request, query: PageQueryModel, subject_service: SubjectAdminService):
+    etag = make_etag("subject", *await subject_service.get_collection_version())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    page = await subject_service.get_page(query.limit, query.cursor)
+    response = json(SubjectPageResponseModel(items=page.items, next_cursor=encode_cursor(page.next_key)))
+    return with_etag(response, etag)
+
+
+@quiz_admin.get("/subject/<subject_id:uuid>")
+@openapi_subject_get
+async def get_subject(request: Request, subject_id: UUID, subject_service: SubjectAdminService):
+    subject, version = await subject_service.get_by_id_with_version(subject_id)
+    etag = make_etag(version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return with_etag(json(subject), etag)
 
 
 @quiz_admin.put("/subject/<subject_id>")
 @openapi_subject_update
 @validate(json=SubjectModel)
-async def put(_: Request, subject_id: UUID, body: SubjectModel, subject_service: SubjectAdminService):
-    updated_id = await subject_service.update_one(subject_id, SubjectDTO(**body.model_dump()))
+async def put(request: Request, subject_id: UUID, body: SubjectModel, subject_service: SubjectAdminService):
+    updated_id = await subject_service.update_one(
+        subject_id, SubjectDTO(**body.model_dump()), if_match_version(request)
+    )
     return json({"id": str(updated_id)})
 
 
@@ -136,6 +427,310 @@ async def delete(_: Request, subject_id: UUID, subject_service: SubjectAdminServ
     return json({"id": str(deleted_id)})
 
 
+openapi_quiz_summary_getall = openapi.definition(
+    parameter=[
+        {"name": "limit", "schema": int, "required": False, "location": "query"},
+        {"name": "cursor", "schema": str, "required": False, "location": "query"},
+        {"name": "subject_id", "schema": UUID, "required": False, "location": "query"},
+        {"name": "difficulty", "schema": Difficulty, "required": False, "location": "query"},
+        {"name": "min_time", "schema": float, "required": False, "location": "query"},
+        {"name": "max_time", "schema": float, "required": False, "location": "query"},
+    ],
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": QuizSummaryPageResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="304", description="Not modified since the ETag in If-None-Match"),
+    ],
+    summary="Get a page of quiz summaries without questions",
+    tag="Quiz",
+)
+
+
+@quiz_admin.get("/quiz/summary")
+@openapi_quiz_summary_getall
+@validate(query=QuizSummaryQueryModel)
+async def get_quiz_summaries(request: Request, query: QuizSummaryQueryModel, quiz_service: QuizAdminService):
+    # Имена предметов в сводках меняются вместе с версией quiz: переименование предмета обновляет его квизы.
+    etag = make_etag("quiz", *await quiz_service.get_collection_version())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    page = await quiz_service.get_summary_page(query.limit, query.cursor, query.to_filter())
+    response = json(QuizSummaryPageResponseModel(items=page.items, next_cursor=encode_cursor(page.next_key)))
+    return with_etag(response, etag)
+
+
+openapi_quiz_search = openapi.definition(
+    parameter=[
+        {"name": "q", "schema": str, "required": True, "location": "query"},
+        {"name": "limit", "schema": int, "required": False, "location": "query"},
+        {"name": "cursor", "schema": str, "required": False, "location": "query"},
+    ],
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": QuizSearchPageResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="304", description="Not modified since the ETag in If-None-Match"),
+    ],
+    summary="Full-text search over quizzes, best match first",
+    tag="Quiz",
+)
+
+
+@quiz_admin.get("/quiz/search")
+@openapi_quiz_search
+@validate(query=SearchQueryModel)
+async def search_quizzes(request: Request, query: SearchQueryModel, quiz_service: QuizAdminService):
+    etag = make_etag("quiz", *await quiz_service.get_collection_version())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    page = await quiz_service.search(query.q, query.limit, query.cursor)
+    next_cursor = encode_ranked_cursor(page.next_key)
+    return with_etag(json(QuizSearchPageResponseModel(items=page.items, next_cursor=next_cursor)), etag)
+
+
+openapi_quiz_get = openapi.definition(
+    parameter={
+        "name": "quiz_id",
+        "schema": UUID,
+        "required": True,
+        "location": "path",
+    },
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": QuizResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="404", description="Quiz not found"),
+        Response(status="304", description="Not modified since the ETag in If-None-Match"),
+    ],
+    summary="Get a quiz by id",
+    tag="Quiz",
+)
+
+
+@quiz_admin.get("/quiz/<quiz_id:uuid>")
+@openapi_quiz_get
+async def get_quiz(request: Request, quiz_id: UUID, quiz_service: QuizAdminService):
+    versions = await quiz_service.get_document_version(quiz_id)
+    etag = make_etag(*versions)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    # Тело берётся ровно для тех версий, что в ETag: кэш этого процесса мог не увидеть чужую запись.
+    quiz, versions = await quiz_service.get_by_id_at_version(quiz_id, versions)
+    return with_etag(json(quiz), make_etag(*versions))
+
+
+openapi_quiz_update = openapi.definition(
+    parameter=[
+        {"name": "quiz_id", "schema": UUID, "required": True, "location": "path"},
+        {"name": "If-Match", "schema": str, "required": False, "location": "header"},
+    ],
+    body={"application/json": QuizModel.model_json_schema(ref_template="#/components/schemas/{model}")},
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": UuidResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="404", description="Quiz or its subject not found"),
+        Response(status="400", description="If-Match is not a list of ETags"),
+        Response(status="412", description="Quiz was changed after the version in If-Match"),
+        Response(status="422", description="Quiz breaks a domain rule, e.g. no correct answer to a question"),
+    ],
+    summary="Replace a quiz; with If-Match (an ETag of GET quiz) only if it is still at that version",
+    tag="Quiz",
+)
+
+
+@quiz_admin.put("/quiz/<quiz_id:uuid>")
+@openapi_quiz_update
+@validate(json=QuizModel)
+async def put_quiz(request: Request, quiz_id: UUID, body: QuizModel, quiz_service: QuizAdminService):
+    updated_id = await quiz_service.update_one(quiz_id, quiz_model_to_dto(body), if_match_version(request))
+    return json(UuidResponseModel(id=updated_id))
+
+
+openapi_quiz_document_get = openapi.definition(
+    parameter={
+        "name": "quiz_id",
+        "schema": UUID,
+        "required": True,
+        "location": "path",
+    },
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": QuizResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="404", description="Quiz not found"),
+        Response(status="304", description="Not modified since the ETag in If-None-Match"),
+    ],
+    summary="Get a quiz by id as a JSON document built by the database",
+    tag="Quiz",
+)
+
+
+@quiz_admin.get("/quiz/<quiz_id:uuid>/document")
+@openapi_quiz_document_get
+async def get_quiz_document(request: Request, quiz_id: UUID, quiz_service: QuizAdminService):
+    etag = make_etag(*await quiz_service.get_document_version(quiz_id))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    # Байты из Postgres уходят в ответ как есть, без объектов и повторного кодирования.
+    document = await quiz_service.get_document_by_id(quiz_id)
+    return with_etag(raw(document, content_type="application/json"), etag)
+
+
+openapi_quiz_question_get = openapi.definition(
+    parameter=[
+        {"name": "quiz_id", "schema": UUID, "required": True, "location": "path"},
+        {"name": "question_id", "schema": UUID, "required": True, "location": "path"},
+    ],
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": ChoiceQuestionResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="404", description="Quiz or question not found"),
+    ],
+    summary="Get one question of a quiz; the ETag is the one of the whole quiz",
+    tag="Quiz",
+)
+
+
+@quiz_admin.get("/quiz/<quiz_id:uuid>/question/<question_id:uuid>")
+@openapi_quiz_question_get
+async def get_quiz_question(_: Request, quiz_id: UUID, question_id: UUID, quiz_service: QuizAdminService):
+    # Версия читается до вопроса: ETag бывает только старее тела, и PUT с ним получит 412, а не затрёт чужое.
+    etag = make_etag(*await quiz_service.get_document_version(quiz_id))
+    question = await quiz_service.get_question(quiz_id, question_id)
+    return with_etag(json(question), etag)
+
+
+openapi_quiz_question_update = openapi.definition(
+    parameter=[
+        {"name": "quiz_id", "schema": UUID, "required": True, "location": "path"},
+        {"name": "question_id", "schema": UUID, "required": True, "location": "path"},
+        {"name": "If-Match", "schema": str, "required": False, "location": "header"},
+    ],
+    body={
+        "application/json": ChoiceQuestionModel.model_json_schema(ref_template="#/components/schemas/{model}")
+    },
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": UuidResponseModel,
+            },
+            description="Success response",
+        ),
+        Response(status="404", description="Quiz or question not found"),
+        Response(status="400", description="If-Match is not a list of ETags"),
+        Response(status="409", description="Quiz was changed concurrently, retry the update"),
+        Response(status="412", description="Quiz was changed after the version in If-Match"),
+        Response(status="422", description="Question breaks a domain rule, e.g. no correct answer"),
+    ],
+    summary="Replace one question of a quiz; If-Match is an ETag of the quiz, as in PUT quiz",
+    tag="Quiz",
+)
+
+
+@quiz_admin.put("/quiz/<quiz_id:uuid>/question/<question_id:uuid>")
+@openapi_quiz_question_update
+@validate(json=ChoiceQuestionModel)
+async def put_quiz_question(
+    request: Request,
+    quiz_id: UUID,
+    question_id: UUID,
+    body: ChoiceQuestionModel,
+    quiz_service: QuizAdminService,
+):
+    updated_id = await quiz_service.update_question(
+        quiz_id, question_id, question_model_to_dto(body), if_match_version(request)
+    )
+    return json(UuidResponseModel(id=updated_id))
+
+
+openapi_batch = openapi.definition(
+    body={"application/json": BatchModel.model_json_schema(ref_template="#/components/schemas/{model}")},
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": BulkResponseModel,
+            },
+            description="All operations applied",
+        ),
+        Response(
+            status="207",
+            content={
+                "application/json": BulkResponseModel,
+            },
+            description="Some operations failed and were rolled back alone, see error of each item",
+        ),
+    ],
+    summary="Apply many subject and quiz changes in one transaction",
+    tag="Batch",
+)
+
+
+@quiz_admin.post("/batch")
+@openapi_batch
+@validate(json=BatchModel)
+async def run_batch(_: Request, body: BatchModel, batch_service: AdminBatchService):
+    operations = [operation.to_operation() for operation in body.operations]
+    results = await batch_service.run(operations, body.isolation)
+    return bulk_response(results, success_status=200)
+
+
+openapi_quiz_import = openapi.definition(
+    body={"application/x-ndjson": str},
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": ImportReport,
+            },
+            description="Import finished, see rejected lines",
+        )
+    ],
+    summary="Import quizzes from an NDJSON stream, one quiz per line",
+    tag="Quiz",
+)
+
+
+async def read_request_stream(request: Request):
+    while (chunk := await request.stream.read()) is not None:
+        yield chunk
+
+
+@quiz_admin.post("/quiz/import", stream=True)
+@openapi_quiz_import
+async def import_quizzes(request: Request, import_service: QuizImportService):
+    report = await import_service.import_ndjson(read_request_stream(request))
+    return json(report)
+
+
 # # Quiz routes
 # @quiz_admin.post("/quizzes")
 # @inject
@@ -0,0 +1,184 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sanic import Blueprint, Request, json
+from sanic.exceptions import Unauthorized
+from sanic_ext import validate, openapi
+from sanic_ext.extensions.openapi.definitions import Response
+from pydantic import BaseModel
+from src.application.quiz_ongoing import QuizOngoingService
+
+
+quiz_ongoing = Blueprint("quiz-ongoing", url_prefix="/quiz-ongoing")
+
+# Аутентификации в сервисе нет: пользователя передаёт шлюз перед ним.
+USER_ID_HEADER = "X-User-Id"
+
+
+def get_user_id(request: Request) -> int:
+    try:
+        return int(request.headers[USER_ID_HEADER])
+    except (KeyError, ValueError) as e:
+        raise Unauthorized(f"Header {USER_ID_HEADER} with an integer user id is required") from e
+
+
+class AnswerModel(BaseModel):
+    answer_ids: List[UUID]
+
+
+@dataclass
+class UuidResponseModel:
+    id: UUID
+
+
+@dataclass
+class AttemptAnswerResponseModel:
+    id: UUID
+    text: str
+
+
+@dataclass
+class AttemptQuestionResponseModel:
+    id: UUID
+    text: str
+    answers: list[AttemptAnswerResponseModel]
+    chosen_answer_ids: list[UUID]
+
+
+@dataclass
+class AttemptResponseModel:
+    id: UUID
+    quiz_id: UUID
+    started_at: datetime
+    deadline: datetime
+    finished_at: Optional[datetime]
+    questions: list[AttemptQuestionResponseModel]
+
+
+@dataclass
+class AttemptResultResponseModel:
+    id: UUID
+    quiz_id: UUID
+    started_at: datetime
+    finished_at: Optional[datetime]
+    score: Optional[int]
+    question_count: int
+
+
+USER_ID_PARAMETER = {"name": USER_ID_HEADER, "schema": int, "required": True, "location": "header"}
+
+
+def path_parameter(name: str) -> dict:
+    return {"name": name, "schema": UUID, "required": True, "location": "path"}
+
+
+openapi_attempt_start = openapi.definition(
+    parameter=[path_parameter("quiz_id"), USER_ID_PARAMETER],
+    response=[
+        Response(
+            status="201", content={"application/json": AttemptResponseModel}, description="Attempt started"
+        ),
+        Response(status="404", description="Quiz not found"),
+    ],
+    summary="Start an attempt to pass a quiz",
+    tag="Quiz ongoing",
+)
+
+
+openapi_attempt_get = openapi.definition(
+    parameter=[path_parameter("attempt_id"), USER_ID_PARAMETER],
+    response=[
+        Response(
+            status="200", content={"application/json": AttemptResponseModel}, description="Success response"
+        ),
+        Response(status="403", description="Attempt belongs to another user"),
+        Response(status="404", description="Attempt not found"),
+    ],
+    summary="Get questions of an attempt with the answers chosen so far",
+    tag="Quiz ongoing",
+)
+
+
+openapi_attempt_answer = openapi.definition(
+    parameter=[path_parameter("attempt_id"), path_parameter("question_id"), USER_ID_PARAMETER],
+    body={"application/json": AnswerModel.model_json_schema(ref_template="#/components/schemas/{model}")},
+    response=[
+        Response(status="200", content={"application/json": UuidResponseModel}, description="Answer saved"),
+        Response(status="409", description="Attempt is finished or its time is over"),
+        Response(status="422", description="Question or answers are not in the quiz"),
+    ],
+    summary="Choose answers to a question, replacing the previous choice",
+    tag="Quiz ongoing",
+)
+
+
+openapi_attempt_end = openapi.definition(
+    parameter=[path_parameter("attempt_id"), USER_ID_PARAMETER],
+    response=[
+        Response(
+            status="200",
+            content={"application/json": AttemptResultResponseModel},
+            description="Attempt finished",
+        ),
+        Response(status="409", description="Attempt is already finished"),
+    ],
+    summary="Finish an attempt and get its score",
+    tag="Quiz ongoing",
+)
+
+
+openapi_quiz_result = openapi.definition(
+    parameter=[path_parameter("quiz_id"), USER_ID_PARAMETER],
+    response=[
+        Response(
+            status="200",
+            content={"application/json": List[AttemptResultResponseModel]},
+            description="Finished attempts of the user",
+        ),
+    ],
+    summary="Get results of the finished attempts of a quiz",
+    tag="Quiz ongoing",
+)
+
+
+@quiz_ongoing.post("/quiz/<quiz_id:uuid>/attempt")
+@openapi_attempt_start
+async def start_attempt(request: Request, quiz_id: UUID, ongoing_service: QuizOngoingService):
+    attempt = await ongoing_service.start_quiz(quiz_id, get_user_id(request))
+    return json(attempt, status=201)
+
+
+@quiz_ongoing.get("/attempt/<attempt_id:uuid>")
+@openapi_attempt_get
+async def get_attempt(request: Request, attempt_id: UUID, ongoing_service: QuizOngoingService):
+    attempt = await ongoing_service.get_questions_and_answers(attempt_id, get_user_id(request))
+    return json(attempt)
+
+
+@quiz_ongoing.put("/attempt/<attempt_id:uuid>/answer/<question_id:uuid>")
+@openapi_attempt_answer
+@validate(json=AnswerModel)
+async def answer_question(
+    request: Request,
+    attempt_id: UUID,
+    question_id: UUID,
+    body: AnswerModel,
+    ongoing_service: QuizOngoingService,
+):
+    await ongoing_service.answer_question(attempt_id, get_user_id(request), question_id, body.answer_ids)
+    return json(UuidResponseModel(id=question_id))
+
+
+@quiz_ongoing.post("/attempt/<attempt_id:uuid>/end")
+@openapi_attempt_end
+async def end_attempt(request: Request, attempt_id: UUID, ongoing_service: QuizOngoingService):
+    result = await ongoing_service.end_ongoing_quiz(attempt_id, get_user_id(request))
+    return json(result)
+
+
+@quiz_ongoing.get("/quiz/<quiz_id:uuid>/result")
+@openapi_quiz_result
+async def get_quiz_result(request: Request, quiz_id: UUID, ongoing_service: QuizOngoingService):
+    results = await ongoing_service.get_quiz_result(quiz_id, get_user_id(request))
+    return json(results)
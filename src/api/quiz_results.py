@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from typing import List, Optional
+from uuid import UUID
+from sanic import Blueprint, Request, json
+from sanic_ext import validate, openapi
+from sanic_ext.extensions.openapi.definitions import Response
+from src.api.pagination import PageQueryModel, encode_cursor
+from src.application.domain.quiz import Difficulty
+from src.application.quiz_results import QuizResultsService
+
+
+quiz_results = Blueprint("quiz-results", url_prefix="/quiz-results")
+
+
+@dataclass
+class QuizResultResponseModel:
+    id: UUID
+    name: str
+    subject_name: str
+    difficulty: Difficulty
+    attempt_count: int
+    average_score: float
+    average_correct_ratio: float
+
+
+@dataclass
+class QuizResultPageResponseModel:
+    items: list[QuizResultResponseModel]
+    next_cursor: Optional[str]
+
+
+@dataclass
+class SubjectResultResponseModel:
+    id: UUID
+    name: str
+    attempt_count: int
+    average_score: float
+    average_correct_ratio: float
+
+
+@dataclass
+class DifficultyResultResponseModel:
+    difficulty: Difficulty
+    attempt_count: int
+    average_score: float
+    average_correct_ratio: float
+
+
+openapi_quiz_results_get = openapi.definition(
+    parameter=[
+        {"name": "limit", "schema": int, "required": False, "location": "query"},
+        {"name": "cursor", "schema": str, "required": False, "location": "query"},
+    ],
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": QuizResultPageResponseModel,
+            },
+            description="Success response",
+        )
+    ],
+    summary="Get a page of quizzes with results of their finished attempts",
+    tag="Quiz results",
+)
+
+
+openapi_subject_results_get = openapi.definition(
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": List[SubjectResultResponseModel],
+            },
+            description="Success response",
+        )
+    ],
+    summary="Get results of finished attempts per subject",
+    tag="Quiz results",
+)
+
+
+openapi_difficulty_results_get = openapi.definition(
+    response=[
+        Response(
+            status="200",
+            content={
+                "application/json": List[DifficultyResultResponseModel],
+            },
+            description="Success response",
+        )
+    ],
+    summary="Get results of finished attempts per difficulty",
+    tag="Quiz results",
+)
+
+
+@quiz_results.get("/quiz")
+@openapi_quiz_results_get
+@validate(query=PageQueryModel)
+async def get_quiz_results(_: Request, query: PageQueryModel, results_service: QuizResultsService):
+    page = await results_service.get_quiz_page(query.limit, query.cursor)
+    return json(QuizResultPageResponseModel(items=page.items, next_cursor=encode_cursor(page.next_key)))
+
+
+@quiz_results.get("/subject")
+@openapi_subject_results_get
+async def get_subject_results(_: Request, results_service: QuizResultsService):
+    return json(await results_service.get_by_subject())
+
+
+@quiz_results.get("/difficulty")
+@openapi_difficulty_results_get
+async def get_difficulty_results(_: Request, results_service: QuizResultsService):
+    return json(await results_service.get_by_difficulty())
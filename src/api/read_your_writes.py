@@ -0,0 +1,38 @@
+"""
+Read-your-writes поверх реплики: после записи клиент получает cookie,
+и до её истечения его read-only запросы тоже идут в primary.
+"""
+from math import ceil
+from time import time
+
+from sanic import HTTPResponse, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.sqlalchemy.routing import PIN_PRIMARY, WROTE
+from src.config import READ_YOUR_WRITES_SECONDS
+
+
+PRIMARY_PIN_COOKIE = "primary_pin_until"
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE)) > time()
+    except (TypeError, ValueError):
+        return False
+
+
+def pin_session(request: Request, session: AsyncSession) -> None:
+    session.info[PIN_PRIMARY] = is_pinned_to_primary(request)
+
+
+async def pin_writer_to_primary(request: Request, response: HTTPResponse) -> None:
+    session = getattr(request.ctx, "session", None)
+    if READ_YOUR_WRITES_SECONDS <= 0 or session is None or not session.info.get(WROTE):
+        return
+    response.add_cookie(
+        PRIMARY_PIN_COOKIE,
+        str(time() + READ_YOUR_WRITES_SECONDS),
+        max_age=ceil(READ_YOUR_WRITES_SECONDS),
+        httponly=True,
+    )
@@ -0,0 +1,68 @@
+"""
+Сессия БД на запрос. Объект создаётся при первой инъекции, а соединение из пула
+AsyncSession берёт только на первом запросе к базе. Закрывает сессию всегда
+response-middleware: оно работает и для ответов из обработчика ошибок, так что
+сессия не останется висеть, даже если обработчик упал до UnitOfWork или внутри неё.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from sanic import HTTPResponse, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.sqlalchemy.routing import USED
+from src.api.read_your_writes import pin_session
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestSessionStats:
+    opened: int
+    # Создана для запроса, но ни разу не брала соединение.
+    unused: int
+    # К ответу всё ещё держала транзакцию: её не закрыла UnitOfWork, закрыли здесь.
+    leaked: int
+
+
+class RequestSessions:
+    def __init__(self, session_maker: Callable[[], AsyncSession]):
+        self.session_maker = session_maker
+        self.opened = 0
+        self.unused = 0
+        self.leaked = 0
+
+    def supply(self, request: Request) -> AsyncSession:
+        """One session per request, however many dependencies ask for it."""
+        ctx = request.ctx
+        session = getattr(ctx, "session", None)
+        if session is None:
+            session = ctx.session = self.session_maker()
+            pin_session(request, session)
+            self.opened += 1
+        return session
+
+    async def close(self, request: Request) -> None:
+        session = getattr(request.ctx, "session", None)
+        if session is None:
+            return
+        if not session.info.get(USED):
+            self.unused += 1
+        if session.in_transaction():
+            self.leaked += 1
+            logger.warning(
+                "Database session of %s %s was left in a transaction", request.method, request.path
+            )
+        try:
+            await session.close()
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Failed to close the database session of %s %s", request.method, request.path)
+
+    def stats(self) -> RequestSessionStats:
+        return RequestSessionStats(opened=self.opened, unused=self.unused, leaked=self.leaked)
+
+
+async def close_request_session(request: Request, _: HTTPResponse) -> None:
+    await request.app.ctx.request_sessions.close(request)
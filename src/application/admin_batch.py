@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID
+
+from src.application.domain.exceptions import BaseCoreException
+from src.application.ports.bulk import BulkItemResult
+from src.application.ports.uow import IsolationLevel, UnitOfWork
+from src.application.quiz_admin import BaseAdminService, QuizAdminService, SubjectAdminService
+
+
+class BatchAction(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class BatchEntity(str, Enum):
+    SUBJECT = "subject"
+    QUIZ = "quiz"
+
+
+@dataclass
+class BatchOperation:
+    action: BatchAction
+    entity: BatchEntity
+    # Нужен для update и delete.
+    object_id: Optional[UUID] = None
+    # SubjectDTO или QuizAdminDTO, для create и update.
+    dto: Any = None
+    # Для update: записать, только если версия объекта всё ещё эта.
+    expected_version: Optional[int] = None
+
+
+class AdminBatchService:
+    """
+    Пачка правок админки в одной транзакции: один коммит вместо коммита на каждую операцию.
+    Каждая операция идёт в своём savepoint, поэтому ошибка одной откатывает только её,
+    а остальные применяются. Результаты — в порядке операций, как у bulk-вставки.
+    """
+
+    uow: UnitOfWork
+
+    def __init__(self, uow: UnitOfWork, subject_service: SubjectAdminService, quiz_service: QuizAdminService):
+        self.uow = uow
+        self.services: dict[BatchEntity, BaseAdminService] = {
+            BatchEntity.SUBJECT: subject_service.base_service,
+            BatchEntity.QUIZ: quiz_service.base_service,
+        }
+
+    async def run(
+        self, operations: list[BatchOperation], isolation: IsolationLevel = IsolationLevel.READ_COMMITTED
+    ) -> list[BulkItemResult]:
+        results = []
+        async with self.uow.with_isolation(isolation) as uow:
+            for operation in operations:
+                try:
+                    async with uow.savepoint():
+                        object_id = await self._apply(uow, operation)
+                    results.append(BulkItemResult(id=object_id))
+                except BaseCoreException as e:
+                    results.append(BulkItemResult(error=e))
+            await uow.commit()
+        return results
+
+    async def _apply(self, uow: UnitOfWork, operation: BatchOperation):
+        service = self.services[operation.entity]
+        if operation.action is BatchAction.CREATE:
+            return await service.create_in(uow, operation.dto)
+        if operation.action is BatchAction.UPDATE:
+            return await service.update_in(
+                uow, operation.object_id, operation.dto, operation.expected_version
+            )
+        return await service.delete_in(uow, operation.object_id)
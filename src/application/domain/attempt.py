@@ -0,0 +1,116 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from src.application.domain.exceptions import ForbiddenResourceForUser, ItemDataConflict, UnprocessableItem
+from src.application.domain.quiz import ChoiceQuestion, Quiz
+
+
+@dataclass(slots=True)
+class AnswerKey:
+    """
+    Индекс для проверки ответов одной версии квиза. Строится один раз на версию,
+    дальше проверка — поиск по словарям и сравнение множеств, без сборки Quiz.
+    """
+
+    quiz_id: UUID
+    quiz_version: int
+    time: timedelta
+    questions: list[ChoiceQuestion]
+    question_by_answer: dict[UUID, UUID]
+    correct_answers: dict[UUID, frozenset[UUID]]
+
+    @classmethod
+    def from_quiz(cls, quiz: Quiz, quiz_version: int) -> "AnswerKey":
+        return cls.from_questions(quiz.id, quiz_version, quiz.time, quiz.questions)
+
+    @classmethod
+    def from_questions(
+        cls, quiz_id: UUID, quiz_version: int, time: timedelta, questions: list[ChoiceQuestion]
+    ) -> "AnswerKey":
+        question_by_answer = {}
+        correct_answers = {}
+        for question in questions:
+            for answer in question.answers:
+                question_by_answer[answer.id] = question.id
+            correct_answers[question.id] = frozenset(
+                answer.id for answer in question.answers if answer.is_correct
+            )
+        return cls(
+            quiz_id=quiz_id,
+            quiz_version=quiz_version,
+            time=time,
+            questions=questions,
+            question_by_answer=question_by_answer,
+            correct_answers=correct_answers,
+        )
+
+    def check_answers(self, question_id: UUID, answer_ids: frozenset[UUID]) -> None:
+        if question_id not in self.correct_answers:
+            raise UnprocessableItem(
+                detail=f"Question ({question_id}) is not in the quiz", cause_entity="Question"
+            )
+        for answer_id in answer_ids:
+            if self.question_by_answer.get(answer_id) != question_id:
+                raise UnprocessableItem(
+                    detail=f"Answer ({answer_id}) does not belong to question ({question_id})",
+                    cause_entity="Answer",
+                )
+
+    def score(self, answers: dict[UUID, frozenset[UUID]]) -> int:
+        """Question counts only if exactly its correct answers were chosen."""
+        correct_answers = self.correct_answers
+        return sum(
+            1 for question_id, chosen in answers.items() if correct_answers.get(question_id) == chosen
+        )
+
+
+@dataclass(slots=True)
+class Attempt:
+    id: UUID
+    quiz_id: UUID
+    quiz_version: int
+    user_id: int
+    started_at: datetime
+    deadline: datetime
+    question_count: int
+    finished_at: Optional[datetime] = None
+    score: Optional[int] = None
+    # question_id -> выбранные ответы; заполняется, только когда нужны все ответы (завершение).
+    answers: dict[UUID, frozenset[UUID]] = field(default_factory=dict)
+
+    @classmethod
+    def start(cls, attempt_id: UUID, user_id: int, key: AnswerKey, now: datetime) -> "Attempt":
+        return cls(
+            id=attempt_id,
+            quiz_id=key.quiz_id,
+            quiz_version=key.quiz_version,
+            user_id=user_id,
+            started_at=now,
+            deadline=now + key.time,
+            question_count=len(key.questions),
+        )
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_at is not None
+
+    def check_owner(self, user_id: int) -> None:
+        if self.user_id != user_id:
+            raise ForbiddenResourceForUser(
+                detail=f"Attempt ({self.id}) belongs to another user", cause_entity="Attempt"
+            )
+
+    def check_can_answer(self, now: datetime) -> None:
+        if self.is_finished:
+            raise ItemDataConflict(detail=f"Attempt ({self.id}) is already finished", cause_entity="Attempt")
+        if now > self.deadline:
+            raise ItemDataConflict(detail=f"Time of attempt ({self.id}) is over", cause_entity="Attempt")
+
+    def finish(self, key: AnswerKey, now: datetime) -> None:
+        if self.is_finished:
+            raise ItemDataConflict(detail=f"Attempt ({self.id}) is already finished", cause_entity="Attempt")
+        # Завершить можно и после дедлайна: ответы после него просто не принимались.
+        self.finished_at = now
+        self.score = key.score(self.answers)
@@ -21,6 +21,10 @@ class ItemDataConflict(BaseCoreException):
     default_message = "Conflict with data of this item"
 
 
+class StaleItemVersion(ItemDataConflict):
+    default_message = "Item was changed after the version the update is based on"
+
+
 class ReferencedItem(BaseCoreException):
     default_message = "Item is referenced by one or more items and cannot be operated"
 
@@ -29,5 +33,9 @@ class UnprocessableItem(BaseCoreException):
     default_message = "Item has wrong structure or type"
 
 
+class MalformedRequest(BaseCoreException):
+    default_message = "Request is malformed"
+
+
 class ForbiddenResourceForUser(BaseCoreException):
     default_message = "The user does not have the required policy (role or user_id) for resource"
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.domain.quiz import MAX_ANSWER_COUNT, Quiz
+
+
+Submission = Mapping[UUID, Iterable[UUID]]
+
+
+@dataclass(slots=True)
+class BatchGrades:
+    """Row i belongs to submission i, column j to question j of the quiz."""
+
+    # Вопросов, где выбраны ровно все правильные ответы — то же, что AnswerKey.score.
+    scores: np.ndarray
+    question_correct: np.ndarray
+    # (правильных выбрано - неправильных выбрано) / правильных всего, не меньше нуля.
+    question_credit: np.ndarray
+    partial_credit: np.ndarray
+
+
+class BatchGrader:
+    """
+    Grades many submissions for one quiz at once. Correct answers are a boolean matrix
+    questions x MAX_ANSWER_COUNT, submissions are stacked into submissions x questions x
+    MAX_ANSWER_COUNT, and all grades come out of a few whole-array operations.
+
+    Answer ids are unique within a quiz, so a chosen answer is placed by its own id;
+    that it belongs to the question it was given for is checked when it is saved
+    (AnswerKey.check_answers).
+    """
+
+    def __init__(self, question_ids: list[UUID], cell_by_answer: dict[int, int], correct: np.ndarray):
+        self.question_ids = question_ids
+        # UUID.int ответа -> ячейка question_row * MAX_ANSWER_COUNT + номер ответа.
+        # Ключ int, а не UUID: хэш UUID считается на питоне и был дороже самой оценки.
+        self.cell_by_answer = cell_by_answer
+        self.correct = correct
+        self.correct_counts = correct.sum(axis=1, dtype=np.uint8)
+
+    @classmethod
+    def from_quiz(cls, quiz: Quiz) -> "BatchGrader":
+        questions = quiz.questions
+        correct = np.zeros((len(questions), MAX_ANSWER_COUNT), dtype=bool)
+        cell_by_answer = {}
+        for row, question in enumerate(questions):
+            for column, answer in enumerate(question.answers):
+                cell_by_answer[answer.id.int] = row * MAX_ANSWER_COUNT + column
+                correct[row, column] = answer.is_correct
+        return cls([question.id for question in questions], cell_by_answer, correct)
+
+    def encode(self, submissions: Sequence[Submission]) -> np.ndarray:
+        """Stacks submissions (question_id -> chosen answer ids) into a boolean array."""
+        cell_by_answer = self.cell_by_answer
+        cells, counts = [], []
+        try:
+            for submission in submissions:
+                chosen = [
+                    cell_by_answer[answer_id.int]
+                    for answer_ids in submission.values()
+                    for answer_id in answer_ids
+                ]
+                cells.extend(chosen)
+                counts.append(len(chosen))
+        except KeyError as e:
+            raise UnprocessableItem(
+                detail=f"Answer ({UUID(int=e.args[0])}) is not in the quiz", cause_entity="Answer"
+            ) from e
+
+        cells_per_submission = len(self.question_ids) * MAX_ANSWER_COUNT
+        flat_cells = np.array(cells, dtype=np.int64)
+        flat_cells += np.repeat(np.arange(len(submissions), dtype=np.int64) * cells_per_submission, counts)
+        chosen = np.zeros(len(submissions) * cells_per_submission, dtype=bool)
+        chosen[flat_cells] = True
+        return chosen.reshape(len(submissions), len(self.question_ids), MAX_ANSWER_COUNT)
+
+    def grade(self, submissions: Sequence[Submission]) -> BatchGrades:
+        return self.grade_encoded(self.encode(submissions))
+
+    def grade_encoded(self, chosen: np.ndarray) -> BatchGrades:
+        # Свёртки по ответам через einsum над uint8: заметно быстрее sum() по bool.
+        chosen_bytes = chosen.view(np.uint8)
+        right = np.einsum("nqa,qa->nq", chosen_bytes, self.correct.view(np.uint8)).astype(np.int16)
+        wrong = np.einsum("nqa->nq", chosen_bytes).astype(np.int16) - right
+        question_correct = (wrong == 0) & (right == self.correct_counts)
+        question_credit = np.maximum(right - wrong, 0) / self.correct_counts
+        return BatchGrades(
+            scores=question_correct.sum(axis=1),
+            question_correct=question_correct,
+            question_credit=question_credit,
+            partial_credit=question_credit.sum(axis=1),
+        )
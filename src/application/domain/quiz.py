@@ -4,43 +4,57 @@ from enum import auto, StrEnum
 from uuid import UUID
 
 
+MAX_ANSWER_COUNT = 20
+
+
 class Difficulty(StrEnum):
     EASY = auto()
     MEDIUM = auto()
     HARD = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Subject:
     id: UUID
     name: str
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseQuestion:
     id: UUID
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseAnswer:
     id: UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class ChoiceAnswer(BaseAnswer):
     is_correct: bool
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ChoiceQuestion(BaseQuestion):
     _answers: list[ChoiceAnswer]
 
     def __post_init__(self):
         self._validate_answers(self._answers)
 
+    @classmethod
+    def reconstitute(
+        cls, id: UUID, text: str, answers: list[ChoiceAnswer]  # pylint: disable=W0622
+    ) -> "ChoiceQuestion":
+        """Rebuilds a question that was validated when written (e.g. loaded from storage), skipping checks."""
+        question = object.__new__(cls)
+        question.id = id
+        question.text = text
+        question._answers = answers
+        return question
+
     @property
     def answers(self):
         return self._answers
@@ -60,12 +74,12 @@ class ChoiceQuestion(BaseQuestion):
 
     def _check_answer_count(self, answers: list[ChoiceAnswer]):
         lower_bound = 1
-        upper_bound = 20
+        upper_bound = MAX_ANSWER_COUNT
         if not lower_bound <= len(answers) <= upper_bound:
             raise ValueError(f"Answer count must be between {lower_bound} and {upper_bound}")
 
 
-@dataclass
+@dataclass(slots=True)
 class Quiz:
     id: UUID
     name: str
@@ -81,6 +95,31 @@ class Quiz:
         self._validate_time(self._time)
         self._validate_questions_count(self._questions)
 
+    @classmethod
+    def reconstitute(
+        cls,
+        id: UUID,  # pylint: disable=W0622
+        name: str,
+        description: str,
+        time: timedelta,
+        difficulty: Difficulty,
+        subject: Subject,
+        questions: list[BaseQuestion],
+    ) -> "Quiz":
+        """
+        Rebuilds a quiz that was validated when written, skipping the checks.
+        Only for trusted sources such as storage; every write path must use the constructor.
+        """
+        quiz = object.__new__(cls)
+        quiz.id = id
+        quiz.name = name
+        quiz.description = description
+        quiz._time = time
+        quiz.difficulty = difficulty
+        quiz.subject = subject
+        quiz._questions = questions
+        return quiz
+
     @property
     def time(self):
         return self._time
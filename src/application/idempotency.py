@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from uuid import UUID, uuid5
+
+from src.application.clock import utc_now
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.ports.cache import IdempotencyCache
+from src.application.ports.idempotency import IdempotencyRepository, StoredResponse
+from src.application.ports.uow import UnitOfWork
+
+
+# Пространство имён для uuid5 из Idempotency-Key; менять нельзя, иначе повторы получат другие id.
+IDEMPOTENT_ID_NAMESPACE = UUID("5b0e7f7c-3f43-4c1e-9a5d-2f8c6b1d4e90")
+
+
+class IdempotencyService:
+    """
+    Idempotency-Key: первый успешный ответ на запрос с ключом хранится в таблице и в кэше
+    процесса, повтор получает его же без записи в основные таблицы. id создаваемого объекта
+    выводится из ключа (uuid5), поэтому даже повтор, пришедший раньше, чем ответ сохранился,
+    вставит ту же строку через ON CONFLICT DO NOTHING, а не дубликат. Если строка с этим id
+    хранит другие данные (ответ просрочен или параллельный запрос пришёл с другим телом),
+    создание отвечает 422, а не чужим id.
+    """
+
+    uow: UnitOfWork
+    repo: IdempotencyRepository
+    cache: IdempotencyCache
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        repo: IdempotencyRepository,
+        cache: IdempotencyCache,
+        ttl: timedelta = timedelta(days=1),
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.uow = uow
+        self.repo = repo
+        self.cache = cache
+        self.ttl = ttl
+        self.clock = clock
+
+    @staticmethod
+    def object_id(key: str) -> UUID:
+        return uuid5(IDEMPOTENT_ID_NAMESPACE, key)
+
+    async def get_response(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        response = self.cache.get(key)
+        if response is None:
+            version = self.cache.version()
+            # Из primary: ответ мог сохраниться только что и ещё не дойти до реплики.
+            async with self.uow:
+                response = await self.repo.get(key)
+            if response is None:
+                return None
+            self.cache.put(key, response, version)
+        if response.created_at <= self.clock() - self.ttl:
+            return None
+        if response.fingerprint != fingerprint:
+            raise UnprocessableItem(
+                detail=f"Idempotency-Key ({key}) was already used with another request",
+                cause_entity="IdempotencyKey",
+            )
+        return response
+
+    async def save_response(self, key: str, fingerprint: str, status: int, body: bytes) -> None:
+        response = StoredResponse(fingerprint=fingerprint, status=status, body=body, created_at=self.clock())
+        async with self.uow as uow:
+            await self.repo.save(key, response, expired_before=response.created_at - self.ttl)
+            await uow.commit()
+        self.cache.put(key, response, self.cache.version())
@@ -0,0 +1,15 @@
+from typing import Optional, Protocol
+from uuid import UUID
+
+from src.application.domain.attempt import AnswerKey
+
+
+class AnswerKeyRepository(Protocol):
+    """
+    Questions of every quiz version an attempt was started on. Updating a quiz replaces its questions
+    (ids included), so attempts in progress are checked and scored against this snapshot.
+    """
+
+    async def add_if_absent(self, key: AnswerKey) -> None: ...
+
+    async def get(self, quiz_id: UUID, quiz_version: int) -> Optional[AnswerKey]: ...
@@ -0,0 +1,15 @@
+from typing import Protocol
+from uuid import UUID
+from src.application.domain.attempt import Attempt
+
+
+class AttemptRepository(Protocol):
+    async def add_one(self, attempt: Attempt) -> UUID: ...
+
+    async def get_by_id(self, attempt_id: UUID) -> Attempt:
+        """Attempt without its answers, they are in AttemptStateStore."""
+
+    async def finish(self, attempt: Attempt) -> UUID:
+        """Stores finished_at and score. Raises ItemDataConflict if the attempt was finished concurrently."""
+
+    async def get_finished(self, quiz_id: UUID, user_id: int) -> list[Attempt]: ...
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Protocol
+from uuid import UUID
+
+
+class Durability(str, Enum):
+    # Ответ пишется в хранилище до того, как запрос вернётся.
+    SYNC = "sync"
+    # Ответ копится в памяти процесса и пишется пачкой; при падении процесса последние ответы теряются.
+    BUFFERED = "buffered"
+
+
+@dataclass(slots=True, frozen=True)
+class AnswerEvent:
+    attempt_id: UUID
+    question_id: UUID
+    answer_ids: frozenset[UUID]
+    answered_at: datetime
+
+
+class AttemptStateStore(Protocol):
+    """
+    Answers of attempts, apart from the attempt rows themselves, so the storage
+    (Postgres now, something like Redis later) can change without touching the service.
+    """
+
+    async def save_answers(self, events: list[AnswerEvent]) -> None:
+        """For the same attempt and question the latest answered_at wins."""
+
+    async def get_answers(self, attempt_id: UUID) -> dict[UUID, frozenset[UUID]]:
+        """Includes answers that are saved but not flushed yet."""
+
+    async def flush(self) -> int:
+        """Writes out buffered answers and returns how many were written."""
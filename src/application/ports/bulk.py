@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from src.application.domain.exceptions import BaseCoreException
+
+
+@dataclass
+class BulkItemResult:
+    """Result of one item of a bulk write, in the same position as the item in the input."""
+
+    id: Optional[UUID] = None
+    error: Optional[BaseCoreException] = None
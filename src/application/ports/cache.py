@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Protocol
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+    max_size: int
+
+
+class Cache(Protocol):
+    """
+    Версионированный кэш: version() берётся до чтения из базы, и put() с этой версией
+    ничего не сделает, если ключ успели инвалидировать, пока шло чтение.
+    Так читатель, начавший до коммита, не вернёт в кэш устаревшее значение.
+    """
+
+    def version(self) -> int: ...
+
+    def get(self, key: Hashable) -> Optional[Any]: ...
+
+    def put(self, key: Hashable, value: Any, version: int) -> None: ...
+
+    def invalidate(self, key: Hashable) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class QuizCache(Cache, Protocol):
+    """
+    Quizzes by (id, quiz version, subject version), as read for the ETag of GET quiz. A write changes
+    the versions and so the key: no invalidation, old entries leave by LRU and TTL.
+    """
+
+
+class AnswerKeyCache(Cache, Protocol):
+    """Answer keys by (quiz_id, quiz_version). A version never changes, so keys are never invalidated."""
+
+
+class IdempotencyCache(Cache, Protocol):
+    """Stored responses by Idempotency-Key. A key keeps its first response: no invalidation."""
+
+
+class CompressedBodyCache(Cache, Protocol):
+    """Compressed response bodies by (path, query, ETag, encoding). An ETag pins the body: no invalidation."""
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Protocol
+
+
+@dataclass(slots=True, frozen=True)
+class StoredResponse:
+    # Хэш метода, пути и тела запроса: тот же ключ с другим запросом — ошибка клиента.
+    fingerprint: str
+    status: int
+    body: bytes
+    created_at: datetime
+
+
+class IdempotencyRepository(Protocol):
+    async def get(self, key: str) -> Optional[StoredResponse]: ...
+
+    async def save(self, key: str, response: StoredResponse, expired_before: datetime) -> None:
+        """
+        The first response saved for a key stays, unless it was created before expired_before.
+        Also deletes a few expired keys, so the table doesn't need a separate cleanup job.
+        """
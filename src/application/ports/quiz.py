@@ -1,17 +1,87 @@
-from typing import Protocol
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional, Protocol
 from uuid import UUID
-from src.application.domain.quiz import Quiz
+from src.application.domain.quiz import ChoiceQuestion, Difficulty, Quiz
+from src.application.ports.bulk import BulkItemResult
+
+
+@dataclass
+class QuizSummary:
+    """Read model for catalog pages, built without the questions payload."""
+
+    id: UUID
+    name: str
+    time: timedelta
+    difficulty: Difficulty
+    subject_name: str
+    question_count: int
+
+
+@dataclass
+class QuizSummaryFilter:
+    """Empty fields don't filter. Time bounds are inclusive and refer to the quiz duration."""
+
+    subject_id: Optional[UUID] = None
+    difficulty: Optional[Difficulty] = None
+    min_time: Optional[timedelta] = None
+    max_time: Optional[timedelta] = None
+
+
+@dataclass
+class QuizSearchHit:
+    id: UUID
+    name: str
+    subject_name: str
+    difficulty: Difficulty
+    rank: float
 
 
 class QuizRepository(Protocol):
     async def add_one(self, quiz: Quiz) -> UUID: ...
 
+    async def add_many(self, quizzes: list[Quiz]) -> list[BulkItemResult]: ...
+
     async def get_all(self) -> list[Quiz]: ...
 
-    async def update_one(self, quiz_id, new_quiz: Quiz) -> UUID: ...
+    async def get_by_id(self, quiz_id: UUID) -> Quiz: ...
 
-    async def delete_one(self, quiz_id) -> UUID: ...
+    async def get_by_id_with_version(self, quiz_id: UUID) -> tuple[Quiz, int]:
+        """Quiz and its version, read together. The version grows on every update."""
+
+    async def get_by_id_with_document_version(self, quiz_id: UUID) -> tuple[Quiz, tuple[int, int]]:
+        """Quiz and the versions of the quiz and its subject, read together."""
 
-#     async def get_by_id(self, quiz_id): ...
+    async def get_version(self, quiz_id: UUID) -> int: ...
+
+    async def get_document_version(self, quiz_id: UUID) -> tuple[int, int]:
+        """Versions of the quiz and of its subject: the quiz document embeds the subject."""
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        """Changes on every write to any quiz, including subject renames and question row changes."""
+
+    async def get_document_by_id(self, quiz_id: UUID) -> bytes:
+        """The quiz as ready-to-send JSON bytes, in the same shape as the admin quiz DTO."""
+
+    async def get_summary_page(
+        self, limit: int, after_id: Optional[UUID] = None, filters: Optional[QuizSummaryFilter] = None
+    ) -> list[QuizSummary]: ...
+
+    async def search(
+        self, search_text: str, limit: int, after: Optional[tuple[float, UUID]] = None
+    ) -> list[QuizSearchHit]:
+        """Full-text search over name, description, subject and questions; best match first, then by id."""
+
+    async def get_question(self, quiz_id: UUID, question_id: UUID) -> ChoiceQuestion: ...
+
+    async def update_one(self, quiz_id, new_quiz: Quiz, expected_version: Optional[int] = None) -> UUID:
+        """With expected_version, raises StaleItemVersion if the quiz version is no longer that."""
+
+    async def update_question(
+        self, quiz_id: UUID, question: ChoiceQuestion, expected_version: Optional[int] = None
+    ) -> UUID:
+        """Replaces one question of the quiz and bumps the quiz version; expected_version as in update_one."""
+
+    async def delete_one(self, quiz_id) -> UUID: ...
 
 #     async def get_by_user_id(self, user_id: int): ...
@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from uuid import UUID
+from src.application.domain.attempt import Attempt
+from src.application.domain.quiz import Difficulty
+
+
+@dataclass
+class QuizResultSummary:
+    id: UUID
+    name: str
+    subject_name: str
+    difficulty: Difficulty
+    attempt_count: int
+    average_score: float
+    # Доля правильно отвеченных вопросов по всем попыткам, 0..1.
+    average_correct_ratio: float
+
+
+@dataclass
+class SubjectResultSummary:
+    id: UUID
+    name: str
+    attempt_count: int
+    average_score: float
+    average_correct_ratio: float
+
+
+@dataclass
+class DifficultyResultSummary:
+    difficulty: Difficulty
+    attempt_count: int
+    average_score: float
+    average_correct_ratio: float
+
+
+class QuizResultRepository(Protocol):
+    """
+    Results of finished attempts, kept as running totals per quiz, subject and difficulty,
+    so reads cost the number of groups, not the number of attempts.
+    """
+
+    async def add_finished_attempt(self, attempt: Attempt) -> None: ...
+
+    async def get_quiz_page(self, limit: int, after_id: Optional[UUID] = None) -> list[QuizResultSummary]: ...
+
+    async def get_by_subject(self) -> list[SubjectResultSummary]: ...
+
+    async def get_by_difficulty(self) -> list[DifficultyResultSummary]: ...
@@ -1,13 +1,31 @@
-from typing import Protocol
+from typing import Optional, Protocol
 from uuid import UUID
 from src.application.domain.quiz import Subject
+from src.application.ports.bulk import BulkItemResult
 
 
 class SubjectRepository(Protocol):
     async def add_one(self, subject: Subject) -> UUID: ...
 
+    async def add_one_if_absent(self, subject: Subject) -> UUID:
+        """Does nothing if a subject with this id exists; returns the id either way."""
+
+    async def add_many(self, subjects: list[Subject]) -> list[BulkItemResult]: ...
+
     async def get_all(self) -> list[Subject]: ...
 
-    async def update_one(self, subject_id, new_subject: Subject) -> UUID: ...
+    async def get_by_ids(self, subject_ids: list[UUID]) -> list[Subject]: ...
+
+    async def get_page(self, limit: int, after_id: Optional[UUID] = None) -> list[Subject]: ...
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        """Changes on every write to any subject; the same value means the same list."""
+
+    async def get_by_id_with_version(self, subject_id: UUID) -> tuple[Subject, int]: ...
+
+    async def update_one(
+        self, subject_id, new_subject: Subject, expected_version: Optional[int] = None
+    ) -> UUID:
+        """With expected_version, raises StaleItemVersion if the subject version is no longer that."""
 
     async def delete_one(self, subject_id) -> UUID: ...
@@ -1,5 +1,12 @@
-from contextlib import AbstractAsyncContextManager
-from typing import Protocol
+from contextlib import AbstractAsyncContextManager, nullcontext
+from enum import Enum
+from typing import Any, Callable, Protocol
+
+
+class IsolationLevel(str, Enum):
+    READ_COMMITTED = "READ COMMITTED"
+    REPEATABLE_READ = "REPEATABLE READ"
+    SERIALIZABLE = "SERIALIZABLE"
 
 
 class UnitOfWork(AbstractAsyncContextManager, Protocol):
@@ -10,7 +17,7 @@ class UnitOfWork(AbstractAsyncContextManager, Protocol):
     В идеале хочет видеть register-new, -delete, -dirty методы.
     Но такая реализация всё равно даёт плюсы: слабую связанность и тестируемость.
     Из минусов: нарушенный ISP и следовательно менее гибкое использование в будущем.
-    Например, тяжело сделать вложенные транзакции, изоляцию с этим интерфейсом.
+    Вложенные транзакции и изоляция — через savepoint() и with_isolation().
     """
     async def __aenter__(self):
         return self
@@ -23,3 +30,30 @@ class UnitOfWork(AbstractAsyncContextManager, Protocol):
     async def commit(self): ...
 
     async def rollback(self): ...
+
+    def on_commit(self, callback: Callable[[], Any]) -> None:
+        """Callback runs only after a successful commit; on rollback it is dropped."""
+
+    def read_only(self) -> "UnitOfWork":
+        """
+        Marks the next `async with` block as read-only, so it may be served by a replica.
+        Data may lag slightly behind the last commits. Usage: `async with uow.read_only(): ...`.
+        Without a replica it changes nothing.
+        """
+        return self
+
+    def with_isolation(self, level: IsolationLevel) -> "UnitOfWork":
+        """
+        Isolation level of the transaction of the next `async with` block, like read_only.
+        Usage: `async with uow.with_isolation(IsolationLevel.SERIALIZABLE): ...`.
+        """
+        return self
+
+    def savepoint(self) -> AbstractAsyncContextManager:
+        """
+        Nested transaction inside the current block. If the nested block raises, only its changes
+        (and its on_commit callbacks) are rolled back, the exception propagates and the outer
+        transaction stays usable. A database error in the data of the block comes out as
+        a BaseCoreException. Usage: `async with uow.savepoint(): ...`.
+        """
+        return nullcontext(self)
@@ -1,10 +1,13 @@
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Any, Optional, Protocol
 from datetime import timedelta
 from uuid import UUID, uuid4
-from src.application.ports.quiz import QuizRepository
+from src.application.ports.bulk import BulkItemResult
+from src.application.ports.cache import QuizCache
+from src.application.ports.quiz import QuizRepository, QuizSearchHit, QuizSummary, QuizSummaryFilter
 from src.application.ports.subject import SubjectRepository
 from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+from src.application.domain.exceptions import UnprocessableItem
 from src.application.ports.uow import UnitOfWork
 
 
@@ -15,6 +18,13 @@ class SubjectDTO:
     id: Optional[UUID] = None
 
 
+@dataclass
+class PageDTO:
+    items: list
+    # id последнего элемента; для выдачи по релевантности — (rank, id).
+    next_key: Optional[Any] = None
+
+
 @dataclass
 class QuizAdminDTO:
     name: str
@@ -40,6 +50,12 @@ class ChoiceAnswerAdminDTO:
     id: Optional[UUID] = None
 
 
+def make_page(objects: list, limit: int, map_item=lambda obj: obj, key=lambda obj: obj.id) -> PageDTO:
+    """Expects up to limit + 1 objects: the extra one only tells whether there is a next page."""
+    next_key = key(objects[limit - 1]) if len(objects) > limit else None
+    return PageDTO(items=[map_item(obj) for obj in objects[:limit]], next_key=next_key)
+
+
 class DomainMapper(Protocol):
     def map_dto_to_domain_object(self, dto):
         pass
@@ -58,27 +74,38 @@ class SubjectDomainMapper:
 
 
 class QuizDomainMapper:
-    def map_dto_to_domain_object(self, dto: QuizAdminDTO):
-        questions = []
-        for question in dto.questions:
-            q_id = question.id if question.id else uuid4()
-            if isinstance(question, ChoiceQuestionAdminDTO):
-                answers = []
-                for answer in question.answers:
-                    a_id = answer.id if answer.id else uuid4()
-                    if isinstance(answer, ChoiceAnswerAdminDTO):
-                        answers.append(ChoiceAnswer(id=a_id, is_correct=answer.is_correct, text=answer.text))
-                    else:
-                        raise ValueError("Invalid answer type")
-                questions.append(
-                    ChoiceQuestion(
-                        id=q_id,
-                        text=question.text,
-                        _answers=answers,
-                    )
+    def map_question_dto_to_domain(self, question) -> ChoiceQuestion:
+        if not isinstance(question, ChoiceQuestionAdminDTO):
+            raise ValueError("Invalid question type")
+        answers = []
+        for answer in question.answers:
+            a_id = answer.id if answer.id else uuid4()
+            if isinstance(answer, ChoiceAnswerAdminDTO):
+                answers.append(ChoiceAnswer(id=a_id, is_correct=answer.is_correct, text=answer.text))
+            else:
+                raise ValueError("Invalid answer type")
+        q_id = question.id if question.id else uuid4()
+        return ChoiceQuestion(
+            id=q_id,
+            text=question.text,
+            _answers=answers,
+        )
+
+    def map_question_to_dto(self, question) -> ChoiceQuestionAdminDTO:
+        if not isinstance(question, ChoiceQuestion):
+            raise ValueError("Invalid question type")
+        answers = []
+        for answer in question.answers:
+            if isinstance(answer, ChoiceAnswer):
+                answers.append(
+                    ChoiceAnswerAdminDTO(id=answer.id, is_correct=answer.is_correct, text=answer.text)
                 )
             else:
-                raise ValueError("Invalid question type")
+                raise ValueError("Invalid answer type")
+        return ChoiceQuestionAdminDTO(id=question.id, text=question.text, answers=answers)
+
+    def map_dto_to_domain_object(self, dto: QuizAdminDTO):
+        questions = [self.map_question_dto_to_domain(question) for question in dto.questions]
 
         object_id = dto.id if dto.id else uuid4()
         return Quiz(
@@ -92,26 +119,7 @@ class QuizDomainMapper:
         )
 
     def map_domain_object_to_dto(self, domain_object: Quiz):
-        questions = []
-        for question in domain_object.questions:
-            if isinstance(question, ChoiceQuestion):
-                for answer in question.answers:
-                    if isinstance(answer, ChoiceAnswer):
-                        questions.append(
-                            ChoiceQuestionAdminDTO(
-                                id=question.id,
-                                text=question.text,
-                                answers=[
-                                    ChoiceAnswerAdminDTO(
-                                        id=answer.id, is_correct=answer.is_correct, text=answer.text
-                                    )
-                                ],
-                            )
-                        )
-                    else:
-                        raise ValueError("Invalid answer type")
-            else:
-                raise ValueError("Invalid question type")
+        questions = [self.map_question_to_dto(question) for question in domain_object.questions]
 
         return QuizAdminDTO(
             id=domain_object.id,
@@ -133,32 +141,68 @@ class BaseAdminService:
         self.repo = repo
         self.domain_mapper = domain_mapper
 
-    async def create_one(self, dto):
+    def _to_domain(self, dto):
+        """Domain rules (answer count, quiz time...) raise ValueError: a fault of this item, not a 500."""
+        try:
+            return self.domain_mapper.map_dto_to_domain_object(dto)
+        except ValueError as e:
+            raise UnprocessableItem(detail=str(e), cause_entity=type(dto).__name__) from e
+
+    async def create_one(self, dto, if_absent: bool = False):
         async with self.uow as uow:
-            new_object = self.domain_mapper.map_dto_to_domain_object(dto)
-            created = await self.repo.add_one(new_object)
+            created = await self.create_in(uow, dto, if_absent)
             await uow.commit()
             return created
 
+    async def create_many(self, dtos: list) -> list[BulkItemResult]:
+        async with self.uow as uow:
+            new_objects = [self._to_domain(dto) for dto in dtos]
+            results = await self.repo.add_many(new_objects)
+            await uow.commit()
+            return results
+
     async def get_all(self):
-        async with self.uow:
+        async with self.uow.read_only():
             objects = await self.repo.get_all()
             return [self.domain_mapper.map_domain_object_to_dto(obj) for obj in objects]
 
-    async def update_one(self, object_id, dto):
+    async def get_page(self, limit: int, after_key=None) -> PageDTO:
+        async with self.uow.read_only():
+            objects = await self.repo.get_page(limit + 1, after_key)
+        return make_page(objects, limit, self.domain_mapper.map_domain_object_to_dto)
+
+    async def update_one(self, object_id, dto, expected_version: Optional[int] = None):
         async with self.uow as uow:
-            dto.id = object_id
-            updated_object = self.domain_mapper.map_dto_to_domain_object(dto)
-            updated = await self.repo.update_one(object_id, updated_object)
+            updated = await self.update_in(uow, object_id, dto, expected_version)
             await uow.commit()
             return updated
 
     async def delete_one(self, object_id: UUID) -> UUID:
         async with self.uow as uow:
-            deleted = await self.repo.delete_one(object_id)
+            deleted = await self.delete_in(uow, object_id)
             await uow.commit()
             return deleted
 
+    # *_in пишут в уже открытую транзакцию uow и не коммитят: так несколько операций делят один коммит.
+
+    async def create_in(self, uow: UnitOfWork, dto, if_absent: bool = False):  # pylint: disable=W0613
+        """if_absent: an object with the same id already there is not an error (a retried create)."""
+        new_object = self._to_domain(dto)
+        if if_absent:
+            return await self.repo.add_one_if_absent(new_object)
+        return await self.repo.add_one(new_object)
+
+    async def update_in(  # pylint: disable=W0613
+        self, uow: UnitOfWork, object_id, dto, expected_version: Optional[int] = None
+    ):
+        """expected_version makes it a compare-and-swap, see AdminRepositorySqlAlchemy.update_one."""
+        dto.id = object_id
+        updated_object = self._to_domain(dto)
+        return await self.repo.update_one(object_id, updated_object, expected_version)
+
+    async def delete_in(self, uow: UnitOfWork, object_id: UUID) -> UUID:  # pylint: disable=W0613
+        return await self.repo.delete_one(object_id)
+
 
 class SubjectAdminService:
     uow: UnitOfWork
@@ -169,14 +213,31 @@ class SubjectAdminService:
         self.repo = repo
         self.base_service = BaseAdminService(uow, repo, SubjectDomainMapper())
 
-    async def create_one(self, subject_dto: SubjectDTO) -> UUID:
-        return await self.base_service.create_one(subject_dto)
+    async def create_one(self, subject_dto: SubjectDTO, if_absent: bool = False) -> UUID:
+        return await self.base_service.create_one(subject_dto, if_absent)
+
+    async def create_many(self, subject_dtos: list[SubjectDTO]) -> list[BulkItemResult]:
+        return await self.base_service.create_many(subject_dtos)
 
     async def get_all(self) -> list[SubjectDTO]:
         return await self.base_service.get_all()
 
-    async def update_one(self, subject_id, subject_dto: SubjectDTO) -> UUID:
-        return await self.base_service.update_one(subject_id, subject_dto)
+    async def get_page(self, limit: int, after_id: Optional[UUID] = None) -> PageDTO:
+        return await self.base_service.get_page(limit, after_id)
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        async with self.uow.read_only():
+            return await self.repo.get_collection_version()
+
+    async def get_by_id_with_version(self, subject_id: UUID) -> tuple[SubjectDTO, int]:
+        async with self.uow:
+            subject, version = await self.repo.get_by_id_with_version(subject_id)
+        return self.base_service.domain_mapper.map_domain_object_to_dto(subject), version
+
+    async def update_one(
+        self, subject_id, subject_dto: SubjectDTO, expected_version: Optional[int] = None
+    ) -> UUID:
+        return await self.base_service.update_one(subject_id, subject_dto, expected_version)
 
     async def delete_one(self, subject_id: UUID) -> UUID:
         return await self.base_service.delete_one(subject_id)
@@ -185,11 +246,14 @@ class SubjectAdminService:
 class QuizAdminService:
     uow: UnitOfWork
     repo: QuizRepository
+    cache: QuizCache
 
-    def __init__(self, uow: UnitOfWork, repo: QuizRepository):
+    def __init__(self, uow: UnitOfWork, repo: QuizRepository, cache: QuizCache):
         self.uow = uow
         self.repo = repo
-        self.base_service = BaseAdminService(uow, repo, QuizDomainMapper())
+        self.cache = cache
+        self.domain_mapper = QuizDomainMapper()
+        self.base_service = BaseAdminService(uow, repo, self.domain_mapper)
 
     async def create_one(self, quiz_dto: QuizAdminDTO) -> UUID:
         return await self.base_service.create_one(quiz_dto)
@@ -197,8 +261,80 @@ class QuizAdminService:
     async def get_all(self) -> list[QuizAdminDTO]:
         return await self.base_service.get_all()
 
-    async def update_one(self, quiz_id, quiz_dto: QuizAdminDTO) -> UUID:
-        return await self.base_service.update_one(quiz_id, quiz_dto)
+    async def get_by_id_at_version(
+        self, quiz_id: UUID, versions: tuple[int, int]
+    ) -> tuple[QuizAdminDTO, tuple[int, int]]:
+        """
+        For conditional GET: `versions` are what the caller just read for its ETag. The cache is keyed
+        by versions, so a write anywhere (any worker, a subject rename) just makes a new key, and
+        nothing has to be invalidated. A miss reads the quiz with the versions it has now.
+        """
+        quiz = self.cache.get((quiz_id, *versions))
+        if quiz is None:
+            cache_version = self.cache.version()
+            # Кэш наполняем только из primary: отстающая реплика положила бы в него старые данные.
+            async with self.uow:
+                quiz, versions = await self.repo.get_by_id_with_document_version(quiz_id)
+            self.cache.put((quiz_id, *versions), quiz, cache_version)
+        return self.domain_mapper.map_domain_object_to_dto(quiz), versions
+
+    async def get_document_by_id(self, quiz_id: UUID) -> bytes:
+        """Encoded JSON straight from storage, for handlers that only pass the quiz through."""
+        async with self.uow.read_only():
+            return await self.repo.get_document_by_id(quiz_id)
+
+    async def get_document_version(self, quiz_id: UUID) -> tuple[int, int]:
+        async with self.uow.read_only():
+            return await self.repo.get_document_version(quiz_id)
+
+    async def get_collection_version(self) -> tuple[int, int]:
+        async with self.uow.read_only():
+            return await self.repo.get_collection_version()
+
+    async def get_summary_page(
+        self, limit: int, after_id: Optional[UUID] = None, filters: Optional[QuizSummaryFilter] = None
+    ) -> PageDTO:
+        async with self.uow.read_only():
+            summaries: list[QuizSummary] = await self.repo.get_summary_page(limit + 1, after_id, filters)
+        return make_page(summaries, limit)
+
+    async def search(
+        self, search_text: str, limit: int, after: Optional[tuple[float, UUID]] = None
+    ) -> PageDTO:
+        async with self.uow.read_only():
+            hits: list[QuizSearchHit] = await self.repo.search(search_text, limit + 1, after)
+        return make_page(hits, limit, key=lambda hit: (hit.rank, hit.id))
+
+    async def update_one(
+        self, quiz_id, quiz_dto: QuizAdminDTO, expected_version: Optional[int] = None
+    ) -> UUID:
+        return await self.base_service.update_one(quiz_id, quiz_dto, expected_version)
+
+    async def get_question(self, quiz_id: UUID, question_id: UUID) -> ChoiceQuestionAdminDTO:
+        async with self.uow.read_only():
+            question = await self.repo.get_question(quiz_id, question_id)
+        return self.domain_mapper.map_question_to_dto(question)
+
+    async def update_question(
+        self,
+        quiz_id: UUID,
+        question_id: UUID,
+        question_dto: ChoiceQuestionAdminDTO,
+        expected_version: Optional[int] = None,
+    ) -> UUID:
+        """
+        One question of the quiz, the rest stays as is. expected_version is the quiz version,
+        as in update_one: the edit is a compare-and-swap on it and bumps it.
+        """
+        question_dto.id = question_id
+        try:
+            question = self.domain_mapper.map_question_dto_to_domain(question_dto)
+        except ValueError as e:
+            raise UnprocessableItem(detail=str(e), cause_entity="ChoiceQuestion") from e
+        async with self.uow as uow:
+            updated = await self.repo.update_question(quiz_id, question, expected_version)
+            await uow.commit()
+            return updated
 
     async def delete_one(self, quiz_id: UUID) -> UUID:
         return await self.base_service.delete_one(quiz_id)
@@ -0,0 +1,226 @@
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Optional
+from uuid import UUID
+
+from orjson import loads  # pylint: disable=E0611
+
+from src.application.domain.quiz import Difficulty, Subject
+from src.application.ports.quiz import QuizRepository
+from src.application.ports.subject import SubjectRepository
+from src.application.ports.uow import UnitOfWork
+from src.application.quiz_admin import (
+    ChoiceAnswerAdminDTO,
+    ChoiceQuestionAdminDTO,
+    QuizAdminDTO,
+    QuizDomainMapper,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RejectedLine:
+    line_number: int
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    lines_read: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    # Обрезается до max_reported_rejects, чтобы отчёт не рос вместе с файлом.
+    rejected_lines: list[RejectedLine] = field(default_factory=list)
+
+    def reject(self, line_number: int, reason: str, max_reported_rejects: int) -> None:
+        self.rejected += 1
+        if len(self.rejected_lines) < max_reported_rejects:
+            self.rejected_lines.append(RejectedLine(line_number=line_number, reason=reason))
+
+
+@dataclass
+class ParsedQuizLine:
+    line_number: int
+    subject_id: UUID
+    dto: QuizAdminDTO
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """Splits a byte stream into lines. An oversized line is never buffered whole and is yielded as None."""
+    buffer = bytearray()
+    skipping = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if skipping:
+                skipping = False
+                yield None
+            else:
+                buffer += chunk[start:end]
+                yield bytes(buffer) if len(buffer) <= max_line_bytes else None
+                buffer.clear()
+            start = end + 1
+        if not skipping:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                skipping = True
+                buffer.clear()
+    if skipping:
+        yield None
+    elif buffer:
+        yield bytes(buffer)
+
+
+def _field(record: dict, name: str, field_type: type):
+    if name not in record:
+        raise ValueError(f"Missing field ({name})")
+    value = record[name]
+    if not isinstance(value, field_type) or (field_type is not bool and isinstance(value, bool)):
+        raise ValueError(f"Field ({name}) has wrong type")
+    return value
+
+
+def parse_quiz_line(line_number: int, line: bytes) -> ParsedQuizLine:
+    """Structure checks only; domain rules are checked by the domain model itself."""
+    record = loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Line must be a JSON object")
+
+    questions = []
+    for question in _field(record, "questions", list):
+        if not isinstance(question, dict):
+            raise ValueError("Question must be a JSON object")
+        answers = []
+        for answer in _field(question, "answers", list):
+            if not isinstance(answer, dict):
+                raise ValueError("Answer must be a JSON object")
+            answers.append(
+                ChoiceAnswerAdminDTO(
+                    is_correct=_field(answer, "is_correct", bool), text=_field(answer, "text", str)
+                )
+            )
+        questions.append(ChoiceQuestionAdminDTO(text=_field(question, "text", str), answers=answers))
+
+    quiz_id = record.get("id")
+    description = record.get("description")
+    if description is not None and not isinstance(description, str):
+        raise ValueError("Field (description) has wrong type")
+    return ParsedQuizLine(
+        line_number=line_number,
+        subject_id=UUID(_field(record, "subject_id", str)),
+        dto=QuizAdminDTO(
+            id=UUID(quiz_id) if quiz_id is not None else None,
+            name=_field(record, "name", str),
+            description=description,
+            time=timedelta(seconds=_field(record, "time", (int, float))),
+            difficulty=Difficulty(_field(record, "difficulty", str)),
+            subject=None,
+            questions=questions,
+        ),
+    )
+
+
+class QuizImportService:
+    """
+    NDJSON-импорт квизов: файл читается потоком и пишется пачками по chunk_size,
+    каждая пачка в своей транзакции. Память зависит от размера пачки, а не файла.
+    Формат строки: {"name", "description", "time" (секунды), "difficulty", "subject_id",
+    "questions": [{"text", "answers": [{"text", "is_correct"}]}], "id" (необязательно)}.
+    """
+
+    uow: UnitOfWork
+    quiz_repo: QuizRepository
+    subject_repo: SubjectRepository
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        quiz_repo: QuizRepository,
+        subject_repo: SubjectRepository,
+        chunk_size: int = 1000,
+        max_line_bytes: int = 4 * 1024 * 1024,
+        max_reported_rejects: int = 1000,
+    ):
+        self.uow = uow
+        self.quiz_repo = quiz_repo
+        self.subject_repo = subject_repo
+        self.chunk_size = chunk_size
+        self.max_line_bytes = max_line_bytes
+        self.max_reported_rejects = max_reported_rejects
+        self.domain_mapper = QuizDomainMapper()
+
+    async def import_ndjson(
+        self, chunks: AsyncIterable[bytes], on_progress: Optional[Callable[[ImportReport], Any]] = None
+    ) -> ImportReport:
+        report = ImportReport()
+        subjects: dict[UUID, Subject] = {}
+        batch: list[ParsedQuizLine] = []
+
+        async for line in iter_lines(chunks, self.max_line_bytes):
+            report.lines_read += 1
+            if line is None:
+                report.reject(report.lines_read, "Line is too long", self.max_reported_rejects)
+                continue
+            if not line.strip():
+                continue
+            try:
+                batch.append(parse_quiz_line(report.lines_read, line))
+            except (ValueError, TypeError, OverflowError) as e:
+                report.reject(report.lines_read, str(e), self.max_reported_rejects)
+
+            if len(batch) >= self.chunk_size:
+                await self._write_batch(batch, subjects, report)
+                batch = []
+                self._notify(report, on_progress)
+
+        if batch:
+            await self._write_batch(batch, subjects, report)
+        self._notify(report, on_progress)
+        return report
+
+    async def _write_batch(
+        self, batch: list[ParsedQuizLine], subjects: dict[UUID, Subject], report: ImportReport
+    ) -> None:
+        async with self.uow as uow:
+            unknown_subject_ids = list({parsed.subject_id for parsed in batch} - subjects.keys())
+            if unknown_subject_ids:
+                for subject in await self.subject_repo.get_by_ids(unknown_subject_ids):
+                    subjects[subject.id] = subject
+
+            quizzes, line_numbers = [], []
+            for parsed in batch:
+                subject = subjects.get(parsed.subject_id)
+                if subject is None:
+                    report.reject(
+                        parsed.line_number,
+                        f"Subject ({parsed.subject_id}) not found",
+                        self.max_reported_rejects,
+                    )
+                    continue
+                parsed.dto.subject = subject
+                try:
+                    quizzes.append(self.domain_mapper.map_dto_to_domain_object(parsed.dto))
+                    line_numbers.append(parsed.line_number)
+                except ValueError as e:
+                    report.reject(parsed.line_number, str(e), self.max_reported_rejects)
+
+            results = await self.quiz_repo.add_many(quizzes) if quizzes else []
+            for line_number, result in zip(line_numbers, results):
+                if result.error is None:
+                    report.accepted += 1
+                else:
+                    reason = f"{result.error.message}: {result.error.detail}"
+                    report.reject(line_number, reason, self.max_reported_rejects)
+
+            await uow.commit()
+
+    def _notify(self, report: ImportReport, on_progress: Optional[Callable[[ImportReport], Any]]) -> None:
+        logger.info(
+            "Quiz import: %s lines read, %s accepted, %s rejected",
+            report.lines_read, report.accepted, report.rejected,
+        )
+        if on_progress is not None:
+            on_progress(report)
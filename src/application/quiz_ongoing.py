@@ -1,42 +1,202 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Callable, Optional
+from uuid import UUID, uuid4
 
-# from datetime import datetime
+from src.application.clock import utc_now
+from src.application.domain.attempt import AnswerKey, Attempt
+from src.application.domain.exceptions import ItemDataConflict
+from src.application.ports.answer_key import AnswerKeyRepository
+from src.application.ports.attempt import AttemptRepository
+from src.application.ports.attempt_state import AnswerEvent, AttemptStateStore
+from src.application.ports.cache import AnswerKeyCache
+from src.application.ports.quiz import QuizRepository
+from src.application.ports.quiz_result import QuizResultRepository
+from src.application.ports.uow import UnitOfWork
 
 
-# def get_quiz(quiz_id):
-#     """
-#     returns base quiz info
-#     """
+@dataclass
+class AttemptAnswerDTO:
+    id: UUID
+    text: str
 
 
-# def start_quiz(quiz_id, user_id):
-#     """
-#     returns: ongoing_quiz_id
-#     """
-#     start_time = datetime.now()
-#     ongoing_quiz_id = ...
-#     # как обеспечить уникальность? Записывать в базу? Сделай сначала чисто на постгре, потом тащи редиску.
-#     return get_questions_and_answers(ongoing_quiz_id, user_id)
+@dataclass
+class AttemptQuestionDTO:
+    id: UUID
+    text: str
+    answers: list[AttemptAnswerDTO]
+    chosen_answer_ids: list[UUID]
 
 
-# def get_questions_and_answers(ongoing_quiz_id, user_id):
-#     """
-#     returns: questions and answers with user progress
-#     """
+@dataclass
+class AttemptDTO:
+    """What the user sees while taking a quiz: no is_correct anywhere."""
 
+    id: UUID
+    quiz_id: UUID
+    started_at: datetime
+    deadline: datetime
+    finished_at: Optional[datetime]
+    questions: list[AttemptQuestionDTO]
 
-# def answer_question(ongoing_quiz_id, user_id, question_id, answer_id):
-#     """
-#     returns: ongoing_quiz_id
-#     """
 
+@dataclass
+class AttemptResultDTO:
+    id: UUID
+    quiz_id: UUID
+    started_at: datetime
+    finished_at: Optional[datetime]
+    score: Optional[int]
+    question_count: int
 
-# def end_ongoing_quiz(ongoing_quiz_id, user_id):
-#     """
-#     returns: ongoing_quiz_id
-#     """
 
+class QuizOngoingService:
+    """
+    Прохождение квизов. Ответы проверяются по AnswerKey, который строится один раз
+    на (quiz_id, версия квиза): при старте первой попытки на версии его вопросы сохраняются
+    снимком, дальше ключ берётся из кэша или из снимка, так что ответ и завершение попытки
+    не перечитывают и не пересобирают Quiz, а правка квиза не меняет вопросы начатых попыток.
+    Ответы хранятся в AttemptStateStore, который может копить их и писать пачками.
+    """
 
-# def get_quiz_result(quiz_id, user_id):
-#     """
-#     returns: quiz_result
-#     """
+    uow: UnitOfWork
+    attempt_repo: AttemptRepository
+    attempt_state: AttemptStateStore
+    quiz_repo: QuizRepository
+    answer_key_repo: AnswerKeyRepository
+    result_repo: QuizResultRepository
+    answer_keys: AnswerKeyCache
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        attempt_repo: AttemptRepository,
+        attempt_state: AttemptStateStore,
+        quiz_repo: QuizRepository,
+        answer_key_repo: AnswerKeyRepository,
+        result_repo: QuizResultRepository,
+        answer_keys: AnswerKeyCache,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.uow = uow
+        self.attempt_repo = attempt_repo
+        self.attempt_state = attempt_state
+        self.quiz_repo = quiz_repo
+        self.answer_key_repo = answer_key_repo
+        self.result_repo = result_repo
+        self.answer_keys = answer_keys
+        self.clock = clock
+
+    async def start_quiz(self, quiz_id: UUID, user_id: int) -> AttemptDTO:
+        async with self.uow as uow:
+            key = await self._get_current_answer_key(uow, quiz_id)
+            attempt = Attempt.start(uuid4(), user_id, key, self.clock())
+            await self.attempt_repo.add_one(attempt)
+            await uow.commit()
+        return self._to_attempt_dto(attempt, key)
+
+    async def get_questions_and_answers(self, attempt_id: UUID, user_id: int) -> AttemptDTO:
+        async with self.uow:
+            attempt = await self._get_own_attempt(attempt_id, user_id)
+            key = await self._get_answer_key(attempt.quiz_id, attempt.quiz_version)
+        attempt.answers = await self.attempt_state.get_answers(attempt_id)
+        return self._to_attempt_dto(attempt, key)
+
+    async def answer_question(
+        self, attempt_id: UUID, user_id: int, question_id: UUID, answer_ids: list[UUID]
+    ) -> UUID:
+        now = self.clock()
+        chosen = frozenset(answer_ids)
+        async with self.uow:
+            attempt = await self._get_own_attempt(attempt_id, user_id)
+            attempt.check_can_answer(now)
+            key = await self._get_answer_key(attempt.quiz_id, attempt.quiz_version)
+        key.check_answers(question_id, chosen)
+        await self.attempt_state.save_answers([AnswerEvent(attempt_id, question_id, chosen, now)])
+        return attempt_id
+
+    async def end_ongoing_quiz(self, attempt_id: UUID, user_id: int) -> AttemptResultDTO:
+        async with self.uow as uow:
+            attempt = await self._get_own_attempt(attempt_id, user_id)
+            attempt.answers = await self.attempt_state.get_answers(attempt_id)
+            key = await self._get_answer_key(attempt.quiz_id, attempt.quiz_version)
+            attempt.finish(key, self.clock())
+            await self.attempt_repo.finish(attempt)
+            # Итоги дописываются в той же транзакции: завершённая попытка учтена ровно один раз.
+            await self.result_repo.add_finished_attempt(attempt)
+            await uow.commit()
+        return self._to_result_dto(attempt)
+
+    async def get_quiz_result(self, quiz_id: UUID, user_id: int) -> list[AttemptResultDTO]:
+        async with self.uow.read_only():
+            attempts = await self.attempt_repo.get_finished(quiz_id, user_id)
+        return [self._to_result_dto(attempt) for attempt in attempts]
+
+    async def _get_own_attempt(self, attempt_id: UUID, user_id: int) -> Attempt:
+        attempt = await self.attempt_repo.get_by_id(attempt_id)
+        attempt.check_owner(user_id)
+        return attempt
+
+    async def _get_current_answer_key(self, uow: UnitOfWork, quiz_id: UUID) -> AnswerKey:
+        """Key of the version a new attempt starts on; its snapshot is saved in the same transaction."""
+        quiz_version = await self.quiz_repo.get_version(quiz_id)
+        key = await self._find_answer_key(quiz_id, quiz_version)
+        if key is None:
+            cache_version = self.answer_keys.version()
+            quiz, quiz_version = await self.quiz_repo.get_by_id_with_version(quiz_id)
+            key = AnswerKey.from_quiz(quiz, quiz_version)
+            await self.answer_key_repo.add_if_absent(key)
+            # В кэш — только после коммита: без снимка в базе ключ из кэша другие процессы не найдут.
+            uow.on_commit(partial(self.answer_keys.put, (quiz_id, quiz_version), key, cache_version))
+        return key
+
+    async def _get_answer_key(self, quiz_id: UUID, quiz_version: int) -> AnswerKey:
+        """Key of the version the attempt was started on, never of the current one."""
+        key = await self._find_answer_key(quiz_id, quiz_version)
+        if key is None:
+            raise ItemDataConflict(
+                detail=f"Questions of quiz ({quiz_id}) version {quiz_version} are no longer available",
+                cause_entity="Attempt",
+            )
+        return key
+
+    async def _find_answer_key(self, quiz_id: UUID, quiz_version: int) -> Optional[AnswerKey]:
+        key = self.answer_keys.get((quiz_id, quiz_version))
+        if key is None:
+            cache_version = self.answer_keys.version()
+            key = await self.answer_key_repo.get(quiz_id, quiz_version)
+            if key is not None:
+                self.answer_keys.put((quiz_id, quiz_version), key, cache_version)
+        return key
+
+    @staticmethod
+    def _to_attempt_dto(attempt: Attempt, key: AnswerKey) -> AttemptDTO:
+        return AttemptDTO(
+            id=attempt.id,
+            quiz_id=attempt.quiz_id,
+            started_at=attempt.started_at,
+            deadline=attempt.deadline,
+            finished_at=attempt.finished_at,
+            questions=[
+                AttemptQuestionDTO(
+                    id=question.id,
+                    text=question.text,
+                    answers=[AttemptAnswerDTO(id=answer.id, text=answer.text) for answer in question.answers],
+                    chosen_answer_ids=sorted(attempt.answers.get(question.id, ())),
+                )
+                for question in key.questions
+            ],
+        )
+
+    @staticmethod
+    def _to_result_dto(attempt: Attempt) -> AttemptResultDTO:
+        return AttemptResultDTO(
+            id=attempt.id,
+            quiz_id=attempt.quiz_id,
+            started_at=attempt.started_at,
+            finished_at=attempt.finished_at,
+            score=attempt.score,
+            question_count=attempt.question_count,
+        )
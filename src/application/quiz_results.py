@@ -0,0 +1,34 @@
+from typing import Optional
+from uuid import UUID
+
+from src.application.ports.quiz_result import (
+    DifficultyResultSummary,
+    QuizResultRepository,
+    SubjectResultSummary,
+)
+from src.application.ports.uow import UnitOfWork
+from src.application.quiz_admin import PageDTO, make_page
+
+
+class QuizResultsService:
+    """Dashboard reads over the result rollup, which QuizOngoingService updates as attempts finish."""
+
+    uow: UnitOfWork
+    repo: QuizResultRepository
+
+    def __init__(self, uow: UnitOfWork, repo: QuizResultRepository):
+        self.uow = uow
+        self.repo = repo
+
+    async def get_quiz_page(self, limit: int, after_id: Optional[UUID] = None) -> PageDTO:
+        async with self.uow.read_only():
+            summaries = await self.repo.get_quiz_page(limit + 1, after_id)
+        return make_page(summaries, limit)
+
+    async def get_by_subject(self) -> list[SubjectResultSummary]:
+        async with self.uow.read_only():
+            return await self.repo.get_by_subject()
+
+    async def get_by_difficulty(self) -> list[DifficultyResultSummary]:
+        async with self.uow.read_only():
+            return await self.repo.get_by_difficulty()
@@ -0,0 +1,51 @@
+"""
+Онлайн-перенос вопросов из quiz.questions (JSONB) в таблицы question/answer.
+
+    python -m src.cli.backfill_questions
+
+Запускать после миграции 5e8d3b1c9f27 и переключения на QUIZ_STORAGE_LAYOUT=normalized.
+Квизы обходятся по id пачками, каждая пачка в своей короткой транзакции, поэтому
+блокируются только строки текущей пачки. Повторный запуск продолжает с того, что осталось.
+"""
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import select
+
+from src.adapters.sqlalchemy.connect import async_session_maker, dispose_engines
+from src.adapters.sqlalchemy.models import QuizModel
+from src.adapters.sqlalchemy.repositories.quiz_normalized import move_questions_to_tables
+from src.config import QUESTION_BACKFILL_BATCH_SIZE
+
+
+async def main(batch_size: int) -> int:
+    moved = 0
+    after_id = None
+    try:
+        while True:
+            async with async_session_maker() as session, session.begin():
+                query = (
+                    select(QuizModel.id)
+                    .where(QuizModel.questions.is_not(None))
+                    .order_by(QuizModel.id)
+                    .limit(batch_size)
+                )
+                if after_id is not None:
+                    query = query.where(QuizModel.id > after_id)
+                quiz_ids = list(await session.scalars(query))
+                if not quiz_ids:
+                    return moved
+                moved += await move_questions_to_tables(session, quiz_ids)
+            after_id = quiz_ids[-1]
+            print(f"moved: {moved}", file=sys.stderr)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move quiz questions from JSONB into question/answer tables")
+    parser.add_argument("--batch-size", type=int, default=QUESTION_BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(f"quizzes moved: {asyncio.run(main(args.batch_size))}")
@@ -0,0 +1,67 @@
+"""
+Импорт квизов из NDJSON-файла в обход HTTP.
+
+    python -m src.cli.import_quizzes quizzes.ndjson
+
+Прогресс пишется в stderr, итоговый отчёт в stdout.
+"""
+import argparse
+import asyncio
+import sys
+
+import aiofiles
+from orjson import OPT_INDENT_2, dumps  # pylint: disable=E0611
+
+from src.adapters.sqlalchemy.connect import async_session_maker, dispose_engines
+from src.adapters.sqlalchemy.repositories.subject import SubjectRepositorySqlAlchemy
+from src.adapters.sqlalchemy.uow import SqlAlchemyUnitOfWork
+from src.application.quiz_import import ImportReport, QuizImportService
+from src.config import (
+    QUIZ_IMPORT_CHUNK_SIZE,
+    QUIZ_IMPORT_MAX_LINE_BYTES,
+    QUIZ_IMPORT_MAX_REPORTED_REJECTS,
+    QUIZ_STORAGE_LAYOUT,
+)
+from src.dependencies import QUIZ_REPOSITORY_BY_LAYOUT
+
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+async def read_file(path: str):
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(READ_CHUNK_BYTES):
+            yield chunk
+
+
+def print_progress(report: ImportReport) -> None:
+    print(
+        f"lines: {report.lines_read}, accepted: {report.accepted}, rejected: {report.rejected}",
+        file=sys.stderr,
+    )
+
+
+async def main(path: str) -> ImportReport:
+    session = async_session_maker()
+    service = QuizImportService(
+        SqlAlchemyUnitOfWork(session),
+        QUIZ_REPOSITORY_BY_LAYOUT[QUIZ_STORAGE_LAYOUT](session),
+        SubjectRepositorySqlAlchemy(session),
+        chunk_size=QUIZ_IMPORT_CHUNK_SIZE,
+        max_line_bytes=QUIZ_IMPORT_MAX_LINE_BYTES,
+        max_reported_rejects=QUIZ_IMPORT_MAX_REPORTED_REJECTS,
+    )
+    try:
+        return await service.import_ndjson(read_file(path), on_progress=print_progress)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import quizzes from an NDJSON file")
+    parser.add_argument("path", help="NDJSON file, one quiz per line")
+    args = parser.parse_args()
+
+    result = asyncio.run(main(args.path))
+    sys.stdout.buffer.write(dumps(result, option=OPT_INDENT_2) + b"\n")
+    sys.exit(1 if result.rejected else 0)
@@ -11,6 +11,77 @@ POSTGRE_DB_NAME = os.getenv("POSTGRE_DB_NAME")
 POSTGRE_USERNAME = os.getenv("POSTGRE_USERNAME")
 POSTGRE_PASSWORD = os.getenv("POSTGRE_PASSWORD")
 
+# Реплика для read-only запросов; без POSTGRE_REPLICA_HOST всё идёт в primary.
+# Остальные параметры по умолчанию совпадают с primary.
+POSTGRE_REPLICA_HOST = os.getenv("POSTGRE_REPLICA_HOST")
+POSTGRE_REPLICA_PORT = os.getenv("POSTGRE_REPLICA_PORT", POSTGRE_PORT)
+POSTGRE_REPLICA_DB_NAME = os.getenv("POSTGRE_REPLICA_DB_NAME", POSTGRE_DB_NAME)
+POSTGRE_REPLICA_USERNAME = os.getenv("POSTGRE_REPLICA_USERNAME", POSTGRE_USERNAME)
+POSTGRE_REPLICA_PASSWORD = os.getenv("POSTGRE_REPLICA_PASSWORD", POSTGRE_PASSWORD)
+# Сколько секунд после записи клиент читает только из primary (read-your-writes). 0 — выключено.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
 CORS_ORIGINS = os.getenv("CORS_ORIGINS")
 
+# Среда запуска: production, staging, development.
+APP_ENV = os.getenv("APP_ENV", "production")
+
+# Пишет в лог каждый запрос и заметно снижает пропускную способность; медленные запросы
+# и так попадают в лог по DB_SLOW_QUERY_SECONDS, а статистика по ним — в /api/monitoring/db-queries.
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_SLOW_QUERY_SECONDS = float(os.getenv("DB_SLOW_QUERY_SECONDS", "0.2"))
+# Доля медленных SELECT, для которых снимается EXPLAIN (ANALYZE, BUFFERS). ANALYZE выполняет
+# запрос ещё раз, поэтому в production выключено всегда.
+DB_EXPLAIN_SAMPLE_RATE = (
+    float(os.getenv("DB_EXPLAIN_SAMPLE_RATE", "0.1")) if APP_ENV != "production" else 0.0
+)
+DB_EXPLAIN_INTERVAL_SECONDS = float(os.getenv("DB_EXPLAIN_INTERVAL_SECONDS", "5"))
+# Сколько разных запросов помнить и по скольким последним выполнениям каждого считать p95.
+DB_QUERY_STATS_MAX_FINGERPRINTS = int(os.getenv("DB_QUERY_STATS_MAX_FINGERPRINTS", "500"))
+DB_QUERY_STATS_WINDOW = int(os.getenv("DB_QUERY_STATS_WINDOW", "256"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# -1 — не пересоздавать соединения по возрасту.
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+BULK_COPY_THRESHOLD = int(os.getenv("BULK_COPY_THRESHOLD", "1000"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+QUIZ_IMPORT_CHUNK_SIZE = int(os.getenv("QUIZ_IMPORT_CHUNK_SIZE", "1000"))
+QUIZ_IMPORT_MAX_LINE_BYTES = int(os.getenv("QUIZ_IMPORT_MAX_LINE_BYTES", str(4 * 1024 * 1024)))
+QUIZ_IMPORT_MAX_REPORTED_REJECTS = int(os.getenv("QUIZ_IMPORT_MAX_REPORTED_REJECTS", "1000"))
+
+QUIZ_CACHE_MAX_SIZE = int(os.getenv("QUIZ_CACHE_MAX_SIZE", "1024"))
+QUIZ_CACHE_TTL_SECONDS = float(os.getenv("QUIZ_CACHE_TTL_SECONDS", "60"))
+
+# Ключи ответов кэшируются по (quiz_id, версия) и не устаревают, TTL только освобождает память.
+ANSWER_KEY_CACHE_MAX_SIZE = int(os.getenv("ANSWER_KEY_CACHE_MAX_SIZE", "1024"))
+ANSWER_KEY_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_KEY_CACHE_TTL_SECONDS", "3600"))
+
+# Где хранятся ответы попыток: "postgres" или "memory" (только для одного процесса).
+ATTEMPT_STATE_BACKEND = os.getenv("ATTEMPT_STATE_BACKEND", "postgres")
+# "sync" — ответ записан до ответа клиенту; "buffered" — ответы пишутся пачками,
+# последние ответы теряются при падении процесса.
+ATTEMPT_STATE_DURABILITY = os.getenv("ATTEMPT_STATE_DURABILITY", "sync")
+ATTEMPT_STATE_FLUSH_BATCH_SIZE = int(os.getenv("ATTEMPT_STATE_FLUSH_BATCH_SIZE", "500"))
+ATTEMPT_STATE_FLUSH_INTERVAL_SECONDS = float(os.getenv("ATTEMPT_STATE_FLUSH_INTERVAL_SECONDS", "0.5"))
+
+# Сжатие ответов: тела меньше порога отдаются как есть. Уровень 1..9 для gzip и deflate.
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+# Сжатые тела ответов с ETag; запись для ETag не устаревает, TTL только освобождает память.
+COMPRESSION_CACHE_MAX_SIZE = int(os.getenv("COMPRESSION_CACHE_MAX_SIZE", "256"))
+COMPRESSION_CACHE_TTL_SECONDS = float(os.getenv("COMPRESSION_CACHE_TTL_SECONDS", "600"))
+
+# Idempotency-Key: сколько хранится ответ на запрос с ключом; в кэше процесса — последние ключи.
+IDEMPOTENCY_KEY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_CACHE_MAX_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_MAX_SIZE", "4096"))
+
+# "jsonb" — вопросы массивом в quiz.questions, "normalized" — в таблицах question/answer.
+QUIZ_STORAGE_LAYOUT = os.getenv("QUIZ_STORAGE_LAYOUT", "jsonb")
+QUESTION_BACKFILL_BATCH_SIZE = int(os.getenv("QUESTION_BACKFILL_BATCH_SIZE", "500"))
+
 APP_NAME = "quiz-service"
@@ -1,30 +1,148 @@
-from sanic import Request, Sanic
+from datetime import timedelta
+from sanic import Sanic
 from sanic_ext import Extend
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.adapters.inmemory.attempt_state import InMemoryAttemptStateStore, WriteBehindAttemptStateStore
+from src.adapters.sqlalchemy.attempt_state import AttemptStateStoreSqlAlchemy
+from src.adapters.sqlalchemy.repositories.answer_key import AnswerKeyRepositorySqlAlchemy
+from src.adapters.sqlalchemy.repositories.attempt import AttemptRepositorySqlAlchemy
+from src.adapters.sqlalchemy.repositories.idempotency import IdempotencyRepositorySqlAlchemy
 from src.adapters.sqlalchemy.repositories.quiz import QuizRepositorySqlAlchemy
+from src.adapters.sqlalchemy.repositories.quiz_normalized import QuizRepositoryNormalizedSqlAlchemy
+from src.adapters.sqlalchemy.repositories.quiz_result import QuizResultRepositorySqlAlchemy
 from src.adapters.sqlalchemy.repositories.subject import SubjectRepositorySqlAlchemy
+from src.application.ports.answer_key import AnswerKeyRepository
+from src.application.ports.attempt import AttemptRepository
+from src.application.ports.attempt_state import AttemptStateStore, Durability
+from src.application.ports.idempotency import IdempotencyRepository
 from src.application.ports.quiz import QuizRepository
+from src.application.ports.quiz_result import QuizResultRepository
 from src.application.ports.subject import SubjectRepository
 from src.adapters.sqlalchemy.uow import SqlAlchemyUnitOfWork
 from src.application.ports.uow import UnitOfWork
-from src.application.quiz_admin import SubjectAdminService
-from src.adapters.sqlalchemy.connect import async_session_maker
+from src.application.admin_batch import AdminBatchService
+from src.application.idempotency import IdempotencyService
+from src.application.quiz_admin import QuizAdminService, SubjectAdminService
+from src.application.quiz_import import QuizImportService
+from src.application.quiz_ongoing import QuizOngoingService
+from src.application.quiz_results import QuizResultsService
+from src.adapters.sqlalchemy.connect import async_session_maker, engine, query_log
+from src.adapters.sqlalchemy.pool import InstrumentedAsyncQueuePool
+from src.adapters.sqlalchemy.query_log import QueryLog
+from src.api.request_session import RequestSessions
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
+from src.application.ports.cache import AnswerKeyCache, CompressedBodyCache, IdempotencyCache, QuizCache
+from src.config import (
+    ANSWER_KEY_CACHE_MAX_SIZE,
+    ANSWER_KEY_CACHE_TTL_SECONDS,
+    ATTEMPT_STATE_BACKEND,
+    ATTEMPT_STATE_DURABILITY,
+    ATTEMPT_STATE_FLUSH_BATCH_SIZE,
+    COMPRESSION_CACHE_MAX_SIZE,
+    COMPRESSION_CACHE_TTL_SECONDS,
+    IDEMPOTENCY_CACHE_MAX_SIZE,
+    IDEMPOTENCY_KEY_TTL_SECONDS,
+    QUIZ_CACHE_MAX_SIZE,
+    QUIZ_CACHE_TTL_SECONDS,
+    QUIZ_IMPORT_CHUNK_SIZE,
+    QUIZ_IMPORT_MAX_LINE_BYTES,
+    QUIZ_IMPORT_MAX_REPORTED_REJECTS,
+    QUIZ_STORAGE_LAYOUT,
+)
+
+
+QUIZ_REPOSITORY_BY_LAYOUT = {
+    "jsonb": QuizRepositorySqlAlchemy,
+    "normalized": QuizRepositoryNormalizedSqlAlchemy,
+}
+
+
+def make_quiz_import_service(
+    uow: UnitOfWork, quiz_repo: QuizRepository, subject_repo: SubjectRepository
+) -> QuizImportService:
+    return QuizImportService(
+        uow,
+        quiz_repo,
+        subject_repo,
+        chunk_size=QUIZ_IMPORT_CHUNK_SIZE,
+        max_line_bytes=QUIZ_IMPORT_MAX_LINE_BYTES,
+        max_reported_rejects=QUIZ_IMPORT_MAX_REPORTED_REJECTS,
+    )
+
+
+def make_quiz_ongoing_service(
+    uow: UnitOfWork,
+    attempt_repo: AttemptRepository,
+    attempt_state: AttemptStateStore,
+    quiz_repo: QuizRepository,
+    answer_key_repo: AnswerKeyRepository,
+    result_repo: QuizResultRepository,
+    answer_keys: AnswerKeyCache,
+) -> QuizOngoingService:
+    return QuizOngoingService(
+        uow, attempt_repo, attempt_state, quiz_repo, answer_key_repo, result_repo, answer_keys
+    )
+
+
+def make_idempotency_service(
+    uow: UnitOfWork, repo: IdempotencyRepository, cache: IdempotencyCache
+) -> IdempotencyService:
+    return IdempotencyService(uow, repo, cache, ttl=timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS))
+
+
+def make_attempt_state_store() -> WriteBehindAttemptStateStore:
+    if ATTEMPT_STATE_BACKEND == "memory":
+        store = InMemoryAttemptStateStore()
+    else:
+        store = AttemptStateStoreSqlAlchemy(async_session_maker)
+    return WriteBehindAttemptStateStore(
+        store, durability=Durability(ATTEMPT_STATE_DURABILITY), batch_size=ATTEMPT_STATE_FLUSH_BATCH_SIZE
+    )
 
 
 def add_dependencies(app: Sanic):
     ext: Extend = app.ext
 
     ext.add_dependency(SubjectAdminService)
+    ext.add_dependency(QuizAdminService)
+    ext.add_dependency(AdminBatchService)
+    ext.add_dependency(IdempotencyService, make_idempotency_service)
+    ext.add_dependency(QuizImportService, make_quiz_import_service)
+    ext.add_dependency(QuizOngoingService, make_quiz_ongoing_service)
+    ext.add_dependency(QuizResultsService)
     ext.add_dependency(UnitOfWork, SqlAlchemyUnitOfWork)
 
-    def supply_deduplicated_session(request: Request) -> AsyncSession:
-        """Opened issue for cached dependencies ¯\\_(ツ)_/¯."""
-        ctx = request.ctx
-        if hasattr(ctx, "session"):
-            return ctx.session
-        ctx.session = async_session_maker()
-        return ctx.session
-    ext.add_dependency(AsyncSession, supply_deduplicated_session)
+    # Закрывает сессии middleware из server.py, поэтому держатель лежит в app.ctx.
+    app.ctx.request_sessions = RequestSessions(async_session_maker)
+    ext.add_dependency(AsyncSession, app.ctx.request_sessions.supply)
+    ext.add_dependency(RequestSessions, lambda: app.ctx.request_sessions)
 
-    ext.add_dependency(QuizRepository, QuizRepositorySqlAlchemy)
+    ext.add_dependency(QuizRepository, QUIZ_REPOSITORY_BY_LAYOUT[QUIZ_STORAGE_LAYOUT])
     ext.add_dependency(SubjectRepository, SubjectRepositorySqlAlchemy)
+    ext.add_dependency(AttemptRepository, AttemptRepositorySqlAlchemy)
+    ext.add_dependency(AnswerKeyRepository, AnswerKeyRepositorySqlAlchemy)
+    ext.add_dependency(QuizResultRepository, QuizResultRepositorySqlAlchemy)
+    ext.add_dependency(IdempotencyRepository, IdempotencyRepositorySqlAlchemy)
+
+    # Один кэш на процесс, поэтому отдаём один и тот же объект.
+    quiz_cache = VersionedLRUCache(max_size=QUIZ_CACHE_MAX_SIZE, ttl=QUIZ_CACHE_TTL_SECONDS)
+    ext.add_dependency(QuizCache, lambda: quiz_cache)
+    answer_key_cache = VersionedLRUCache(max_size=ANSWER_KEY_CACHE_MAX_SIZE, ttl=ANSWER_KEY_CACHE_TTL_SECONDS)
+    ext.add_dependency(AnswerKeyCache, lambda: answer_key_cache)
+    idempotency_cache = VersionedLRUCache(
+        max_size=IDEMPOTENCY_CACHE_MAX_SIZE, ttl=IDEMPOTENCY_KEY_TTL_SECONDS
+    )
+    ext.add_dependency(IdempotencyCache, lambda: idempotency_cache)
+    # Его читает middleware сжатия (см. server.py), поэтому он лежит в app.ctx.
+    app.ctx.compressed_body_cache = VersionedLRUCache(
+        max_size=COMPRESSION_CACHE_MAX_SIZE, ttl=COMPRESSION_CACHE_TTL_SECONDS
+    )
+    ext.add_dependency(CompressedBodyCache, lambda: app.ctx.compressed_body_cache)
+
+    # Буфер ответов общий на процесс; сбрасывают его слушатели сервера (см. server.py).
+    app.ctx.attempt_state = make_attempt_state_store()
+    ext.add_dependency(AttemptStateStore, lambda: app.ctx.attempt_state)
+
+    # Пул берём на каждый запрос: после engine.dispose() алхимия создаёт новый объект пула.
+    ext.add_dependency(InstrumentedAsyncQueuePool, lambda: engine.sync_engine.pool)
+    ext.add_dependency(QueryLog, lambda: query_log)
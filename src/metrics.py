@@ -0,0 +1,134 @@
+"""
+Метрики процесса в текстовом формате Prometheus, без внешних зависимостей.
+
+Запись метрики — поиск серии в словаре, bisect по границам и два сложения, без блокировок:
+всё пишется из потока event loop. Как и /api/monitoring, значения у каждого воркера свои.
+"""
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+
+# Границы по умолчанию, в секундах.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Для запросов к базе и ожидания пула: большая часть укладывается в миллисекунды.
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        # Без меток серия одна, и её видно с нулём ещё до первого события.
+        self._series: dict[tuple, float] = {} if self.label_names else {(): 0}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def value(self, labels: tuple = ()) -> float:
+        return self._series.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._series.items():
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_number(value)}"
+
+
+class Histogram:
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Серия: счётчики по корзинам (последняя — +Inf), без накопления, и сумма значений в конце.
+        self._series: dict[tuple, list] = {}
+        if not self.label_names:
+            self._series[()] = self._empty_series()
+
+    def _empty_series(self) -> list:
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, labels: tuple, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = self._empty_series()
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, labels: tuple = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def samples(self) -> Iterable[str]:
+        bounds = [_format_number(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, series):
+                cumulative += bucket_count
+                label_text = _format_labels(self.label_names, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{label_text} {_format_number(series[-1])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric ({metric.name}) is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[object]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, label_names))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    label_names: Iterable[str] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, label_names, buckets))
@@ -1,10 +1,55 @@
+from datetime import timedelta
 from textwrap import dedent
 from sanic import Sanic
-from orjson import dumps, loads  # pylint: disable=E0611
+from orjson import dumps as orjson_dumps, loads  # pylint: disable=E0611
 from src.dependencies import add_dependencies
-from src.config import APP_NAME
+from src.adapters.sqlalchemy.connect import engine, query_log
+from src.config import APP_NAME, ATTEMPT_STATE_FLUSH_INTERVAL_SECONDS
+from src.config import DB_EXPLAIN_INTERVAL_SECONDS, DB_EXPLAIN_SAMPLE_RATE
 from src.config import CORS_ORIGINS
 from src.api.api import api
+from src.api.compression import compress_response
+from src.api.errors import core_exception_handler
+from src.api.metrics import metrics, observe_request, start_request_timer
+from src.api.read_your_writes import pin_writer_to_primary
+from src.api.request_session import close_request_session
+from src.application.domain.exceptions import BaseCoreException
+
+
+def serialize_default(obj):
+    """orjson не умеет timedelta, отдаём секунды, как и в JSONB."""
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    raise TypeError
+
+
+def dumps(obj) -> bytes:
+    return orjson_dumps(obj, default=serialize_default)
+
+
+ATTEMPT_STATE_FLUSHER = "attempt-state-flusher"
+
+
+async def start_attempt_state_flusher(app: Sanic):
+    app.add_task(
+        app.ctx.attempt_state.run_flusher(ATTEMPT_STATE_FLUSH_INTERVAL_SECONDS), name=ATTEMPT_STATE_FLUSHER
+    )
+
+
+async def flush_attempt_state(app: Sanic):
+    await app.cancel_task(ATTEMPT_STATE_FLUSHER, raise_exception=False)
+    await app.ctx.attempt_state.flush()
+
+
+QUERY_EXPLAINER = "slow-query-explainer"
+
+
+async def start_query_explainer(app: Sanic):
+    app.add_task(query_log.run_explainer(engine, DB_EXPLAIN_INTERVAL_SECONDS), name=QUERY_EXPLAINER)
+
+
+async def stop_query_explainer(app: Sanic):
+    await app.cancel_task(QUERY_EXPLAINER, raise_exception=False)
 
 
 def create_app() -> Sanic:
@@ -24,7 +69,22 @@ def create_app() -> Sanic:
     app.config.CORS_ORIGINS = CORS_ORIGINS
 
     app.blueprint(api)
+    app.blueprint(metrics)
+    app.error_handler.add(BaseCoreException, core_exception_handler)
+    # Первым из response-middleware: если какое-то из следующих упадёт, остальные не выполнятся.
+    app.register_middleware(close_request_session, "response", priority=100)
+    app.register_middleware(pin_writer_to_primary, "response")
+    app.register_middleware(compress_response, "response")
+    # Последним, чтобы время включало сжатие и остальные middleware.
+    app.register_middleware(observe_request, "response", priority=-100)
+    app.add_signal(start_request_timer, "http.lifecycle.request")
 
     add_dependencies(app)
+    app.register_listener(start_attempt_state_flusher, "after_server_start")
+    app.register_listener(flush_attempt_state, "before_server_stop")
+    # DB_EXPLAIN_SAMPLE_RATE в production всегда 0 (см. config.py).
+    if DB_EXPLAIN_SAMPLE_RATE > 0:
+        app.register_listener(start_query_explainer, "after_server_start")
+        app.register_listener(stop_query_explainer, "before_server_stop")
 
     return app
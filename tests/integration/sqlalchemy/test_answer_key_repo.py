@@ -0,0 +1,53 @@
+from datetime import timedelta
+from uuid import UUID
+import pytest
+import pytest_asyncio
+
+from src.adapters.sqlalchemy.models import SubjectModel
+from src.adapters.sqlalchemy.repositories.answer_key import AnswerKeyRepositorySqlAlchemy
+from src.adapters.sqlalchemy.repositories.quiz import QuizRepositorySqlAlchemy
+from src.application.domain.attempt import AnswerKey
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+from tests.integration.sqlalchemy.connect import get_nested_test_session
+
+
+SUBJECT = Subject(id=UUID(int=1), name="subject1", description="subject1")
+QUIZ = Quiz(
+    id=UUID(int=1),
+    name="quiz1",
+    description="quiz1",
+    _time=timedelta(minutes=1),
+    difficulty=Difficulty.EASY,
+    subject=SUBJECT,
+    _questions=[
+        ChoiceQuestion(
+            id=UUID(int=10),
+            text="question1",
+            _answers=[
+                ChoiceAnswer(id=UUID(int=100), text="right", is_correct=True),
+                ChoiceAnswer(id=UUID(int=101), text="wrong", is_correct=False),
+            ],
+        )
+    ],
+)
+
+
+@pytest_asyncio.fixture(name="repo")
+async def repo_f():
+    async with get_nested_test_session() as session:
+        session.add(SubjectModel(id=SUBJECT.id, name=SUBJECT.name, description=SUBJECT.description))
+        await session.flush()
+        await QuizRepositorySqlAlchemy(session).add_one(QUIZ)
+        yield AnswerKeyRepositorySqlAlchemy(session)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(repo: AnswerKeyRepositorySqlAlchemy):
+    key = AnswerKey.from_quiz(QUIZ, 1)
+    assert await repo.get(QUIZ.id, 1) is None
+
+    await repo.add_if_absent(key)
+    await repo.add_if_absent(key)
+
+    assert await repo.get(QUIZ.id, 1) == key
+    assert await repo.get(QUIZ.id, 2) is None
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.sqlalchemy.models import AttemptModel, QuizModel, SubjectModel
+from src.adapters.sqlalchemy.repositories.attempt import AttemptRepositorySqlAlchemy
+from src.application.domain.attempt import Attempt
+from src.application.domain.exceptions import ItemDataConflict, ItemNotFound
+from src.application.domain.quiz import Difficulty
+from tests.integration.sqlalchemy.connect import get_nested_test_session
+
+
+QUIZ_ID = UUID("00000000-0000-0000-0000-000000000001")
+QUESTION_ID = UUID("00000000-0000-0000-0000-000000000001")
+ANSWER_IDS = [UUID("00000000-0000-0000-0000-000000000001"), UUID("00000000-0000-0000-0000-000000000002")]
+ATTEMPT_ID = UUID("00000000-0000-0000-0000-000000000001")
+STARTED_AT = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture(name="session_with_default_dataset", scope="function")
+async def session_with_default_dataset_f():
+    async with get_nested_test_session() as session:
+        subject = SubjectModel(
+            id=UUID("00000000-0000-0000-0000-000000000001"), name="subject1", description="subject1"
+        )
+        session.add(subject)
+        await session.flush()
+        session.add(
+            QuizModel(
+                id=QUIZ_ID,
+                name="quiz1",
+                description="quiz1",
+                time=timedelta(minutes=1),
+                difficulty=Difficulty.EASY,
+                subject_id=subject.id,
+                questions=[
+                    {
+                        "id": str(QUESTION_ID),
+                        "text": "question1",
+                        "answers": [
+                            {"id": str(ANSWER_IDS[0]), "text": "answer1", "is_correct": True},
+                            {"id": str(ANSWER_IDS[1]), "text": "answer2", "is_correct": False},
+                        ],
+                    }
+                ],
+            )
+        )
+        await session.flush()
+        session.add(
+            AttemptModel(
+                id=ATTEMPT_ID,
+                quiz_id=QUIZ_ID,
+                quiz_version=1,
+                user_id=7,
+                started_at=STARTED_AT,
+                deadline=STARTED_AT + timedelta(minutes=1),
+                question_count=1,
+            )
+        )
+        await session.commit()
+
+        yield session
+
+
+@pytest.fixture(name="attempt_repo")
+def attempt_repo_f(session_with_default_dataset: AsyncSession):
+    return AttemptRepositorySqlAlchemy(session_with_default_dataset)
+
+
+@pytest.mark.asyncio
+async def test_add_one(attempt_repo: AttemptRepositorySqlAlchemy):
+    attempt = Attempt(
+        id=UUID("00000000-0000-0000-0000-000000000002"),
+        quiz_id=QUIZ_ID,
+        quiz_version=1,
+        user_id=8,
+        started_at=STARTED_AT,
+        deadline=STARTED_AT + timedelta(minutes=1),
+        question_count=1,
+    )
+    assert await attempt_repo.add_one(attempt) == str(attempt.id)
+    assert await attempt_repo.get_by_id(attempt.id) == attempt
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_not_found(attempt_repo: AttemptRepositorySqlAlchemy):
+    with pytest.raises(ItemNotFound):
+        await attempt_repo.get_by_id(UUID("00000000-0000-0000-0000-000000000099"))
+
+
+@pytest.mark.asyncio
+async def test_finish_once(
+    attempt_repo: AttemptRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    attempt = await attempt_repo.get_by_id(ATTEMPT_ID)
+    attempt.finished_at, attempt.score = STARTED_AT + timedelta(seconds=30), 1
+
+    assert await attempt_repo.finish(attempt) == ATTEMPT_ID
+    with pytest.raises(ItemDataConflict):
+        await attempt_repo.finish(attempt)
+
+    finished = await attempt_repo.get_finished(QUIZ_ID, 7)
+    assert [(item.id, item.score) for item in finished] == [(ATTEMPT_ID, 1)]
+    assert await attempt_repo.get_finished(QUIZ_ID, 8) == []
+    persisted = await session_with_default_dataset.scalar(
+        select(AttemptModel.score).where(AttemptModel.id == ATTEMPT_ID)
+    )
+    assert persisted == 1
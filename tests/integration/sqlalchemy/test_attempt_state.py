@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.sqlalchemy.attempt_state import AttemptStateStoreSqlAlchemy
+from src.application.ports.attempt_state import AnswerEvent
+from tests.integration.sqlalchemy.test_attempt_repo import (  # pylint: disable=W0611
+    ANSWER_IDS,
+    ATTEMPT_ID,
+    QUESTION_ID,
+    STARTED_AT,
+    session_with_default_dataset_f,
+)
+
+
+@pytest.fixture(name="state_store")
+def state_store_f(session_with_default_dataset: AsyncSession):
+    # Хранилище открывает свои сессии; в тесте они работают в savepoint общей транзакции.
+    return AttemptStateStoreSqlAlchemy(
+        lambda: AsyncSession(
+            bind=session_with_default_dataset.bind,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_answers_keeps_latest_choice(state_store: AttemptStateStoreSqlAlchemy):
+    first = AnswerEvent(ATTEMPT_ID, QUESTION_ID, frozenset([ANSWER_IDS[1]]), STARTED_AT)
+    second = AnswerEvent(ATTEMPT_ID, QUESTION_ID, frozenset(ANSWER_IDS), STARTED_AT + timedelta(seconds=1))
+
+    await state_store.save_answers([first, second])
+    assert await state_store.get_answers(ATTEMPT_ID) == {QUESTION_ID: frozenset(ANSWER_IDS)}
+
+    # Опоздавшая пачка со старым ответом не затирает новый.
+    await state_store.save_answers([first])
+    assert await state_store.get_answers(ATTEMPT_ID) == {QUESTION_ID: frozenset(ANSWER_IDS)}
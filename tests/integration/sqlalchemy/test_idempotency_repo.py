@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from src.adapters.sqlalchemy.models import IdempotencyKeyModel
+from src.adapters.sqlalchemy.repositories.idempotency import IdempotencyRepositorySqlAlchemy
+from src.application.ports.idempotency import StoredResponse
+from tests.integration.sqlalchemy.connect import get_nested_test_session
+
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+TTL = timedelta(days=1)
+
+
+@pytest_asyncio.fixture(name="repo")
+async def repo_f():
+    async with get_nested_test_session() as session:
+        yield IdempotencyRepositorySqlAlchemy(session)
+
+
+def response(body: bytes, created_at: datetime = NOW) -> StoredResponse:
+    return StoredResponse(fingerprint="f" * 64, status=201, body=body, created_at=created_at)
+
+
+@pytest.mark.asyncio
+async def test_first_response_wins(repo: IdempotencyRepositorySqlAlchemy):
+    assert await repo.get("key") is None
+
+    await repo.save("key", response(b"first"), expired_before=NOW - TTL)
+    await repo.save("key", response(b"second"), expired_before=NOW - TTL)
+
+    assert await repo.get("key") == response(b"first")
+
+
+@pytest.mark.asyncio
+async def test_expired_response_is_replaced_and_purged(repo: IdempotencyRepositorySqlAlchemy):
+    old = NOW - 2 * TTL
+    await repo.save("key", response(b"old", old), expired_before=old - TTL)
+    await repo.save("other key", response(b"old", old), expired_before=old - TTL)
+
+    await repo.save("key", response(b"new"), expired_before=NOW - TTL)
+
+    assert (await repo.get("key")).body == b"new"
+    assert await repo.get("other key") is None
+    assert await repo.session.scalar(select(func.count()).select_from(IdempotencyKeyModel)) == 1
@@ -0,0 +1,350 @@
+from datetime import timedelta
+from typing import Any, AsyncGenerator
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+from orjson import loads  # pylint: disable=E0611
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.sqlalchemy.repositories.quiz_normalized import (
+    QuizRepositoryNormalizedSqlAlchemy,
+    move_questions_to_tables,
+)
+from src.application.domain.exceptions import (
+    BaseCoreException,
+    ItemDataConflict,
+    ItemNotFound,
+    StaleItemVersion,
+)
+from src.adapters.sqlalchemy.models import AnswerModel, QuestionModel, QuizModel, SubjectModel
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+from src.application.quiz_admin import QuizDomainMapper
+from src.server import dumps
+from tests.integration.sqlalchemy.connect import get_nested_test_session
+
+
+JSONB_QUIZ_ID = UUID("00000000-0000-0000-0000-000000000001")
+SUBJECT = Subject(id=UUID("00000000-0000-0000-0000-000000000001"), name="subject1", description="subject1")
+
+
+def make_quiz(quiz_id: UUID, question_texts: list[str]) -> Quiz:
+    return Quiz(
+        id=quiz_id,
+        name=f"quiz {quiz_id}",
+        description="description",
+        _time=timedelta(minutes=10),
+        difficulty=Difficulty.MEDIUM,
+        subject=SUBJECT,
+        _questions=[
+            ChoiceQuestion(
+                id=UUID(int=quiz_id.int * 100 + position),
+                text=text,
+                _answers=[
+                    ChoiceAnswer(
+                        id=UUID(int=quiz_id.int * 1000 + position * 10), text="right", is_correct=True
+                    ),
+                    ChoiceAnswer(
+                        id=UUID(int=quiz_id.int * 1000 + position * 10 + 1), text="wrong", is_correct=False
+                    ),
+                ],
+            )
+            for position, text in enumerate(question_texts)
+        ],
+    )
+
+
+@pytest_asyncio.fixture(scope="function", name="normalized_repo")
+async def normalized_repo_f(
+    session_with_default_dataset: AsyncSession,
+) -> AsyncGenerator[QuizRepositoryNormalizedSqlAlchemy, Any]:
+    yield QuizRepositoryNormalizedSqlAlchemy(session_with_default_dataset)
+
+
+@pytest_asyncio.fixture(name="session_with_default_dataset", scope="function")
+async def session_with_default_dataset_f():
+    async with get_nested_test_session() as session:
+        session.add(SubjectModel(id=SUBJECT.id, name=SUBJECT.name, description=SUBJECT.description))
+        await session.flush()
+
+        # Квиз в старом формате, ещё не перенесённый бэкфиллом.
+        session.add(
+            QuizModel(
+                id=JSONB_QUIZ_ID,
+                name="quiz1",
+                description="quiz1",
+                time=timedelta(minutes=1),
+                difficulty=Difficulty.EASY,
+                subject_id=SUBJECT.id,
+                questions=[
+                    {
+                        "id": "00000000-0000-0000-0000-000000000001",
+                        "text": "question1",
+                        "answers": [
+                            {
+                                "id": "00000000-0000-0000-0000-000000000001",
+                                "text": "answer1",
+                                "is_correct": True,
+                            },
+                            {
+                                "id": "00000000-0000-0000-0000-000000000002",
+                                "text": "answer2",
+                                "is_correct": False,
+                            },
+                        ],
+                    },
+                    {
+                        "id": "00000000-0000-0000-0000-000000000002",
+                        "text": "question2",
+                        "answers": [
+                            {
+                                "id": "00000000-0000-0000-0000-000000000003",
+                                "text": "answer3",
+                                "is_correct": True,
+                            },
+                        ],
+                    },
+                ],
+            )
+        )
+        await session.commit()
+
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_add_one_writes_rows(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    quiz = make_quiz(UUID(int=2), ["a", "b"])
+    await normalized_repo.add_one(quiz)
+
+    persisted = await session_with_default_dataset.scalar(select(QuizModel).where(QuizModel.id == quiz.id))
+    assert persisted.questions is None
+    positions = await session_with_default_dataset.scalars(
+        select(QuestionModel.position)
+        .where(QuestionModel.quiz_id == quiz.id)
+        .order_by(QuestionModel.position)
+    )
+    assert list(positions) == [0, 1]
+    assert await normalized_repo.get_by_id(quiz.id) == quiz
+
+
+@pytest.mark.asyncio
+async def test_add_many(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    quizzes = [make_quiz(UUID(int=2), ["a"]), make_quiz(UUID(int=3), ["b", "c"])]
+    results = await normalized_repo.add_many(quizzes)
+    assert [result.error for result in results] == [None, None]
+    assert await normalized_repo.get_by_id(UUID(int=3)) == quizzes[1]
+
+
+@pytest.mark.asyncio
+async def test_add_many_bad_question_fails_its_quiz_only(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    quizzes = [make_quiz(UUID(int=2), ["a"]), make_quiz(UUID(int=3), ["b"])]
+    # Вопрос второго квиза с id вопроса первого: падает только второй квиз, вместе со своей строкой.
+    quizzes[1].questions[0].id = quizzes[0].questions[0].id
+
+    results = await normalized_repo.add_many(quizzes)
+
+    assert results[0].error is None
+    assert isinstance(results[1].error, BaseCoreException)
+    assert await normalized_repo.get_by_id(UUID(int=2)) == quizzes[0]
+    assert await session_with_default_dataset.scalar(
+        select(QuizModel.id).where(QuizModel.id == UUID(int=3))
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_reads_jsonb_quiz(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    quiz = await normalized_repo.get_by_id(JSONB_QUIZ_ID)
+    assert [question.text for question in quiz.questions] == ["question1", "question2"]
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_not_found(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    with pytest.raises(ItemNotFound):
+        await normalized_repo.get_by_id(UUID(int=100))
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_id_from_rows(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    quiz = make_quiz(UUID(int=2), ["a", "b"])
+    await normalized_repo.add_one(quiz)
+
+    document = loads(await normalized_repo.get_document_by_id(quiz.id))
+
+    assert document["time"] == 600
+    assert [question["id"] for question in document["questions"]] == [str(q.id) for q in quiz.questions]
+    assert document["questions"][0]["answers"] == [
+        {"id": str(answer.id), "text": answer.text, "is_correct": answer.is_correct}
+        for answer in quiz.questions[0].answers
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stored_in_rows", [True, False])
+async def test_document_matches_dto_response(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy, stored_in_rows: bool
+):
+    quiz_id = JSONB_QUIZ_ID
+    if stored_in_rows:
+        quiz_id = UUID(int=2)
+        await normalized_repo.add_one(make_quiz(quiz_id, ["a", "b"]))
+
+    document = await normalized_repo.get_document_by_id(quiz_id)
+
+    quiz = await normalized_repo.get_by_id(quiz_id)
+    dto_response = dumps(QuizDomainMapper().map_domain_object_to_dto(quiz))
+    assert loads(document) == loads(dto_response)
+    assert loads(document)["difficulty"] in {difficulty.value for difficulty in Difficulty}
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_id_from_jsonb(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    document = loads(await normalized_repo.get_document_by_id(JSONB_QUIZ_ID))
+    assert [question["text"] for question in document["questions"]] == ["question1", "question2"]
+
+
+@pytest.mark.asyncio
+async def test_get_summary_page_counts_rows(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    await normalized_repo.add_one(make_quiz(UUID(int=2), ["a", "b", "c"]))
+    summaries = await normalized_repo.get_summary_page(limit=10)
+    assert [summary.question_count for summary in summaries] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_update_one_touches_changed_rows_only(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    quiz = make_quiz(UUID(int=2), ["a", "b", "c"])
+    await normalized_repo.add_one(quiz)
+    updated = make_quiz(UUID(int=2), ["a", "b changed"])
+
+    await normalized_repo.update_one(quiz.id, updated)
+
+    assert await normalized_repo.get_by_id(quiz.id) == updated
+    question_count = await session_with_default_dataset.scalar(
+        select(func.count()).select_from(QuestionModel).where(QuestionModel.quiz_id == quiz.id)
+    )
+    assert question_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_one_with_question_of_another_quiz(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    other = make_quiz(UUID(int=2), ["other"])
+    await normalized_repo.add_one(other)
+    quiz = make_quiz(UUID(int=3), ["a"])
+    await normalized_repo.add_one(quiz)
+    updated = make_quiz(UUID(int=3), ["a"])
+    updated.questions[0].id = other.questions[0].id
+
+    with pytest.raises(ItemDataConflict):
+        await normalized_repo.update_one(quiz.id, updated)
+
+    assert await normalized_repo.get_by_id(other.id) == other
+
+
+@pytest.mark.asyncio
+async def test_update_question_keeps_answers_of_another_quiz(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy,
+):
+    other = make_quiz(UUID(int=2), ["other"])
+    await normalized_repo.add_one(other)
+    quiz = make_quiz(UUID(int=3), ["a"])
+    await normalized_repo.add_one(quiz)
+    question = quiz.questions[0]
+    question.answers = [ChoiceAnswer(id=other.questions[0].answers[0].id, text="stolen", is_correct=True)]
+
+    with pytest.raises(ItemDataConflict):
+        await normalized_repo.update_question(quiz.id, question)
+
+    assert await normalized_repo.get_by_id(other.id) == other
+
+
+@pytest.mark.asyncio
+async def test_update_one_moves_jsonb_quiz(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    updated = make_quiz(JSONB_QUIZ_ID, ["new"])
+    await normalized_repo.update_one(JSONB_QUIZ_ID, updated)
+
+    persisted = await session_with_default_dataset.scalar(
+        select(QuizModel).where(QuizModel.id == JSONB_QUIZ_ID)
+    )
+    assert persisted.questions is None
+    assert await normalized_repo.get_by_id(JSONB_QUIZ_ID) == updated
+
+
+@pytest.mark.asyncio
+async def test_get_and_update_question(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    quiz = make_quiz(UUID(int=2), ["a", "b"])
+    await normalized_repo.add_one(quiz)
+    question = quiz.questions[1]
+    question.text = "b changed"
+    question.answers = [ChoiceAnswer(id=question.answers[0].id, text="only", is_correct=True)]
+
+    await normalized_repo.update_question(quiz.id, question)
+
+    assert await normalized_repo.get_question(quiz.id, question.id) == question
+    assert (await normalized_repo.get_by_id(quiz.id)).questions[0] == quiz.questions[0]
+
+
+@pytest.mark.asyncio
+async def test_update_question_is_cas_on_quiz_version(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    quiz = make_quiz(UUID(int=2), ["a"])
+    await normalized_repo.add_one(quiz)
+    version = await normalized_repo.get_version(quiz.id)
+    question = quiz.questions[0]
+    question.text = "a changed"
+
+    await normalized_repo.update_question(quiz.id, question, expected_version=version)
+    assert await normalized_repo.get_version(quiz.id) == version + 1
+
+    question.text = "lost update"
+    with pytest.raises(StaleItemVersion):
+        await normalized_repo.update_question(quiz.id, question, expected_version=version)
+    assert (await normalized_repo.get_question(quiz.id, question.id)).text == "a changed"
+
+
+@pytest.mark.asyncio
+async def test_search_sees_question_rows(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    quiz = make_quiz(UUID(int=2), ["volcano", "glacier"])
+    await normalized_repo.add_one(quiz)
+    assert [hit.id for hit in await normalized_repo.search("volcano", limit=10)] == [quiz.id]
+
+    question = quiz.questions[0]
+    question.text = "desert"
+    await normalized_repo.update_question(quiz.id, question)
+
+    assert await normalized_repo.search("volcano", limit=10) == []
+    assert [hit.id for hit in await normalized_repo.search("desert", limit=10)] == [quiz.id]
+
+
+@pytest.mark.asyncio
+async def test_update_question_not_found(normalized_repo: QuizRepositoryNormalizedSqlAlchemy):
+    question = ChoiceQuestion(
+        id=UUID(int=100), text="x", _answers=[ChoiceAnswer(id=UUID(int=100), text="x", is_correct=True)]
+    )
+    with pytest.raises(ItemNotFound):
+        await normalized_repo.update_question(JSONB_QUIZ_ID, question)
+
+
+@pytest.mark.asyncio
+async def test_move_questions_to_tables(
+    normalized_repo: QuizRepositoryNormalizedSqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    before = await normalized_repo.get_by_id(JSONB_QUIZ_ID)
+
+    assert await move_questions_to_tables(session_with_default_dataset, [JSONB_QUIZ_ID]) == 1
+    # Повторный запуск ничего не делает.
+    assert await move_questions_to_tables(session_with_default_dataset, [JSONB_QUIZ_ID]) == 0
+
+    session_with_default_dataset.expunge_all()
+    assert await session_with_default_dataset.scalar(
+        select(QuizModel.questions).where(QuizModel.id == JSONB_QUIZ_ID)
+    ) is None
+    assert await session_with_default_dataset.scalar(select(func.count()).select_from(AnswerModel)) == 3
+    assert await normalized_repo.get_by_id(JSONB_QUIZ_ID) == before
@@ -4,13 +4,17 @@ from uuid import UUID
 
 import pytest
 import pytest_asyncio
+from orjson import loads  # pylint: disable=E0611
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.adapters.sqlalchemy.repositories.quiz import QuizRepositorySqlAlchemy
-from src.application.domain.exceptions import DuplicateItem, ItemNotFound
+from src.application.ports.quiz import QuizSummaryFilter
+from src.application.domain.exceptions import DuplicateItem, ItemNotFound, StaleItemVersion
 from src.adapters.sqlalchemy.models import QuizModel, SubjectModel
 from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+from src.application.quiz_admin import QuizDomainMapper
+from src.server import dumps
 from tests.integration.sqlalchemy.connect import get_nested_test_session
 
 
@@ -199,6 +203,140 @@ async def test_get_all(admin_repo: QuizRepositorySqlAlchemy):
     assert isinstance(quizzes_list[0], Quiz)
 
 
+@pytest.mark.asyncio
+async def test_get_by_id(admin_repo: QuizRepositorySqlAlchemy):
+    quiz = await admin_repo.get_by_id(UUID("00000000-0000-0000-0000-000000000001"))
+    assert isinstance(quiz, Quiz)
+    assert quiz.name == "quiz1"
+    assert quiz.subject.name == "subject1"
+    assert len(quiz.questions) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_not_found(admin_repo: QuizRepositorySqlAlchemy):
+    with pytest.raises(ItemNotFound):
+        await admin_repo.get_by_id(UUID("00000000-0000-0000-0000-000000000100"))
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_with_version(admin_repo: QuizRepositorySqlAlchemy):
+    quiz, version = await admin_repo.get_by_id_with_version(UUID("00000000-0000-0000-0000-000000000001"))
+    assert quiz.id == UUID("00000000-0000-0000-0000-000000000001")
+    assert version == 1
+    assert await admin_repo.get_version(quiz.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_document_version_follows_subject(
+    admin_repo: QuizRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    quiz_id = UUID("00000000-0000-0000-0000-000000000001")
+    assert await admin_repo.get_document_version(quiz_id) == (1, 1)
+    quiz_collection_version = await admin_repo.get_collection_version()
+
+    subject_id = UUID("00000000-0000-0000-0000-000000000001")
+    subject = await session_with_default_dataset.get(SubjectModel, subject_id)
+    subject.version += 1
+    subject.name = "renamed"
+    await session_with_default_dataset.flush()
+
+    assert await admin_repo.get_document_version(quiz_id) == (1, 2)
+    quiz, versions = await admin_repo.get_by_id_with_document_version(quiz_id)
+    assert versions == (1, 2)
+    assert quiz.subject.name == "renamed"
+    # Переименование предмета обновляет его квизы, а значит и версию списка квизов.
+    assert await admin_repo.get_collection_version() != quiz_collection_version
+
+
+@pytest.mark.asyncio
+async def test_get_version_not_found(admin_repo: QuizRepositorySqlAlchemy):
+    with pytest.raises(ItemNotFound):
+        await admin_repo.get_version(UUID("00000000-0000-0000-0000-000000000099"))
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_id(admin_repo: QuizRepositorySqlAlchemy):
+    document = loads(await admin_repo.get_document_by_id(UUID("00000000-0000-0000-0000-000000000001")))
+    assert document["name"] == "quiz1"
+    assert document["time"] == 60
+    assert document["difficulty"] == Difficulty.EASY
+    assert document["subject"]["name"] == "subject1"
+    assert [question["text"] for question in document["questions"]] == ["question1", "question2"]
+    assert document["questions"][0]["answers"][0] == {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "text": "answer1",
+        "is_correct": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_document_matches_dto_response(admin_repo: QuizRepositorySqlAlchemy):
+    quiz_id = UUID("00000000-0000-0000-0000-000000000001")
+    document = await admin_repo.get_document_by_id(quiz_id)
+    # То же, что отдаёт GET /quiz/<id>; порядок ключей у jsonb свой, поэтому сравниваются значения.
+    dto_response = dumps(QuizDomainMapper().map_domain_object_to_dto(await admin_repo.get_by_id(quiz_id)))
+    assert loads(document) == loads(dto_response)
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_id_not_found(admin_repo: QuizRepositorySqlAlchemy):
+    with pytest.raises(ItemNotFound):
+        await admin_repo.get_document_by_id(UUID("00000000-0000-0000-0000-000000000100"))
+
+
+@pytest.mark.asyncio
+async def test_get_summary_page(admin_repo: QuizRepositorySqlAlchemy):
+    summaries = await admin_repo.get_summary_page(limit=10)
+    assert len(summaries) == 1
+    assert summaries[0].name == "quiz1"
+    assert summaries[0].subject_name == "subject1"
+    assert summaries[0].question_count == 2
+
+    assert await admin_repo.get_summary_page(limit=10, after_id=summaries[0].id) == []
+
+
+@pytest.mark.parametrize(
+    "filters, found",
+    [
+        (QuizSummaryFilter(subject_id=UUID("00000000-0000-0000-0000-000000000001")), True),
+        (QuizSummaryFilter(subject_id=UUID("00000000-0000-0000-0000-000000000002")), False),
+        (QuizSummaryFilter(difficulty=Difficulty.EASY), True),
+        (QuizSummaryFilter(difficulty=Difficulty.HARD), False),
+        (QuizSummaryFilter(min_time=timedelta(minutes=1), max_time=timedelta(minutes=1)), True),
+        (QuizSummaryFilter(min_time=timedelta(minutes=2)), False),
+    ],
+)
+@pytest.mark.asyncio
+async def test_get_summary_page_filters(admin_repo: QuizRepositorySqlAlchemy, filters, found):
+    summaries = await admin_repo.get_summary_page(limit=10, filters=filters)
+    assert [summary.name for summary in summaries] == (["quiz1"] if found else [])
+
+
+@pytest.mark.asyncio
+async def test_search(admin_repo: QuizRepositorySqlAlchemy):
+    # Имя, предмет и текст вопроса из JSONB попадают в search_vector триггером.
+    for search_text in ("quiz1", "subject1", "question2"):
+        hits = await admin_repo.search(search_text, limit=10)
+        assert [hit.id for hit in hits] == [UUID("00000000-0000-0000-0000-000000000001")]
+        assert hits[0].subject_name == "subject1"
+        assert hits[0].rank > 0
+
+    assert await admin_repo.search("nothing", limit=10) == []
+    assert await admin_repo.search("quiz1", limit=10, after=(hits[0].rank, hits[0].id)) == []
+
+
+@pytest.mark.asyncio
+async def test_search_follows_subject_rename(
+    admin_repo: QuizRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    subject = await session_with_default_dataset.get(SubjectModel, UUID(int=1))
+    subject.name = "geography"
+    await session_with_default_dataset.flush()
+
+    assert len(await admin_repo.search("geography", limit=10)) == 1
+    assert await admin_repo.search("subject1", limit=10) == []
+
+
 @pytest.mark.asyncio
 async def test_update_one(admin_repo: QuizRepositorySqlAlchemy, session_with_default_dataset: AsyncSession):
     updated_quiz = Quiz(
@@ -236,6 +374,7 @@ async def test_update_one(admin_repo: QuizRepositorySqlAlchemy, session_with_def
     assert result is not None
     assert result.name == updated_quiz.name
     assert result.description == updated_quiz.description
+    assert result.version == 2
 
 
 @pytest.mark.asyncio
@@ -298,6 +437,30 @@ async def test_update_one_not_found_foreign_key(admin_repo: QuizRepositorySqlAlc
         await admin_repo.update_one(updated_quiz.id, updated_quiz)
 
 
+@pytest.mark.asyncio
+async def test_get_and_update_question(admin_repo: QuizRepositorySqlAlchemy):
+    quiz_id = UUID("00000000-0000-0000-0000-000000000001")
+    question = await admin_repo.get_question(quiz_id, UUID("00000000-0000-0000-0000-000000000002"))
+    question.text = "question2 changed"
+
+    await admin_repo.update_question(quiz_id, question, expected_version=1)
+
+    assert await admin_repo.get_question(quiz_id, question.id) == question
+    assert (await admin_repo.get_by_id(quiz_id)).questions[0].text == "question1"
+    assert await admin_repo.get_version(quiz_id) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_question_stale_version(admin_repo: QuizRepositorySqlAlchemy):
+    quiz_id = UUID("00000000-0000-0000-0000-000000000001")
+    question = await admin_repo.get_question(quiz_id, UUID("00000000-0000-0000-0000-000000000001"))
+    question.text = "lost update"
+
+    with pytest.raises(StaleItemVersion):
+        await admin_repo.update_question(quiz_id, question, expected_version=5)
+    assert (await admin_repo.get_question(quiz_id, question.id)).text == "question1"
+
+
 @pytest.mark.asyncio
 async def test_delete_one(admin_repo: QuizRepositorySqlAlchemy, session_with_default_dataset: AsyncSession):
     quiz_id = UUID("00000000-0000-0000-0000-000000000001")
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.adapters.sqlalchemy.models import QuizModel
+from src.adapters.sqlalchemy.repositories.quiz_result import QuizResultRepositorySqlAlchemy
+from src.application.domain.attempt import Attempt
+from src.application.domain.quiz import Difficulty
+from tests.integration.sqlalchemy.test_attempt_repo import (  # pylint: disable=W0611
+    QUIZ_ID,
+    STARTED_AT,
+    session_with_default_dataset_f,
+)
+
+
+@pytest.fixture(name="result_repo")
+def result_repo_f(session_with_default_dataset: AsyncSession):
+    return QuizResultRepositorySqlAlchemy(session_with_default_dataset)
+
+
+def finished_attempt(attempt_id: int, score: int) -> Attempt:
+    return Attempt(
+        id=UUID(int=attempt_id),
+        quiz_id=QUIZ_ID,
+        quiz_version=1,
+        user_id=7,
+        started_at=STARTED_AT,
+        deadline=STARTED_AT + timedelta(minutes=1),
+        question_count=2,
+        finished_at=STARTED_AT + timedelta(seconds=attempt_id),
+        score=score,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollup_adds_up_attempts(result_repo: QuizResultRepositorySqlAlchemy):
+    await result_repo.add_finished_attempt(finished_attempt(10, score=2))
+    await result_repo.add_finished_attempt(finished_attempt(11, score=1))
+
+    [quiz_result] = await result_repo.get_quiz_page(10)
+    assert quiz_result.id == QUIZ_ID
+    assert quiz_result.attempt_count == 2
+    assert quiz_result.average_score == 1.5
+    assert quiz_result.average_correct_ratio == 0.75
+
+    [subject_result] = await result_repo.get_by_subject()
+    assert (subject_result.attempt_count, subject_result.average_score) == (2, 1.5)
+    assert await result_repo.get_quiz_page(10, after_id=QUIZ_ID) == []
+
+
+@pytest.mark.asyncio
+async def test_rollup_keeps_difficulty_at_finish_time(
+    result_repo: QuizResultRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    await result_repo.add_finished_attempt(finished_attempt(10, score=2))
+    await session_with_default_dataset.execute(
+        update(QuizModel).where(QuizModel.id == QUIZ_ID).values(difficulty=Difficulty.HARD)
+    )
+    await result_repo.add_finished_attempt(finished_attempt(11, score=0))
+
+    by_difficulty = {row.difficulty: row for row in await result_repo.get_by_difficulty()}
+    assert by_difficulty[Difficulty.EASY].average_score == 2.0
+    assert by_difficulty[Difficulty.HARD].average_score == 0.0
+    [quiz_result] = await result_repo.get_quiz_page(10)
+    assert quiz_result.attempt_count == 2
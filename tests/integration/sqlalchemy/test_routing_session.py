@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.adapters.sqlalchemy.routing import PIN_PRIMARY, RoutingSession
+from src.adapters.sqlalchemy.uow import SqlAlchemyUnitOfWork
+from tests.config import (
+    TEST_POSTGRE_DB_NAME,
+    TEST_POSTGRE_HOST,
+    TEST_POSTGRE_PASSWORD,
+    TEST_POSTGRE_PORT,
+    TEST_POSTGRE_USERNAME,
+)
+from tests.integration.sqlalchemy.connect import engine
+
+
+# Вместо реплики — служебная база того же сервера: по current_database() видно, куда ушёл запрос.
+REPLICA_DB_NAME = "postgres"
+
+
+@pytest.fixture(name="session_maker")
+def session_maker_f():
+    replica = create_async_engine(
+        f"postgresql+asyncpg://{TEST_POSTGRE_USERNAME}:{TEST_POSTGRE_PASSWORD}@"
+        f"{TEST_POSTGRE_HOST}:{TEST_POSTGRE_PORT}/{REPLICA_DB_NAME}"
+    )
+    return sessionmaker(
+        class_=AsyncSession, sync_session_class=RoutingSession, primary=engine, replica=replica
+    )
+
+
+async def current_database(uow: SqlAlchemyUnitOfWork) -> str:
+    return await uow.async_session.scalar(text("SELECT current_database()"))
+
+
+@pytest.mark.asyncio
+async def test_read_only_uow_reads_replica(session_maker):
+    uow = SqlAlchemyUnitOfWork(session_maker())
+    async with uow.read_only():
+        assert await current_database(uow) == REPLICA_DB_NAME
+    async with uow:
+        assert await current_database(uow) == TEST_POSTGRE_DB_NAME
+
+
+@pytest.mark.asyncio
+async def test_pinned_session_reads_primary(session_maker):
+    session = session_maker()
+    session.info[PIN_PRIMARY] = True
+    uow = SqlAlchemyUnitOfWork(session)
+    async with uow.read_only():
+        assert await current_database(uow) == TEST_POSTGRE_DB_NAME
@@ -3,11 +3,13 @@ from uuid import UUID
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.adapters.sqlalchemy.repositories.subject import SubjectRepositorySqlAlchemy
-from src.application.domain.exceptions import DuplicateItem, ItemNotFound
+from src.adapters.sqlalchemy.mappers import SubjectSQLAlchemyMapper
+from src.adapters.sqlalchemy.repositories.quiz_admin_repo import AdminRepositorySqlAlchemy
+from src.application.domain.exceptions import DuplicateItem, ItemNotFound, StaleItemVersion, UnprocessableItem
 from src.adapters.sqlalchemy.models import SubjectModel
 from src.application.domain.quiz import Subject
 from tests.integration.sqlalchemy.connect import get_nested_test_session
@@ -72,6 +74,65 @@ async def test_add_one_duplicate(admin_repo: SubjectRepositorySqlAlchemy):
         await admin_repo.add_one(duplicate_subject)
 
 
+@pytest.mark.asyncio
+async def test_add_many_success(
+    admin_repo: SubjectRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    new_subjects = [
+        Subject(id=UUID(f"00000000-0000-0000-0000-00000000000{i}"), name=f"subject{i}", description="")
+        for i in range(3, 6)
+    ]
+
+    results = await admin_repo.add_many(new_subjects)
+    assert [result.id for result in results] == [subject.id for subject in new_subjects]
+    assert all(result.error is None for result in results)
+
+    persisted = await session_with_default_dataset.scalars(
+        select(SubjectModel).where(SubjectModel.id.in_([subject.id for subject in new_subjects]))
+    )
+    assert len(list(persisted)) == 3
+
+
+@pytest.mark.asyncio
+async def test_add_many_reports_errors_per_item(
+    admin_repo: SubjectRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    new_subjects = [
+        Subject(id=UUID("00000000-0000-0000-0000-000000000003"), name="subject3", description=""),
+        Subject(id=UUID("00000000-0000-0000-0000-000000000001"), name="duplicate", description=""),
+        Subject(id=UUID("00000000-0000-0000-0000-000000000004"), name="subject4", description=""),
+    ]
+
+    results = await admin_repo.add_many(new_subjects)
+    assert results[0].id == new_subjects[0].id
+    assert isinstance(results[1].error, DuplicateItem)
+    assert results[2].id == new_subjects[2].id
+
+    persisted = await session_with_default_dataset.scalars(
+        select(SubjectModel.id).where(SubjectModel.id.in_([new_subjects[0].id, new_subjects[2].id]))
+    )
+    assert len(list(persisted)) == 2
+
+
+@pytest.mark.asyncio
+async def test_add_many_with_copy(session_with_default_dataset: AsyncSession):
+    admin_repo = AdminRepositorySqlAlchemy(
+        model=SubjectModel,
+        model_key_field=SubjectModel.id,
+        session=session_with_default_dataset,
+        dict_mapper=SubjectSQLAlchemyMapper(),
+        copy_threshold=1,
+    )
+    new_subjects = [
+        Subject(id=UUID("00000000-0000-0000-0000-000000000003"), name="subject3", description=""),
+        Subject(id=UUID("00000000-0000-0000-0000-000000000001"), name="duplicate", description=""),
+    ]
+
+    results = await admin_repo.add_many(new_subjects)
+    assert results[0].id == new_subjects[0].id
+    assert isinstance(results[1].error, DuplicateItem)
+
+
 @pytest.mark.asyncio
 async def test_get_all(admin_repo: SubjectRepositorySqlAlchemy):
     subjects = await admin_repo.get_all()
@@ -81,6 +142,17 @@ async def test_get_all(admin_repo: SubjectRepositorySqlAlchemy):
     assert isinstance(subjects_list[0], Subject)
 
 
+@pytest.mark.asyncio
+async def test_get_page(admin_repo: SubjectRepositorySqlAlchemy):
+    first_page = await admin_repo.get_page(limit=1)
+    assert [subject.id for subject in first_page] == [UUID("00000000-0000-0000-0000-000000000001")]
+
+    second_page = await admin_repo.get_page(limit=1, after_id=first_page[-1].id)
+    assert [subject.id for subject in second_page] == [UUID("00000000-0000-0000-0000-000000000002")]
+
+    assert await admin_repo.get_page(limit=1, after_id=second_page[-1].id) == []
+
+
 @pytest.mark.asyncio
 async def test_update_one(
     admin_repo: SubjectRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
@@ -100,6 +172,76 @@ async def test_update_one(
     assert result is not None
     assert result.name == updated_subject.name
     assert result.description == updated_subject.description
+    assert result.version == 2
+
+
+@pytest.mark.asyncio
+async def test_add_one_if_absent_is_idempotent(
+    admin_repo: SubjectRepositorySqlAlchemy, session_with_default_dataset: AsyncSession
+):
+    subject = Subject(id=UUID("00000000-0000-0000-0000-000000000100"), name="retried", description="")
+    assert await admin_repo.add_one_if_absent(subject) == str(subject.id)
+
+    # Повтор той же вставки ничего не пишет и отдаёт тот же id.
+    assert await admin_repo.add_one_if_absent(subject) == str(subject.id)
+    count = await session_with_default_dataset.scalar(
+        select(func.count()).select_from(SubjectModel).where(SubjectModel.id == subject.id)
+    )
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_add_one_if_absent_with_other_values(admin_repo: SubjectRepositorySqlAlchemy):
+    subject_id = UUID("00000000-0000-0000-0000-000000000100")
+    await admin_repo.add_one_if_absent(Subject(id=subject_id, name="retried", description=""))
+
+    # Тот же ключ с другим телом (ответ уже просрочен или параллельный запрос) не должен пройти молча.
+    with pytest.raises(UnprocessableItem):
+        await admin_repo.add_one_if_absent(Subject(id=subject_id, name="another", description=""))
+
+    subject, _ = await admin_repo.get_by_id_with_version(subject_id)
+    assert subject.name == "retried"
+
+
+@pytest.mark.asyncio
+async def test_update_one_compare_and_swap(admin_repo: SubjectRepositorySqlAlchemy):
+    subject_id = UUID("00000000-0000-0000-0000-000000000001")
+    subject, version = await admin_repo.get_by_id_with_version(subject_id)
+    subject.name = "first writer"
+    await admin_repo.update_one(subject_id, subject, expected_version=version)
+
+    # Второй писатель читал ту же версию и не должен затереть первого.
+    subject.name = "second writer"
+    with pytest.raises(StaleItemVersion):
+        await admin_repo.update_one(subject_id, subject, expected_version=version)
+
+    subject, new_version = await admin_repo.get_by_id_with_version(subject_id)
+    assert subject.name == "first writer"
+    assert new_version == version + 1
+
+    missing = Subject(id=UUID("00000000-0000-0000-0000-000000000100"), name="missing", description="")
+    with pytest.raises(ItemNotFound):
+        await admin_repo.update_one(missing.id, missing, expected_version=1)
+
+
+@pytest.mark.asyncio
+async def test_collection_version_changes_on_write(admin_repo: SubjectRepositorySqlAlchemy):
+    before = await admin_repo.get_collection_version()
+    assert await admin_repo.get_collection_version() == before
+
+    subject = Subject(id=UUID("00000000-0000-0000-0000-000000000100"), name="new", description="new")
+    await admin_repo.add_one(subject)
+    after_insert = await admin_repo.get_collection_version()
+    assert after_insert != before
+
+    subject.name = "renamed"
+    await admin_repo.update_one(subject.id, subject)
+    after_update = await admin_repo.get_collection_version()
+    assert after_update[0] == after_insert[0]
+    assert after_update[1] > after_insert[1]
+
+    await admin_repo.delete_one(subject.id)
+    assert await admin_repo.get_collection_version() not in (after_insert, after_update)
 
 
 @pytest.mark.asyncio
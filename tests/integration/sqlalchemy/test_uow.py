@@ -0,0 +1,58 @@
+from uuid import uuid4
+import pytest
+from sqlalchemy import func, select, text
+
+from src.adapters.sqlalchemy.models import SubjectModel
+from src.adapters.sqlalchemy.uow import SqlAlchemyUnitOfWork
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.ports.uow import IsolationLevel
+from tests.integration.sqlalchemy.connect import async_sessionmaker
+
+
+@pytest.mark.asyncio
+async def test_failed_savepoint_keeps_outer_transaction():
+    uow = SqlAlchemyUnitOfWork(async_sessionmaker())
+    session = uow.async_session
+    kept_id, dropped_id = uuid4(), uuid4()
+    callbacks = []
+
+    async with uow:
+        session.add(SubjectModel(id=kept_id, name=f"kept {kept_id}", description=""))
+        uow.on_commit(lambda: callbacks.append("kept"))
+        with pytest.raises(ZeroDivisionError):
+            async with uow.savepoint():
+                session.add(SubjectModel(id=dropped_id, name=f"dropped {dropped_id}", description=""))
+                uow.on_commit(lambda: callbacks.append("dropped"))
+                await session.flush()
+                raise ZeroDivisionError
+        await uow.commit()
+
+    async with uow:
+        count = await session.scalar(
+            select(func.count()).select_from(SubjectModel).where(SubjectModel.id.in_([kept_id, dropped_id]))
+        )
+    assert count == 1
+    assert callbacks == ["kept"]
+
+
+@pytest.mark.asyncio
+async def test_data_error_in_savepoint_is_a_core_exception():
+    uow = SqlAlchemyUnitOfWork(async_sessionmaker())
+    session = uow.async_session
+
+    async with uow:
+        with pytest.raises(UnprocessableItem):
+            async with uow.savepoint():
+                session.add(SubjectModel(id=uuid4(), name="x" * 256, description=""))
+                await session.flush()
+        assert await session.scalar(text("SELECT 1")) == 1
+        await uow.rollback()
+
+
+@pytest.mark.asyncio
+async def test_isolation_level_applies_to_one_block():
+    uow = SqlAlchemyUnitOfWork(async_sessionmaker())
+    async with uow.with_isolation(IsolationLevel.SERIALIZABLE):
+        assert await uow.async_session.scalar(text("SHOW transaction_isolation")) == "serializable"
+    async with uow:
+        assert await uow.async_session.scalar(text("SHOW transaction_isolation")) == "read committed"
@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.adapters.inmemory.attempt_state import InMemoryAttemptStateStore, WriteBehindAttemptStateStore
+from src.application.ports.attempt_state import AnswerEvent, Durability
+
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class CountingStore(InMemoryAttemptStateStore):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+        self.fail = False
+
+    async def save_answers(self, events):
+        if self.fail:
+            raise ConnectionError("database is down")
+        self.writes.append(list(events))
+        await super().save_answers(events)
+
+
+def answer(attempt_id, question_id, answer_id, seconds=0):
+    return AnswerEvent(attempt_id, question_id, frozenset([answer_id]), NOW + timedelta(seconds=seconds))
+
+
+@pytest.fixture(name="backend")
+def backend_f():
+    return CountingStore()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_keeps_latest_answer():
+    store = InMemoryAttemptStateStore()
+    attempt_id, question_id = uuid4(), uuid4()
+    newer, older = uuid4(), uuid4()
+
+    await store.save_answers([answer(attempt_id, question_id, newer, seconds=2)])
+    await store.save_answers([answer(attempt_id, question_id, older, seconds=1)])
+
+    assert await store.get_answers(attempt_id) == {question_id: frozenset([newer])}
+    assert await store.get_answers(uuid4()) == {}
+
+
+@pytest.mark.asyncio
+async def test_sync_mode_writes_through(backend):
+    store = WriteBehindAttemptStateStore(backend, durability=Durability.SYNC, batch_size=100)
+    await store.save_answers([answer(uuid4(), uuid4(), uuid4())])
+    assert len(backend.writes) == 1
+
+
+@pytest.mark.asyncio
+async def test_buffered_mode_writes_one_batch(backend):
+    store = WriteBehindAttemptStateStore(backend, durability=Durability.BUFFERED, batch_size=3)
+    attempt_id, question_id = uuid4(), uuid4()
+    final_answer = uuid4()
+
+    await store.save_answers([answer(attempt_id, question_id, uuid4())])
+    await store.save_answers([answer(attempt_id, question_id, final_answer, seconds=1)])
+    await store.save_answers([answer(attempt_id, uuid4(), uuid4())])
+    assert not backend.writes
+    # Буферизованные ответы видны до сброса.
+    assert (await store.get_answers(attempt_id))[question_id] == frozenset([final_answer])
+
+    await store.save_answers([answer(uuid4(), uuid4(), uuid4())])
+    assert len(backend.writes) == 1
+    assert len(backend.writes[0]) == 3
+    assert (await backend.get_answers(attempt_id))[question_id] == frozenset([final_answer])
+    assert await store.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_answers(backend):
+    store = WriteBehindAttemptStateStore(backend, durability=Durability.BUFFERED, batch_size=100)
+    attempt_id, question_id, answer_id = uuid4(), uuid4(), uuid4()
+    await store.save_answers([answer(attempt_id, question_id, answer_id)])
+
+    backend.fail = True
+    with pytest.raises(ConnectionError):
+        await store.flush()
+    assert await store.get_answers(attempt_id) == {question_id: frozenset([answer_id])}
+
+    backend.fail = False
+    assert await store.flush() == 1
+    assert await backend.get_answers(attempt_id) == {question_id: frozenset([answer_id])}
+
+
+@pytest.mark.asyncio
+async def test_flusher_writes_by_interval(backend):
+    store = WriteBehindAttemptStateStore(backend, durability=Durability.BUFFERED, batch_size=100)
+    await store.save_answers([answer(uuid4(), uuid4(), uuid4())])
+
+    flusher = asyncio.create_task(store.run_flusher(0.01))
+    await asyncio.sleep(0.05)
+    flusher.cancel()
+
+    assert len(backend.writes) == 1
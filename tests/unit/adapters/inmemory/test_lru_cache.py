@@ -0,0 +1,77 @@
+import pytest
+
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
+
+
+class FakeClock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def clock_f():
+    return FakeClock()
+
+
+@pytest.fixture(name="cache")
+def cache_f(clock):
+    return VersionedLRUCache(max_size=2, ttl=10, clock=clock)
+
+
+def test_get_miss_then_hit(cache):
+    assert cache.get("a") is None
+    cache.put("a", 1, cache.version())
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+
+def test_evicts_least_recently_used(cache):
+    cache.put("a", 1, cache.version())
+    cache.put("b", 2, cache.version())
+    cache.get("a")
+    cache.put("c", 3, cache.version())
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_expires_after_ttl(cache, clock):
+    cache.put("a", 1, cache.version())
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+
+
+def test_invalidate_removes_entry(cache):
+    cache.put("a", 1, cache.version())
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.stats().invalidations == 1
+
+
+def test_put_with_stale_version_is_ignored(cache):
+    version = cache.version()
+    cache.invalidate("a")
+    cache.put("a", "stale", version)
+    assert cache.get("a") is None
+
+    cache.put("a", "fresh", cache.version())
+    assert cache.get("a") == "fresh"
+
+
+def test_put_is_conservative_for_forgotten_invalidations(cache):
+    version = cache.version()
+    for key in ("a", "b", "c"):
+        cache.invalidate(key)
+
+    # "a" вытеснен из истории инвалидаций, но старую версию всё равно не примем.
+    cache.put("a", "stale", version)
+    assert cache.get("a") is None
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from enum import Enum
+from typing import Optional
+from uuid import UUID, uuid4
+
+from src.adapters.sqlalchemy.converters import ConverterRegistry
+from src.adapters.sqlalchemy.mappers import convert_dataclass_to_dict, convert_dict_to_serializable
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Base:
+    id: UUID
+
+
+@dataclass
+class Child(Base):
+    _color: Color
+    duration: timedelta
+    parent_id: Optional[UUID]
+
+
+@dataclass
+class Holder:
+    items: list[Base]
+
+
+def make_quiz() -> Quiz:
+    return Quiz(
+        id=uuid4(),
+        name="Quiz",
+        description="Quiz",
+        _time=timedelta(minutes=5),
+        difficulty=Difficulty.EASY,
+        subject=Subject(id=uuid4(), name="Subject", description="Subject"),
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Question",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            )
+        ],
+    )
+
+
+def test_dict_converter_matches_generic_function():
+    quiz = make_quiz()
+    assert ConverterRegistry(serializable=False).convert(quiz) == convert_dataclass_to_dict(quiz)
+
+
+def test_serializable_converter_matches_generic_functions():
+    quiz = make_quiz()
+    expected = convert_dict_to_serializable(convert_dataclass_to_dict(quiz.questions))
+    assert ConverterRegistry(serializable=True).convert(quiz.questions) == expected
+
+
+def test_nested_dataclass_uses_runtime_class():
+    child = Child(id=uuid4(), _color=Color.RED, duration=timedelta(seconds=90), parent_id=None)
+    result = ConverterRegistry(serializable=True).convert(Holder(items=[child]))
+    assert result == {
+        "items": [{"id": str(child.id), "color": "red", "duration": 90.0, "parent_id": None}]
+    }
+
+
+def test_converter_is_built_once_per_class():
+    registry = ConverterRegistry(serializable=False)
+    assert registry.converter_for(Subject) is registry.converter_for(Subject)
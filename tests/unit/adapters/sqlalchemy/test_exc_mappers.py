@@ -0,0 +1,71 @@
+import pytest
+from asyncpg.exceptions import (
+    CheckViolationError,
+    DataError,
+    SerializationError,
+    StringDataRightTruncationError,
+    UniqueViolationError,
+)
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from src.adapters.sqlalchemy.exc_mappers import is_item_data_error, sqlalchemy_item_error_mapper
+from src.application.domain.exceptions import DuplicateItem, ItemDataConflict, UnprocessableItem
+
+
+class FakeDriverError(Exception):
+    """Like the asyncpg adapter's errors: pgcode of the asyncpg exception it was raised from."""
+
+    def __init__(self, cause: Exception):
+        super().__init__(str(cause))
+        self.pgcode = getattr(cause, "sqlstate", None)
+        self.__cause__ = cause
+
+
+def wrap(cause: Exception, error_class=DBAPIError) -> DBAPIError:
+    return error_class("INSERT INTO subject ...", {}, FakeDriverError(cause))
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (wrap(CheckViolationError("check"), IntegrityError), True),
+        (wrap(StringDataRightTruncationError("value too long")), True),
+        (wrap(DataError("invalid input for query argument $1")), True),
+        (StringDataRightTruncationError("value too long from COPY"), True),
+        (wrap(SerializationError("could not serialize access")), False),
+        (RuntimeError("connection lost"), False),
+        (None, False),
+    ],
+)
+def test_item_data_errors(error, expected):
+    assert is_item_data_error(error) is expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error, core_exception",
+    [
+        (wrap(CheckViolationError("new row violates check constraint"), IntegrityError), ItemDataConflict),
+        (wrap(StringDataRightTruncationError("value too long")), UnprocessableItem),
+        (wrap(DataError("invalid input for query argument $3")), UnprocessableItem),
+    ],
+)
+async def test_item_errors_become_core_exceptions(error, core_exception):
+    with pytest.raises(core_exception) as raised:
+        await sqlalchemy_item_error_mapper(error)
+    assert raised.value.detail == str(error.orig.__cause__)
+
+
+@pytest.mark.asyncio
+async def test_mapped_codes_keep_their_exceptions():
+    cause = UniqueViolationError("duplicate key")
+    cause.detail, cause.table_name = "Key (id) already exists.", "subject"
+    with pytest.raises(DuplicateItem):
+        await sqlalchemy_item_error_mapper(wrap(cause, IntegrityError))
+
+
+@pytest.mark.asyncio
+async def test_transaction_errors_are_not_mapped():
+    error = wrap(SerializationError("could not serialize access"))
+    with pytest.raises(DBAPIError):
+        await sqlalchemy_item_error_mapper(error)
@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.adapters.sqlalchemy.instrumentation import (
+    EXPLAIN_OPERATION,
+    QUERY_DURATION,
+    UNKNOWN_OPERATION,
+    db_operation,
+    instrument_engine,
+    track_operations,
+)
+
+
+@track_operations("fake")
+class FakeRepository:
+    def __init__(self):
+        self.seen = []
+
+    async def outer(self):
+        self.seen.append(db_operation.get())
+        await self.inner()
+
+    async def inner(self):
+        self.seen.append(db_operation.get())
+
+    async def _private(self):
+        self.seen.append(db_operation.get())
+
+
+@pytest.mark.asyncio
+async def test_outermost_repository_method_names_the_operation():
+    repository = FakeRepository()
+
+    await repository.outer()
+    await repository.inner()
+    await repository._private()
+
+    assert repository.seen == ["fake.outer", "fake.outer", "fake.inner", None]
+    assert db_operation.get() is None
+
+
+def test_engine_statements_are_observed_by_operation():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    before_named = QUERY_DURATION.count(("fake.select",))
+    before_unknown = QUERY_DURATION.count((UNKNOWN_OPERATION,))
+
+    token = db_operation.set("fake.select")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("select 1"))
+            with pytest.raises(Exception):
+                connection.execute(text("select * from missing_table"))
+    finally:
+        db_operation.reset(token)
+    with engine.connect() as connection:
+        connection.execute(text("select 1"))
+
+    assert QUERY_DURATION.count(("fake.select",)) == before_named + 1
+    assert QUERY_DURATION.count((UNKNOWN_OPERATION,)) == before_unknown + 1
+
+
+def test_query_log_explains_are_not_observed():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    token = db_operation.set(EXPLAIN_OPERATION)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("select 1"))
+    finally:
+        db_operation.reset(token)
+
+    assert QUERY_DURATION.count((EXPLAIN_OPERATION,)) == 0
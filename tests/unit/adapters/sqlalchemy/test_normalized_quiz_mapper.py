@@ -0,0 +1,113 @@
+from uuid import UUID
+from datetime import timedelta
+import pytest
+from src.application.domain.quiz import Quiz, Subject, ChoiceQuestion, ChoiceAnswer, Difficulty
+from src.adapters.sqlalchemy.models import AnswerModel, QuestionModel, QuizModel, SubjectModel
+from src.adapters.sqlalchemy.mappers import NormalizedQuizSQLAlchemyMapper
+
+
+@pytest.fixture(name="quiz_mapper")
+def quiz_mapper_f():
+    return NormalizedQuizSQLAlchemyMapper()
+
+
+@pytest.fixture(name="sample_quiz")
+def sample_quiz_f():
+    return Quiz(
+        id=UUID("11223344-5566-7788-99aa-bbccddee0011"),
+        name="Physics Quiz",
+        description="Advanced physics test",
+        _time=timedelta(hours=1),
+        difficulty=Difficulty.HARD,
+        subject=Subject(
+            id=UUID("87654321-8765-4321-8765-432187654321"),
+            name="Physics",
+            description="Fundamental physics principles",
+        ),
+        _questions=[
+            ChoiceQuestion(
+                id=UUID("aabbccdd-eeff-0011-2233-445566778899"),
+                text="What is the speed of light?",
+                _answers=[
+                    ChoiceAnswer(
+                        id=UUID("99999999-9999-9999-9999-999999999999"),
+                        text="299,792,458 m/s",
+                        is_correct=True,
+                    ),
+                    ChoiceAnswer(
+                        id=UUID("88888888-8888-8888-8888-888888888888"),
+                        text="300,000,000 m/s",
+                        is_correct=False,
+                    ),
+                ],
+            ),
+            ChoiceQuestion(
+                id=UUID("11223344-5566-7788-99aa-bbccddee1122"),
+                text="Who developed the theory of relativity?",
+                _answers=[
+                    ChoiceAnswer(
+                        id=UUID("66666666-6666-6666-6666-666666666666"),
+                        text="Albert Einstein",
+                        is_correct=True,
+                    ),
+                ],
+            ),
+        ],
+    )
+
+
+def make_quiz_model(quiz: Quiz, **kwargs) -> QuizModel:
+    return QuizModel(
+        id=quiz.id,
+        name=quiz.name,
+        description=quiz.description,
+        time=quiz.time,
+        difficulty=quiz.difficulty,
+        subject_id=quiz.subject.id,
+        subject=SubjectModel(
+            id=quiz.subject.id, name=quiz.subject.name, description=quiz.subject.description
+        ),
+        **kwargs,
+    )
+
+
+def test_domain_to_dict_drops_questions(quiz_mapper: NormalizedQuizSQLAlchemyMapper, sample_quiz: Quiz):
+    result = quiz_mapper.domain_to_dict(sample_quiz)
+    assert result["questions"] is None
+    assert result["subject_id"] == sample_quiz.subject.id
+
+
+def test_questions_to_rows(quiz_mapper: NormalizedQuizSQLAlchemyMapper, sample_quiz: Quiz):
+    question_rows, answer_rows = quiz_mapper.questions_to_rows(sample_quiz)
+    assert [row["position"] for row in question_rows] == [0, 1]
+    assert all(row["quiz_id"] == sample_quiz.id for row in question_rows)
+    assert [(row["question_id"], row["position"]) for row in answer_rows] == [
+        (sample_quiz.questions[0].id, 0),
+        (sample_quiz.questions[0].id, 1),
+        (sample_quiz.questions[1].id, 0),
+    ]
+
+
+def test_model_to_domain_from_rows(quiz_mapper: NormalizedQuizSQLAlchemyMapper, sample_quiz: Quiz):
+    question_rows, answer_rows = quiz_mapper.questions_to_rows(sample_quiz)
+    questions = [QuestionModel(**row) for row in question_rows]
+    for question in questions:
+        question.answers = [AnswerModel(**row) for row in answer_rows if row["question_id"] == question.id]
+    model = make_quiz_model(sample_quiz, questions=None, normalized_questions=questions)
+
+    assert quiz_mapper.model_to_domain(model) == sample_quiz
+
+
+def test_model_to_domain_from_jsonb(quiz_mapper: NormalizedQuizSQLAlchemyMapper, sample_quiz: Quiz):
+    model = make_quiz_model(
+        sample_quiz,
+        questions=[
+            {
+                "id": str(q.id),
+                "text": q.text,
+                "answers": [{"id": str(a.id), "text": a.text, "is_correct": a.is_correct} for a in q.answers],
+            }
+            for q in sample_quiz.questions
+        ],
+    )
+    assert quiz_mapper.model_to_domain(model) == sample_quiz
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from src.adapters.sqlalchemy.pool import InstrumentedAsyncQueuePool
+
+
+class FakeDBAPIConnection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_pool() -> InstrumentedAsyncQueuePool:
+    return InstrumentedAsyncQueuePool(FakeDBAPIConnection, pool_size=1, max_overflow=0, timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_stats_track_checked_out_and_idle():
+    pool = make_pool()
+
+    def use_pool():
+        connection = pool.connect()
+        in_use = pool.stats()
+        connection.close()
+        return in_use, pool.stats()
+
+    in_use, released = await greenlet_spawn(use_pool)
+
+    assert (in_use.checked_out, in_use.idle) == (1, 0)
+    assert (released.checked_out, released.idle) == (0, 1)
+    assert released.acquired == 1
+    assert released.overflow == 0
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_counted_with_wait_time():
+    pool = make_pool()
+
+    def exhaust_pool():
+        connection = pool.connect()
+        with pytest.raises(PoolTimeoutError):
+            pool.connect()
+        connection.close()
+
+    await greenlet_spawn(exhaust_pool)
+
+    stats = pool.stats()
+    assert stats.timeouts == 1
+    assert stats.wait_seconds_max >= 0.01
+    assert stats.wait_seconds_total >= stats.wait_seconds_max
@@ -0,0 +1,193 @@
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.adapters.sqlalchemy.instrumentation import db_operation, instrument_engine
+from src.adapters.sqlalchemy.query_log import (
+    EXPLAIN_OPERATION,
+    QueryLog,
+    fingerprint_statement,
+    is_explainable,
+    redact_plan,
+)
+
+
+def test_fingerprint_ignores_literals_parameters_and_list_lengths():
+    one, normalized = fingerprint_statement("SELECT quiz.id FROM quiz WHERE quiz.id IN ($1, $2)\n  LIMIT 10")
+    other, _ = fingerprint_statement("SELECT quiz.id FROM quiz WHERE quiz.id IN ($1, $2, $3, $4) LIMIT 20")
+    literal, _ = fingerprint_statement("SELECT quiz.id FROM quiz WHERE quiz.id IN ('a', 'it''s') LIMIT 5")
+
+    assert normalized == "SELECT quiz.id FROM quiz WHERE quiz.id IN (?, ...) LIMIT ?"
+    assert one == other == literal
+
+
+def test_fingerprint_collapses_multi_row_values():
+    two_rows, normalized = fingerprint_statement("INSERT INTO subject (id, name) VALUES ($1, $2), ($3, $4)")
+    three_rows, _ = fingerprint_statement(
+        "INSERT INTO subject (id, name) VALUES ($1, $2), ($3, $4), ($5, $6)"
+    )
+
+    assert normalized == "INSERT INTO subject (id, name) VALUES (?, ...), ..."
+    assert two_rows == three_rows
+
+
+@pytest.mark.parametrize(
+    "statement, explainable",
+    [
+        ("SELECT quiz.id FROM quiz", True),
+        ("SELECT quiz.id FROM quiz FOR UPDATE SKIP LOCKED", False),
+        ("select quiz.id from quiz for no key update", False),
+        ("UPDATE quiz SET name=?", False),
+        ("WITH x AS (DELETE FROM quiz RETURNING id) SELECT id FROM x", False),
+    ],
+)
+def test_only_plain_selects_are_explained(statement, explainable):
+    assert is_explainable(statement) is explainable
+
+
+def test_plan_values_are_redacted_and_statistics_kept():
+    plan = "\n".join([
+        "Limit  (cost=0.15..8.17 rows=1 width=16) (actual time=0.011..0.012 rows=1 loops=1)",
+        "  ->  Index Scan using quiz_pkey on quiz  (cost=0.15..8.17 rows=1 width=16)",
+        "        Index Cond: (id = 'a3b1c2d4-0000-0000-0000-000000000000'::uuid)",
+        "        Filter: ((name ~~ '%it''s secret%'::text) AND (question_count > 42))",
+        "        Rows Removed by Filter: 5",
+        "        Buffers: shared hit=3",
+        "Execution Time: 0.030 ms",
+    ])
+
+    assert redact_plan(plan) == "\n".join([
+        "Limit  (cost=0.15..8.17 rows=1 width=16) (actual time=0.011..0.012 rows=1 loops=1)",
+        "  ->  Index Scan using quiz_pkey on quiz  (cost=0.15..8.17 rows=1 width=16)",
+        "        Index Cond: (id = ?::uuid)",
+        "        Filter: ((name ~~ ?::text) AND (question_count > ?))",
+        "        Rows Removed by Filter: 5",
+        "        Buffers: shared hit=3",
+        "Execution Time: 0.030 ms",
+    ])
+
+
+def test_counts_and_p95_per_fingerprint():
+    query_log = QueryLog(slow_seconds=10, window=100)
+    for milliseconds in range(1, 101):
+        statement = f"SELECT id FROM quiz WHERE id = {milliseconds}"
+        query_log.observe(statement, milliseconds / 1000, "quiz.get_by_id")
+    query_log.observe("SELECT id FROM subject", 0.5, "subject.get_all")
+
+    queries = query_log.stats().queries
+
+    assert [query.operation for query in queries] == ["quiz.get_by_id", "subject.get_all"]
+    assert queries[0].calls == 100
+    assert queries[0].p95_seconds == pytest.approx(0.095)
+    assert queries[0].max_seconds == pytest.approx(0.1)
+    assert queries[0].slow_calls == 0
+    assert queries[1].p95_seconds == 0.5
+
+
+def test_fingerprints_are_bounded():
+    query_log = QueryLog(slow_seconds=10, max_fingerprints=1)
+    query_log.observe("SELECT id FROM quiz", 0.001, "quiz.get_all")
+    query_log.observe("SELECT id FROM subject", 0.001, "subject.get_all")
+
+    stats = query_log.stats()
+    assert [query.statement for query in stats.queries] == ["SELECT id FROM quiz"]
+    assert stats.untracked_calls == 1
+
+
+def test_slow_queries_are_logged_without_parameters_and_sampled_for_explain(caplog):
+    samples = iter([0.5, 0.01])
+    query_log = QueryLog(slow_seconds=0.1, explain_sample_rate=0.1, sample=lambda: next(samples))
+
+    with caplog.at_level(logging.WARNING):
+        query_log.observe("SELECT id FROM quiz WHERE name = $1", 0.05, "quiz.search", ("secret",))
+        query_log.observe("SELECT id FROM quiz WHERE name = $1", 0.2, "quiz.search", ("secret",))
+        query_log.observe("SELECT id FROM quiz WHERE name = $1", 0.3, "quiz.search", ("secret",))
+        query_log.observe("UPDATE quiz SET name = $1", 0.3, "quiz.update_one", ("secret",))
+
+    assert len(caplog.records) == 3
+    assert "secret" not in caplog.text
+    assert "SELECT id FROM quiz WHERE name = ?" in caplog.text
+    assert list(query_log._pending.values()) == [("SELECT id FROM quiz WHERE name = $1", ("secret",))]
+    assert query_log.stats().queries[0].slow_calls == 2
+
+
+def test_slow_queries_are_not_explained_when_sampling_is_off():
+    query_log = QueryLog(slow_seconds=0.1, sample=lambda: 0.0)
+
+    query_log.observe("SELECT id FROM quiz", 0.3, "quiz.get_all", ())
+
+    assert not query_log._pending
+
+
+def test_engine_statements_reach_the_query_log():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    query_log = QueryLog(slow_seconds=10)
+    query_log.listen(engine)
+    query_log.listen(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("select 1"))
+        connection.execute(text("select 2"))
+
+    [query] = query_log.stats().queries
+    assert query.statement == "select ?"
+    assert query.calls == 2
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def exec_driver_sql(self, statement, parameters):
+        self.engine.executed.append((statement, parameters, db_operation.get()))
+        if "broken" in statement:
+            raise RuntimeError("relation does not exist")
+        return [
+            ("Seq Scan on quiz",),
+            ("  Filter: (id = 'secret'::uuid)",),
+            ("  Buffers: shared hit=1",),
+        ]
+
+    async def rollback(self):
+        self.engine.rolled_back += 1
+
+
+class FakeEngine:
+    def __init__(self):
+        self.executed = []
+        self.rolled_back = 0
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+@pytest.mark.asyncio
+async def test_explain_pending_stores_plans_and_survives_failures():
+    query_log = QueryLog(slow_seconds=0.1, explain_sample_rate=1.0, sample=lambda: 0.0)
+    query_log.observe("SELECT id FROM broken", 0.3, "quiz.get_all", ())
+    query_log.observe("SELECT id FROM quiz WHERE id = $1", 0.3, "quiz.get_by_id", ("id",))
+    engine = FakeEngine()
+
+    assert await query_log.explain_pending(engine) == 2
+    assert await query_log.explain_pending(engine) == 0
+
+    assert engine.executed == [
+        ("EXPLAIN (ANALYZE, BUFFERS) SELECT id FROM broken", (), EXPLAIN_OPERATION),
+        ("EXPLAIN (ANALYZE, BUFFERS) SELECT id FROM quiz WHERE id = $1", ("id",), EXPLAIN_OPERATION),
+    ]
+    assert engine.rolled_back == 1
+    plans = {query.statement: query.plan for query in query_log.stats().queries}
+    assert plans == {
+        "SELECT id FROM broken": None,
+        "SELECT id FROM quiz WHERE id = ?": (
+            "Seq Scan on quiz\n  Filter: (id = ?::uuid)\n  Buffers: shared hit=1"
+        ),
+    }
+    assert db_operation.get() is None
@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.adapters.sqlalchemy.routing import PIN_PRIMARY, READ_ONLY, RoutingSession
+
+
+@pytest.fixture(name="session")
+def session_f():
+    # Engine не подключается к базе, пока им не воспользовались.
+    primary = create_async_engine("postgresql+asyncpg://u:p@primary:5432/quiz")
+    replica = create_async_engine("postgresql+asyncpg://u:p@replica:5432/quiz")
+    return RoutingSession(primary=primary, replica=replica)
+
+
+def test_writes_go_to_primary(session: RoutingSession):
+    assert session.get_bind() is session.primary
+
+
+def test_read_only_goes_to_replica(session: RoutingSession):
+    session.info[READ_ONLY] = True
+    assert session.get_bind() is session.replica
+
+
+def test_pinned_read_only_goes_to_primary(session: RoutingSession):
+    session.info[READ_ONLY] = True
+    session.info[PIN_PRIMARY] = True
+    assert session.get_bind() is session.primary
@@ -0,0 +1,85 @@
+import gzip
+import zlib
+from types import SimpleNamespace
+import pytest
+from sanic import raw
+
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
+from src.api.compression import choose_encoding, compress_response
+
+
+BODY = b'{"items": [' + b'{"name": "quiz"}, ' * 200 + b"]}"
+
+
+def make_request(accept_encoding="gzip", query_string=""):
+    return SimpleNamespace(
+        headers={"accept-encoding": accept_encoding},
+        path="/api/quiz-admin/subject",
+        query_string=query_string,
+        app=SimpleNamespace(
+            ctx=SimpleNamespace(compressed_body_cache=VersionedLRUCache(max_size=10, ttl=60))
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        (None, None),
+        ("", None),
+        ("gzip, deflate, br", "gzip"),
+        ("deflate", "deflate"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("gzip;q=0, deflate;q=0", None),
+        ("*", "gzip"),
+        ("*;q=0.1, gzip;q=0", "deflate"),
+        ("br, identity", None),
+    ],
+)
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+async def test_compress_response(encoding, decompress):
+    response = raw(BODY, content_type="application/json")
+
+    await compress_response(make_request(encoding), response)
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert decompress(response.body) == BODY
+
+
+@pytest.mark.asyncio
+async def test_small_body_is_not_compressed():
+    response = raw(b"{}", content_type="application/json")
+    await compress_response(make_request(), response)
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+@pytest.mark.asyncio
+async def test_not_modified_and_binary_responses_are_untouched():
+    for response in (raw(b"", status=304), raw(BODY, content_type="image/png")):
+        await compress_response(make_request(), response)
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_compressed_body_is_memoized_by_etag():
+    request = make_request()
+    cache = request.app.ctx.compressed_body_cache
+    for _ in range(2):
+        response = raw(
+            BODY, content_type="application/json", headers={"ETag": '"subject.7"', "Vary": "Origin"}
+        )
+        await compress_response(request, response)
+        assert response.headers["etag"] == 'W/"subject.7"'
+        assert response.headers["vary"] == "Origin, Accept-Encoding"
+    assert cache.stats().hits == 1
+
+    # Без ETag тело не кэшируется: неизвестно, изменится ли оно.
+    await compress_response(request, raw(BODY, content_type="application/json"))
+    assert cache.stats().size == 1
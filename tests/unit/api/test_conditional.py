@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+import pytest
+
+from src.api.conditional import if_match_version, is_not_modified, make_etag, not_modified
+from src.application.domain.exceptions import MalformedRequest, StaleItemVersion
+
+
+def request_with(if_none_match=None):
+    headers = {} if if_none_match is None else {"If-None-Match": if_none_match}
+    return SimpleNamespace(headers=headers)
+
+
+def test_make_etag_is_quoted():
+    assert make_etag("quiz", 3) == '"quiz.3"'
+    assert make_etag(3, 1) == '"3.1"'
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ('"quiz.3"', True),
+        ('"quiz.2"', False),
+        ('"quiz.2", "quiz.3"', True),
+        ('W/"quiz.3"', True),
+        ("*", True),
+    ],
+)
+def test_is_not_modified(header, expected):
+    assert is_not_modified(request_with(header), '"quiz.3"') is expected
+
+
+def test_not_modified_keeps_etag():
+    response = not_modified('"quiz.3"')
+    assert response.status == 304
+    assert response.headers["ETag"] == '"quiz.3"'
+    assert not response.body
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("*", None),
+        ('"5"', 5),
+        ('"3.7"', 3),
+        ('W/"3.7"', 3),
+    ],
+)
+def test_if_match_version(header, expected):
+    headers = {} if header is None else {"If-Match": header}
+    assert if_match_version(SimpleNamespace(headers=headers)) == expected
+
+
+@pytest.mark.parametrize("header", ['"quiz.3"', '"3.7", "4.7"', '""', 'W/"abc"'])
+def test_if_match_with_foreign_etag_fails_precondition(header):
+    with pytest.raises(StaleItemVersion):
+        if_match_version(SimpleNamespace(headers={"If-Match": header}))
+
+
+@pytest.mark.parametrize("header", ["3", '"3', '"3.7",', "", 'w/"3"', '"3 7"'])
+def test_malformed_if_match_is_bad_request(header):
+    with pytest.raises(MalformedRequest):
+        if_match_version(SimpleNamespace(headers={"If-Match": header}))
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+import pytest
+from sanic import json
+
+from src.api.idempotency import run_idempotent
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.idempotency import IdempotencyService
+from src.application.ports.idempotency import StoredResponse
+
+
+def make_request(key=None, body=b'{"name": "Math"}'):
+    headers = {} if key is None else {"Idempotency-Key": key}
+    return SimpleNamespace(headers=headers, method="POST", path="/api/quiz-admin/subject", body=body)
+
+
+def make_idempotency(stored=None):
+    idempotency = AsyncMock()
+    idempotency.get_response.return_value = stored
+    idempotency.object_id = IdempotencyService.object_id
+    return idempotency
+
+
+@pytest.mark.asyncio
+async def test_without_key_runs_create_as_is():
+    create = AsyncMock(return_value=json({"id": "1"}, status=201))
+    idempotency = make_idempotency()
+
+    await run_idempotent(make_request(), idempotency, create)
+
+    create.assert_awaited_once_with(None)
+    idempotency.save_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_first_request_saves_response_with_key_derived_id():
+    create = AsyncMock(return_value=json({"id": "1"}, status=201))
+    idempotency = make_idempotency()
+
+    await run_idempotent(make_request("key"), idempotency, create)
+
+    create.assert_awaited_once_with(IdempotencyService.object_id("key"))
+    key, _, status, body = idempotency.save_response.await_args.args
+    assert (key, status, body) == ("key", 201, b'{"id":"1"}')
+
+
+@pytest.mark.asyncio
+async def test_retry_is_replayed_without_create():
+    create = AsyncMock()
+    stored = StoredResponse(fingerprint="f", status=201, body=b'{"id":"1"}', created_at=None)
+
+    response = await run_idempotent(make_request("key"), make_idempotency(stored), create)
+
+    create.assert_not_awaited()
+    assert (response.status, response.body) == (201, b'{"id":"1"}')
+    assert response.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_failed_create_is_not_saved():
+    idempotency = make_idempotency()
+    await run_idempotent(make_request("key"), idempotency, AsyncMock(return_value=json({}, status=409)))
+    idempotency.save_response.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_too_long_key():
+    with pytest.raises(UnprocessableItem):
+        await run_idempotent(make_request("k" * 256), make_idempotency(), AsyncMock())
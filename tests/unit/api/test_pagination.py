@@ -0,0 +1,75 @@
+from uuid import uuid4
+import pytest
+from pydantic import ValidationError
+
+from src.api.pagination import (
+    PageQueryModel,
+    SearchQueryModel,
+    decode_cursor,
+    decode_ranked_cursor,
+    encode_cursor,
+    encode_ranked_cursor,
+)
+from src.api.quiz_admin import MAX_TIME_FILTER_SECONDS, QuizSummaryQueryModel
+
+
+def test_cursor_round_trip():
+    key = uuid4()
+    cursor = encode_cursor(key)
+    assert str(key) not in cursor
+    assert decode_cursor(cursor) == key
+
+
+def test_encode_empty_cursor():
+    assert encode_cursor(None) is None
+
+
+def test_page_query_decodes_cursor():
+    key = uuid4()
+    query = PageQueryModel(limit=10, cursor=encode_cursor(key))
+    assert query.cursor == key
+
+
+def test_page_query_rejects_invalid_cursor():
+    with pytest.raises(ValidationError):
+        PageQueryModel(cursor="not a cursor")
+
+
+def test_page_query_rejects_too_big_limit():
+    with pytest.raises(ValidationError):
+        PageQueryModel(limit=100_000)
+
+
+def test_ranked_cursor_round_trip():
+    # ts_rank_cd отдаёт real; после float8 в курсоре значение должно вернуться точно.
+    key = (0.1, uuid4())
+    assert decode_ranked_cursor(encode_ranked_cursor(key)) == key
+
+
+def test_search_query_decodes_cursor():
+    key = (0.5, uuid4())
+    query = SearchQueryModel(q="quiz", cursor=encode_ranked_cursor(key))
+    assert query.cursor == key
+
+
+def test_search_query_rejects_invalid_cursor():
+    with pytest.raises(ValidationError):
+        SearchQueryModel(q="quiz", cursor=encode_cursor(uuid4())[:10])
+
+
+def test_search_query_rejects_empty_text():
+    with pytest.raises(ValidationError):
+        SearchQueryModel(q="")
+
+
+@pytest.mark.parametrize("time", ["1e300", "inf", "nan", "-1"])
+def test_summary_query_rejects_time_out_of_timedelta_range(time):
+    with pytest.raises(ValidationError):
+        QuizSummaryQueryModel(min_time=time)
+    with pytest.raises(ValidationError):
+        QuizSummaryQueryModel(max_time=time)
+
+
+def test_summary_query_accepts_largest_time():
+    query = QuizSummaryQueryModel(max_time=MAX_TIME_FILTER_SECONDS)
+    assert query.to_filter().max_time.days == 999999999
@@ -0,0 +1,32 @@
+from uuid import uuid4
+
+from src.api.quiz_admin import QuizModel, quiz_model_to_dto
+
+
+def test_quiz_body_keeps_question_and_answer_ids():
+    question_id, answer_id = uuid4(), uuid4()
+    body = QuizModel.model_validate(
+        {
+            "name": "Quiz",
+            "description": "",
+            "time": 600,
+            "difficulty": "easy",
+            "subject": {"id": str(uuid4()), "name": "Math", "description": ""},
+            "questions": [
+                {
+                    "id": str(question_id),
+                    "text": "Q",
+                    "answers": [
+                        {"id": str(answer_id), "text": "A", "is_correct": True},
+                        {"text": "new answer", "is_correct": False},
+                    ],
+                }
+            ],
+        }
+    )
+
+    [question] = quiz_model_to_dto(body).questions
+
+    # GET -> PUT не должен менять id: иначе нормализованный расклад переписывает все строки.
+    assert question.id == question_id
+    assert [answer.id for answer in question.answers] == [answer_id, None]
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+import pytest
+
+from src.api.metrics import REQUEST_DURATION, UNMATCHED_ROUTE, observe_request, start_request_timer
+
+
+def make_request(route_path=None):
+    route = SimpleNamespace(path=route_path) if route_path is not None else None
+    return SimpleNamespace(ctx=SimpleNamespace(), route=route, method="GET")
+
+
+@pytest.mark.asyncio
+async def test_request_is_observed_by_route_template():
+    labels = ("/api/quiz/<quiz_id:uuid>", "GET", 200)
+    before = REQUEST_DURATION.count(labels)
+    request = make_request("api/quiz/<quiz_id:uuid>")
+
+    await start_request_timer(request)
+    await observe_request(request, SimpleNamespace(status=200))
+
+    assert REQUEST_DURATION.count(labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_unmatched_and_untimed_requests():
+    labels = (UNMATCHED_ROUTE, "GET", 404)
+    before = REQUEST_DURATION.count(labels)
+    request = make_request()
+
+    # Без отметки начала (сигнал не сработал) запрос не учитывается.
+    await observe_request(request, SimpleNamespace(status=404))
+    assert REQUEST_DURATION.count(labels) == before
+
+    await start_request_timer(request)
+    await observe_request(request, SimpleNamespace(status=404))
+    assert REQUEST_DURATION.count(labels) == before + 1
@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+import pytest
+
+from src.adapters.sqlalchemy.routing import USED
+from src.api.request_session import RequestSessions
+
+
+class FakeSession:
+    def __init__(self):
+        self.info = {}
+        self.transaction = False
+        self.closed = False
+
+    def begin(self):
+        self.info[USED] = True
+        self.transaction = True
+
+    def in_transaction(self):
+        return self.transaction
+
+    async def close(self):
+        self.transaction = False
+        self.closed = True
+
+
+def make_request():
+    return SimpleNamespace(ctx=SimpleNamespace(), cookies={}, method="GET", path="/api/quiz-admin/subject")
+
+
+def test_one_session_per_request():
+    sessions = RequestSessions(FakeSession)
+    request = make_request()
+
+    assert sessions.supply(request) is sessions.supply(request)
+    assert sessions.supply(make_request()) is not request.ctx.session
+    assert sessions.stats().opened == 2
+
+
+@pytest.mark.asyncio
+async def test_close_counts_unused_and_leaked():
+    sessions = RequestSessions(FakeSession)
+
+    # Инъекция без запросов к базе.
+    unused = make_request()
+    sessions.supply(unused)
+    # Обработчик упал посреди транзакции.
+    leaked = make_request()
+    sessions.supply(leaked).begin()
+    # UnitOfWork отработала и закрыла сессию сама.
+    clean = make_request()
+    session = sessions.supply(clean)
+    session.begin()
+    await session.close()
+
+    for request in (unused, leaked, clean, make_request()):
+        await sessions.close(request)
+
+    assert unused.ctx.session.closed and leaked.ctx.session.closed
+    assert sessions.stats().opened == 3
+    assert sessions.stats().unused == 1
+    assert sessions.stats().leaked == 1
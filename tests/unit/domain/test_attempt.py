@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import pytest
+from src.application.domain.attempt import AnswerKey, Attempt
+from src.application.domain.exceptions import ForbiddenResourceForUser, ItemDataConflict, UnprocessableItem
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(name="quiz")
+def quiz_fixture():
+    return Quiz(
+        id=uuid4(),
+        name="Sample Quiz",
+        description="A sample quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.EASY,
+        subject=Subject(id=uuid4(), name="subj", description="subject1"),
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Single",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            ),
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Multiple",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right 1", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Right 2", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            ),
+        ],
+    )
+
+
+@pytest.fixture(name="key")
+def key_fixture(quiz):
+    return AnswerKey.from_quiz(quiz, quiz_version=3)
+
+
+def test_answer_key_from_quiz(quiz, key):
+    single, multiple = quiz.questions
+    assert key.quiz_version == 3
+    assert key.correct_answers[single.id] == {single.answers[0].id}
+    assert key.correct_answers[multiple.id] == {multiple.answers[0].id, multiple.answers[1].id}
+    assert key.question_by_answer[multiple.answers[2].id] == multiple.id
+
+
+def test_check_answers_rejects_foreign_answer(quiz, key):
+    single, multiple = quiz.questions
+    key.check_answers(single.id, frozenset([single.answers[1].id]))
+    with pytest.raises(UnprocessableItem):
+        key.check_answers(single.id, frozenset([multiple.answers[0].id]))
+    with pytest.raises(UnprocessableItem):
+        key.check_answers(uuid4(), frozenset())
+
+
+def test_score_counts_only_exact_choices(quiz, key):
+    single, multiple = quiz.questions
+    assert key.score({single.id: frozenset([single.answers[0].id])}) == 1
+    assert key.score({multiple.id: frozenset([multiple.answers[0].id])}) == 0
+    assert key.score({
+        single.id: frozenset([single.answers[0].id]),
+        multiple.id: frozenset([multiple.answers[0].id, multiple.answers[1].id]),
+    }) == 2
+
+
+def test_attempt_start_uses_quiz_time(key):
+    attempt = Attempt.start(uuid4(), 7, key, NOW)
+    assert attempt.deadline == NOW + timedelta(minutes=30)
+    assert attempt.quiz_version == 3
+    assert attempt.question_count == 2
+    assert not attempt.is_finished
+
+
+def test_attempt_owner_and_deadline(key):
+    attempt = Attempt.start(uuid4(), 7, key, NOW)
+    attempt.check_owner(7)
+    with pytest.raises(ForbiddenResourceForUser):
+        attempt.check_owner(8)
+    attempt.check_can_answer(NOW + timedelta(minutes=29))
+    with pytest.raises(ItemDataConflict):
+        attempt.check_can_answer(NOW + timedelta(minutes=31))
+
+
+def test_attempt_finish(quiz, key):
+    single, _ = quiz.questions
+    attempt = Attempt.start(uuid4(), 7, key, NOW)
+    attempt.answers = {single.id: frozenset([single.answers[0].id])}
+    attempt.finish(key, NOW + timedelta(minutes=5))
+    assert attempt.score == 1
+    assert attempt.finished_at == NOW + timedelta(minutes=5)
+    with pytest.raises(ItemDataConflict):
+        attempt.check_can_answer(NOW + timedelta(minutes=6))
+    with pytest.raises(ItemDataConflict):
+        attempt.finish(key, NOW + timedelta(minutes=6))
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from uuid import uuid4
+import pytest
+from src.application.domain.attempt import AnswerKey
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.domain.grading import BatchGrader
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+
+
+@pytest.fixture(name="quiz")
+def quiz_fixture():
+    return Quiz(
+        id=uuid4(),
+        name="Sample Quiz",
+        description="A sample quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.EASY,
+        subject=Subject(id=uuid4(), name="subj", description="subject1"),
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Single",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            ),
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Multiple",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right 1", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Right 2", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            ),
+        ],
+    )
+
+
+def test_grade_batch(quiz):
+    single, multiple = quiz.questions
+    right, wrong = single.answers
+    right1, right2, wrong3 = multiple.answers
+    submissions = [
+        {single.id: [right.id], multiple.id: [right1.id, right2.id]},
+        {single.id: [wrong.id], multiple.id: [right1.id]},
+        {multiple.id: [right1.id, right2.id, wrong3.id]},
+        {},
+    ]
+
+    grades = BatchGrader.from_quiz(quiz).grade(submissions)
+
+    assert grades.scores.tolist() == [2, 0, 0, 0]
+    assert grades.question_correct.tolist() == [[True, True], [False, False], [False, False], [False, False]]
+    assert grades.question_credit.tolist() == [[1.0, 1.0], [0.0, 0.5], [0.0, 0.5], [0.0, 0.0]]
+    assert grades.partial_credit.tolist() == [2.0, 0.5, 0.5, 0.0]
+
+
+def test_scores_match_answer_key(quiz):
+    single, multiple = quiz.questions
+    submissions = [
+        {single.id: frozenset([answer.id]), multiple.id: frozenset([first.id, second.id])}
+        for answer in single.answers
+        for first in multiple.answers
+        for second in multiple.answers
+    ]
+    key = AnswerKey.from_quiz(quiz, quiz_version=1)
+
+    grades = BatchGrader.from_quiz(quiz).grade(submissions)
+
+    assert grades.scores.tolist() == [key.score(submission) for submission in submissions]
+
+
+def test_unknown_answer_is_rejected(quiz):
+    with pytest.raises(UnprocessableItem):
+        BatchGrader.from_quiz(quiz).grade([{quiz.questions[0].id: [uuid4()]}])
@@ -168,3 +168,45 @@ def test_quiz_set_invalid_questions(subject, valid_questions):
 
     with pytest.raises(ValueError, match="Quiz must have between 1 and 100 questions"):
         quiz.questions = []
+
+
+def test_quiz_reconstitute_equals_validated(subject, valid_questions):
+    quiz = Quiz(
+        id=uuid4(),
+        name="Sample Quiz",
+        description="A sample quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.EASY,
+        subject=subject,
+        _questions=valid_questions,
+    )
+    restored = Quiz.reconstitute(
+        id=quiz.id,
+        name=quiz.name,
+        description=quiz.description,
+        time=quiz.time,
+        difficulty=quiz.difficulty,
+        subject=quiz.subject,
+        questions=quiz.questions,
+    )
+    assert restored == quiz
+
+
+def test_quiz_reconstitute_keeps_setter_validation(subject, valid_questions):
+    quiz = Quiz.reconstitute(
+        id=uuid4(),
+        name="Sample Quiz",
+        description="A sample quiz",
+        time=timedelta(minutes=30),
+        difficulty=Difficulty.EASY,
+        subject=subject,
+        questions=valid_questions,
+    )
+    with pytest.raises(ValueError):
+        quiz.time = timedelta(seconds=1)
+
+
+def test_domain_objects_have_no_instance_dict(subject, valid_questions):
+    question = valid_questions[0]
+    for obj in (subject, question, question.answers[0]):
+        assert not hasattr(obj, "__dict__")
@@ -0,0 +1,125 @@
+from unittest.mock import AsyncMock
+from datetime import timedelta
+from uuid import uuid4
+import pytest
+
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
+from src.application.admin_batch import AdminBatchService, BatchAction, BatchEntity, BatchOperation
+from src.application.domain.exceptions import ItemNotFound, UnprocessableItem
+from src.application.domain.quiz import Difficulty, Subject
+from src.application.ports.uow import IsolationLevel
+from src.application.quiz_admin import (
+    ChoiceAnswerAdminDTO,
+    ChoiceQuestionAdminDTO,
+    QuizAdminDTO,
+    QuizAdminService,
+    SubjectAdminService,
+    SubjectDTO,
+)
+from tests.unit.test_quiz_admin import FakeUoW
+
+
+class FakeSavepointUoW(FakeUoW):
+    def __init__(self):
+        super().__init__()
+        self.isolation = None
+        self.savepoints = 0
+        self.commits = 0
+
+    def with_isolation(self, level):
+        self.isolation = level
+        return self
+
+    def savepoint(self):
+        self.savepoints += 1
+        return super().savepoint()
+
+    async def commit(self):
+        self.commits += 1
+        await super().commit()
+
+
+@pytest.fixture(name="uow")
+def uow_f():
+    return FakeSavepointUoW()
+
+
+@pytest.fixture(name="cache")
+def cache_f():
+    return VersionedLRUCache(max_size=10, ttl=60)
+
+
+@pytest.fixture(name="batch_service")
+def batch_service_f(uow, cache):
+    return AdminBatchService(
+        uow,
+        SubjectAdminService(uow=uow, repo=AsyncMock()),
+        QuizAdminService(uow=uow, repo=AsyncMock(), cache=cache),
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_commits_once_and_reports_each_operation(batch_service, uow):
+    subject_repo = batch_service.services[BatchEntity.SUBJECT].repo
+    quiz_repo = batch_service.services[BatchEntity.QUIZ].repo
+    created_id, updated_id, missing_id, quiz_id = uuid4(), uuid4(), uuid4(), uuid4()
+    subject_repo.add_one.return_value = created_id
+    subject_repo.update_one.return_value = updated_id
+    quiz_repo.delete_one.side_effect = [ItemNotFound(cause_entity="QuizModel"), quiz_id]
+
+    subject_dto = SubjectDTO(name="Math", description="")
+    operations = [
+        BatchOperation(BatchAction.CREATE, BatchEntity.SUBJECT, dto=subject_dto),
+        BatchOperation(BatchAction.UPDATE, BatchEntity.SUBJECT, updated_id, subject_dto),
+        BatchOperation(BatchAction.DELETE, BatchEntity.QUIZ, missing_id),
+        BatchOperation(BatchAction.DELETE, BatchEntity.QUIZ, quiz_id),
+    ]
+
+    results = await batch_service.run(operations, IsolationLevel.REPEATABLE_READ)
+
+    assert [result.id for result in results] == [created_id, updated_id, None, quiz_id]
+    assert isinstance(results[2].error, ItemNotFound)
+    assert subject_repo.update_one.call_args.args[0] == updated_id
+    assert uow.isolation is IsolationLevel.REPEATABLE_READ
+    assert uow.savepoints == 4
+    assert uow.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_quiz_fails_only_its_operation(batch_service, uow):
+    subject_repo = batch_service.services[BatchEntity.SUBJECT].repo
+    subject_repo.add_one.side_effect = [uuid4(), uuid4()]
+    subject_dto = SubjectDTO(name="Math", description="")
+    # Ни одного правильного ответа: домен отвергает квиз ValueError.
+    invalid_quiz = QuizAdminDTO(
+        name="Quiz",
+        description="",
+        time=timedelta(minutes=10),
+        difficulty=Difficulty.EASY,
+        subject=Subject(id=uuid4(), name="Math", description=""),
+        questions=[
+            ChoiceQuestionAdminDTO(text="Q", answers=[ChoiceAnswerAdminDTO(is_correct=False, text="A")])
+        ],
+    )
+    operations = [
+        BatchOperation(BatchAction.CREATE, BatchEntity.SUBJECT, dto=subject_dto),
+        BatchOperation(BatchAction.CREATE, BatchEntity.QUIZ, dto=invalid_quiz),
+        BatchOperation(BatchAction.CREATE, BatchEntity.SUBJECT, dto=subject_dto),
+    ]
+
+    results = await batch_service.run(operations)
+
+    assert [result.error is None for result in results] == [True, False, True]
+    assert isinstance(results[1].error, UnprocessableItem)
+    assert "correct" in results[1].error.detail
+    batch_service.services[BatchEntity.QUIZ].repo.add_one.assert_not_awaited()
+    assert uow.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_unexpected_error_aborts_whole_batch(batch_service, uow):
+    batch_service.services[BatchEntity.SUBJECT].repo.delete_one.side_effect = RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        await batch_service.run([BatchOperation(BatchAction.DELETE, BatchEntity.SUBJECT, uuid4())])
+    assert uow.commits == 0
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
+from src.application.domain.exceptions import UnprocessableItem
+from src.application.idempotency import IdempotencyService
+from tests.unit.test_quiz_admin import FakeUoW
+
+
+class FakeIdempotencyRepository:
+    def __init__(self):
+        self.rows = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.rows.get(key)
+
+    async def save(self, key, response, expired_before):
+        if key not in self.rows or self.rows[key].created_at < expired_before:
+            self.rows[key] = response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def clock_f():
+    return FakeClock()
+
+
+def make_service(repo, clock):
+    return IdempotencyService(
+        FakeUoW(), repo, VersionedLRUCache(max_size=10, ttl=60), ttl=timedelta(hours=1), clock=clock
+    )
+
+
+@pytest.mark.asyncio
+async def test_saved_response_is_replayed(clock):
+    repo = FakeIdempotencyRepository()
+    service = make_service(repo, clock)
+
+    assert await service.get_response("key", "fingerprint") is None
+    await service.save_response("key", "fingerprint", 201, b'{"id": "1"}')
+
+    stored = await service.get_response("key", "fingerprint")
+    assert (stored.status, stored.body) == (201, b'{"id": "1"}')
+    # Повтор в том же процессе отвечает из кэша.
+    assert repo.gets == 1
+
+    # Другой воркер находит ответ в таблице.
+    other_worker = make_service(repo, clock)
+    assert (await other_worker.get_response("key", "fingerprint")).status == 201
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_another_request(clock):
+    service = make_service(FakeIdempotencyRepository(), clock)
+    await service.save_response("key", "fingerprint", 201, b"{}")
+
+    with pytest.raises(UnprocessableItem):
+        await service.get_response("key", "another fingerprint")
+
+
+@pytest.mark.asyncio
+async def test_expired_response_is_ignored(clock):
+    service = make_service(FakeIdempotencyRepository(), clock)
+    await service.save_response("key", "fingerprint", 201, b"{}")
+
+    clock.now += timedelta(hours=2)
+    assert await service.get_response("key", "another fingerprint") is None
+
+
+def test_object_id_is_stable_per_key():
+    assert IdempotencyService.object_id("key") == IdempotencyService.object_id("key")
+    assert IdempotencyService.object_id("key") != IdempotencyService.object_id("other key")
@@ -0,0 +1,53 @@
+import pytest
+
+from src.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_buckets_are_cumulative_on_render():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(("/a",), value)
+
+    assert list(histogram.samples()) == [
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 3.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+    assert histogram.count(("/a",)) == 4
+    assert histogram.count(("/b",)) == 0
+
+
+def test_unlabelled_metrics_are_exported_before_first_event():
+    registry = Registry()
+    registry.register(Counter("timeouts_total", "Timeouts"))
+    registry.register(Histogram("wait_seconds", "Wait", buckets=(1.0,)))
+
+    assert registry.render().splitlines() == [
+        "# HELP timeouts_total Timeouts",
+        "# TYPE timeouts_total counter",
+        "timeouts_total 0",
+        "# HELP wait_seconds Wait",
+        "# TYPE wait_seconds histogram",
+        'wait_seconds_bucket{le="1.0"} 0',
+        'wait_seconds_bucket{le="+Inf"} 0',
+        "wait_seconds_sum 0.0",
+        "wait_seconds_count 0",
+    ]
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("errors_total", "Errors", ("reason",))
+    counter.inc(('say "hi"\\\n',))
+    counter.inc(('say "hi"\\\n',), 2)
+
+    assert list(counter.samples()) == ['errors_total{reason="say \\"hi\\"\\\\\\n"} 3']
+
+
+def test_metric_names_are_unique():
+    registry = Registry()
+    registry.register(Counter("requests_total", "Requests"))
+
+    with pytest.raises(ValueError):
+        registry.register(Counter("requests_total", "Requests"))
@@ -3,8 +3,12 @@ from uuid import UUID, uuid4
 from datetime import timedelta
 import pytest
 
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
 from src.application.ports.uow import UnitOfWork
-from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Quiz, Subject
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+from src.application.domain.exceptions import DuplicateItem, StaleItemVersion, UnprocessableItem
+from src.application.ports.bulk import BulkItemResult
+from src.application.ports.quiz import QuizSearchHit, QuizSummary
 from src.application.quiz_admin import (
     SubjectDTO,
     QuizAdminDTO,
@@ -18,11 +22,25 @@ from src.application.quiz_admin import (
 class FakeUoW(UnitOfWork):
     commited = False
 
+    def __init__(self):
+        self.commit_callbacks = []
+        self.read_only_used = False
+
     async def commit(self):
         self.commited = True
+        for callback in self.commit_callbacks:
+            callback()
+        self.commit_callbacks = []
 
     async def rollback(self): ...
 
+    def on_commit(self, callback):
+        self.commit_callbacks.append(callback)
+
+    def read_only(self):
+        self.read_only_used = True
+        return self
+
 
 @pytest.fixture(name="mock_uow")
 def mock_uow_f():
@@ -37,7 +55,7 @@ def subject_admin_service_f(mock_uow):
 
 @pytest.fixture(name="quiz_admin_service")
 def quiz_admin_service_f(mock_uow):
-    return QuizAdminService(uow=mock_uow, repo=AsyncMock())
+    return QuizAdminService(uow=mock_uow, repo=AsyncMock(), cache=VersionedLRUCache(max_size=10, ttl=60))
 
 
 @pytest.mark.asyncio
@@ -54,6 +72,22 @@ async def test_create_one_subject(subject_admin_service):
     assert isinstance(created_id, UUID)
 
 
+@pytest.mark.asyncio
+async def test_create_many_subjects(subject_admin_service):
+    # Test data
+    dtos = [SubjectDTO(name="History", description=""), SubjectDTO(name="Math", description="")]
+    mock_uow = subject_admin_service.uow
+    results = [BulkItemResult(id=uuid4()), BulkItemResult(error=DuplicateItem())]
+    subject_admin_service.repo.add_many.return_value = results
+
+    # Test create_many
+    created = await subject_admin_service.create_many(dtos)
+    subjects = subject_admin_service.repo.add_many.call_args.args[0]
+    assert [subject.name for subject in subjects] == ["History", "Math"]
+    assert mock_uow.commited
+    assert created == results
+
+
 @pytest.mark.asyncio
 async def test_get_all_subjects(subject_admin_service):
     # Test data
@@ -67,6 +101,7 @@ async def test_get_all_subjects(subject_admin_service):
     assert result[0].id == subject_id
     assert result[0].name == "Geography"
     assert result[0].description == "Geography Subject"
+    assert subject_admin_service.uow.read_only_used
 
 
 @pytest.mark.asyncio
@@ -84,6 +119,18 @@ async def test_update_one_subject(subject_admin_service):
     assert updated_id == subject_id
 
 
+@pytest.mark.asyncio
+async def test_update_one_subject_passes_expected_version(subject_admin_service):
+    subject_id = uuid4()
+    dto = SubjectDTO(name="History", description="")
+    subject_admin_service.repo.update_one.side_effect = StaleItemVersion()
+
+    with pytest.raises(StaleItemVersion):
+        await subject_admin_service.update_one(subject_id, dto, expected_version=3)
+    assert subject_admin_service.repo.update_one.call_args.args[2] == 3
+    assert not subject_admin_service.uow.commited
+
+
 @pytest.mark.asyncio
 async def test_delete_one_subject(subject_admin_service):
     # Test data
@@ -185,3 +232,203 @@ async def test_delete_one_quiz(quiz_admin_service):
     assert quiz_admin_service.repo.delete_one.called
     assert mock_uow.commited
     assert deleted_id == quiz_id
+
+
+@pytest.mark.asyncio
+async def test_get_page_subjects_has_next(subject_admin_service):
+    # Test data
+    subjects = [Subject(id=uuid4(), name=f"Subject {i}", description="") for i in range(3)]
+    subject_admin_service.repo.get_page.return_value = subjects
+
+    # Test get_page
+    page = await subject_admin_service.get_page(2)
+    subject_admin_service.repo.get_page.assert_called_once_with(3, None)
+    assert [item.id for item in page.items] == [subjects[0].id, subjects[1].id]
+    assert page.next_key == subjects[1].id
+
+
+@pytest.mark.asyncio
+async def test_get_page_subjects_last_page(subject_admin_service):
+    # Test data
+    after_id = uuid4()
+    subjects = [Subject(id=uuid4(), name="Subject", description="")]
+    subject_admin_service.repo.get_page.return_value = subjects
+
+    # Test get_page
+    page = await subject_admin_service.get_page(2, after_id)
+    subject_admin_service.repo.get_page.assert_called_once_with(3, after_id)
+    assert len(page.items) == 1
+    assert page.next_key is None
+
+
+@pytest.mark.asyncio
+async def test_get_summary_page_quizzes(quiz_admin_service):
+    # Test data
+    summaries = [
+        QuizSummary(
+            id=uuid4(),
+            name=f"Quiz {i}",
+            time=timedelta(minutes=30),
+            difficulty=Difficulty.EASY,
+            subject_name="Science",
+            question_count=10,
+        )
+        for i in range(2)
+    ]
+    quiz_admin_service.repo.get_summary_page.return_value = summaries
+
+    # Test get_summary_page
+    page = await quiz_admin_service.get_summary_page(1)
+    quiz_admin_service.repo.get_summary_page.assert_called_once_with(2, None, None)
+    assert page.items == summaries[:1]
+    assert page.next_key == summaries[0].id
+
+
+@pytest.mark.asyncio
+async def test_search_quizzes_keys_page_by_rank(quiz_admin_service):
+    hits = [
+        QuizSearchHit(id=uuid4(), name="Quiz", subject_name="Science", difficulty=Difficulty.EASY, rank=rank)
+        for rank in (0.5, 0.25)
+    ]
+    quiz_admin_service.repo.search.return_value = hits
+
+    page = await quiz_admin_service.search("quiz", 1, (0.75, hits[0].id))
+    quiz_admin_service.repo.search.assert_called_once_with("quiz", 2, (0.75, hits[0].id))
+    assert page.items == hits[:1]
+    assert page.next_key == (0.5, hits[0].id)
+
+
+@pytest.mark.asyncio
+async def test_get_document_by_id_quiz(quiz_admin_service):
+    # Test data
+    quiz_id = uuid4()
+    quiz_admin_service.repo.get_document_by_id.return_value = b'{"id": "quiz"}'
+
+    # Test get_document_by_id
+    document = await quiz_admin_service.get_document_by_id(quiz_id)
+    quiz_admin_service.repo.get_document_by_id.assert_called_once_with(quiz_id)
+    assert document == b'{"id": "quiz"}'
+    assert quiz_admin_service.uow.read_only_used
+
+
+def make_quiz(quiz_id):
+    subject = Subject(id=uuid4(), name="Science", description="Science Subject")
+    answers = [
+        ChoiceAnswer(id=uuid4(), is_correct=True, text="Correct Answer"),
+        ChoiceAnswer(id=uuid4(), is_correct=False, text="Wrong Answer"),
+    ]
+    question = ChoiceQuestion(id=uuid4(), text="Sample Question", _answers=answers)
+    return Quiz(
+        id=quiz_id,
+        name="Sample Quiz",
+        description="This is a sample quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.EASY,
+        subject=subject,
+        _questions=[question],
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_at_version_is_cached_per_version(quiz_admin_service):
+    quiz_id = uuid4()
+    quiz_admin_service.repo.get_by_id_with_document_version.return_value = (make_quiz(quiz_id), (2, 1))
+
+    first, versions = await quiz_admin_service.get_by_id_at_version(quiz_id, (2, 1))
+    second, _ = await quiz_admin_service.get_by_id_at_version(quiz_id, (2, 1))
+    assert versions == (2, 1)
+    assert first == second
+    assert first.id == quiz_id
+    assert len(first.questions[0].answers) == 2
+    quiz_admin_service.repo.get_by_id_with_document_version.assert_called_once_with(quiz_id)
+    assert quiz_admin_service.cache.stats().hits == 1
+    # Кэш наполняется из primary.
+    assert not quiz_admin_service.uow.read_only_used
+
+    # Другой воркер изменил квиз: кэш этого процесса об этом не знает, но ключ уже другой.
+    quiz_admin_service.repo.get_by_id_with_document_version.return_value = (make_quiz(quiz_id), (3, 1))
+    _, versions = await quiz_admin_service.get_by_id_at_version(quiz_id, (3, 1))
+    assert versions == (3, 1)
+    assert quiz_admin_service.repo.get_by_id_with_document_version.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_one_quiz_is_seen_at_its_new_version(quiz_admin_service):
+    # Test data
+    quiz_id = uuid4()
+    repo = quiz_admin_service.repo
+    repo.get_by_id_with_document_version.return_value = (make_quiz(quiz_id), (1, 1))
+    repo.update_one.return_value = quiz_id
+    await quiz_admin_service.get_by_id_at_version(quiz_id, (1, 1))
+    subject = Subject(id=uuid4(), name="Science", description="Science Subject")
+    dto = QuizAdminDTO(
+        name="Updated Quiz",
+        description="This is an updated quiz",
+        time=timedelta(minutes=45),
+        difficulty="Medium",
+        subject=subject,
+        questions=[
+            ChoiceQuestionAdminDTO(text="Q", answers=[ChoiceAnswerAdminDTO(is_correct=True, text="A")])
+        ],
+    )
+
+    # Test update_one
+    await quiz_admin_service.update_one(quiz_id, dto)
+    repo.get_by_id_with_document_version.return_value = (make_quiz(quiz_id), (2, 1))
+    await quiz_admin_service.get_by_id_at_version(quiz_id, (2, 1))
+    assert repo.get_by_id_with_document_version.call_count == 2
+    assert quiz_admin_service.cache.stats().invalidations == 0
+
+
+@pytest.mark.asyncio
+async def test_update_one_quiz_breaking_domain_rule_is_unprocessable(quiz_admin_service):
+    dto = QuizAdminDTO(
+        name="Quiz",
+        description="",
+        time=timedelta(minutes=45),
+        difficulty="Medium",
+        subject=Subject(id=uuid4(), name="Science", description=""),
+        questions=[
+            ChoiceQuestionAdminDTO(text="Q", answers=[ChoiceAnswerAdminDTO(is_correct=False, text="A")])
+        ],
+    )
+
+    with pytest.raises(UnprocessableItem):
+        await quiz_admin_service.update_one(uuid4(), dto)
+    quiz_admin_service.repo.update_one.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_question_quiz(quiz_admin_service):
+    quiz = make_quiz(uuid4())
+    question = quiz.questions[0]
+    quiz_admin_service.repo.get_question.return_value = question
+
+    dto = await quiz_admin_service.get_question(quiz.id, question.id)
+    quiz_admin_service.repo.get_question.assert_called_once_with(quiz.id, question.id)
+    assert dto.id == question.id
+    assert len(dto.answers) == 2
+    assert quiz_admin_service.uow.read_only_used
+
+
+@pytest.mark.asyncio
+async def test_update_question_quiz_passes_expected_version(quiz_admin_service):
+    quiz_id, question_id = uuid4(), uuid4()
+    quiz_admin_service.repo.update_question.return_value = question_id
+    dto = ChoiceQuestionAdminDTO(text="Q", answers=[ChoiceAnswerAdminDTO(is_correct=True, text="A")])
+
+    updated_id = await quiz_admin_service.update_question(quiz_id, question_id, dto, expected_version=3)
+    assert updated_id == question_id
+    _, question, expected_version = quiz_admin_service.repo.update_question.call_args.args
+    assert question.id == question_id
+    assert expected_version == 3
+    assert quiz_admin_service.uow.commited
+
+
+@pytest.mark.asyncio
+async def test_update_question_quiz_breaking_domain_rule_is_unprocessable(quiz_admin_service):
+    dto = ChoiceQuestionAdminDTO(text="Q", answers=[ChoiceAnswerAdminDTO(is_correct=False, text="A")])
+
+    with pytest.raises(UnprocessableItem):
+        await quiz_admin_service.update_question(uuid4(), uuid4(), dto)
+    quiz_admin_service.repo.update_question.assert_not_awaited()
@@ -0,0 +1,102 @@
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import orjson
+import pytest
+
+from src.application.domain.exceptions import DuplicateItem
+from src.application.domain.quiz import Subject
+from src.application.ports.bulk import BulkItemResult
+from src.application.quiz_import import QuizImportService, iter_lines
+from tests.unit.test_quiz_admin import FakeUoW
+
+
+SUBJECT = Subject(id=UUID("00000000-0000-0000-0000-000000000001"), name="Science", description="")
+
+
+async def as_stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(lines):
+    return [line async for line in lines]
+
+
+def quiz_line(**overrides) -> bytes:
+    record = {
+        "name": "Quiz",
+        "description": "Imported quiz",
+        "time": 600,
+        "difficulty": "easy",
+        "subject_id": str(SUBJECT.id),
+        "questions": [{"text": "Question", "answers": [{"text": "Answer", "is_correct": True}]}],
+    }
+    record.update(overrides)
+    return orjson.dumps(record) + b"\n"
+
+
+@pytest.fixture(name="import_service")
+def import_service_f():
+    subject_repo = AsyncMock()
+    subject_repo.get_by_ids.return_value = [SUBJECT]
+    quiz_repo = AsyncMock()
+    quiz_repo.add_many.side_effect = lambda quizzes: [BulkItemResult(id=quiz.id) for quiz in quizzes]
+    return QuizImportService(FakeUoW(), quiz_repo, subject_repo, chunk_size=2, max_reported_rejects=10)
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_joins_chunks():
+    lines = await collect(iter_lines(as_stream(b"a", b"b\nc", b"d\n", b"e"), max_line_bytes=10))
+    assert lines == [b"ab", b"cd", b"e"]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_skips_oversized_line():
+    lines = await collect(iter_lines(as_stream(b"ok\n12345", b"6789\nok\n"), max_line_bytes=4))
+    assert lines == [b"ok", None, b"ok"]
+
+
+@pytest.mark.asyncio
+async def test_import_writes_in_chunks(import_service):
+    stream = as_stream(quiz_line(), quiz_line(), quiz_line())
+    progress = []
+
+    report = await import_service.import_ndjson(stream, on_progress=lambda r: progress.append(r.accepted))
+    assert report.accepted == 3
+    assert report.rejected == 0
+    assert import_service.quiz_repo.add_many.call_count == 2
+    assert progress == [2, 3]
+    # Предмет запрашивается один раз на весь импорт.
+    import_service.subject_repo.get_by_ids.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_import_reports_rejected_lines(import_service):
+    stream = as_stream(
+        b"not json\n",
+        quiz_line(time=5),
+        b"\n",
+        quiz_line(subject_id=str(uuid4())),
+        quiz_line(questions=[{"text": "Question", "answers": [{"text": "Answer", "is_correct": "yes"}]}]),
+        quiz_line(description=5),
+        quiz_line(),
+    )
+
+    report = await import_service.import_ndjson(stream)
+    assert report.accepted == 1
+    assert report.rejected == 5
+    assert [rejected.line_number for rejected in report.rejected_lines] == [1, 2, 4, 5, 6]
+    assert "Quiz time must be between" in report.rejected_lines[1].reason
+    assert "not found" in report.rejected_lines[2].reason
+
+
+@pytest.mark.asyncio
+async def test_import_reports_repository_errors(import_service):
+    import_service.quiz_repo.add_many.side_effect = lambda quizzes: [
+        BulkItemResult(error=DuplicateItem(detail="Key (id) already exists.")) for _ in quizzes
+    ]
+
+    report = await import_service.import_ndjson(as_stream(quiz_line(id=str(uuid4()))))
+    assert report.accepted == 0
+    assert report.rejected_lines[0].reason == "Item already exists: Key (id) already exists."
@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+from uuid import uuid4
+import pytest
+
+from src.adapters.inmemory.attempt_state import InMemoryAttemptStateStore
+from src.adapters.inmemory.lru_cache import VersionedLRUCache
+from src.application.domain.exceptions import ForbiddenResourceForUser, ItemDataConflict, UnprocessableItem
+from src.application.domain.quiz import ChoiceAnswer, ChoiceQuestion, Difficulty, Quiz, Subject
+from src.application.quiz_ongoing import QuizOngoingService
+from tests.unit.test_quiz_admin import FakeUoW
+
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeAnswerKeyRepository:
+    def __init__(self):
+        self.keys = {}
+
+    async def add_if_absent(self, key):
+        self.keys.setdefault((key.quiz_id, key.quiz_version), key)
+
+    async def get(self, quiz_id, quiz_version):
+        return self.keys.get((quiz_id, quiz_version))
+
+
+@pytest.fixture(name="quiz")
+def quiz_fixture():
+    return Quiz(
+        id=uuid4(),
+        name="Sample Quiz",
+        description="A sample quiz",
+        _time=timedelta(minutes=30),
+        difficulty=Difficulty.EASY,
+        subject=Subject(id=uuid4(), name="subj", description="subject1"),
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Question 1",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            )
+        ],
+    )
+
+
+@pytest.fixture(name="ongoing_service")
+def ongoing_service_fixture(quiz):
+    quiz_repo = AsyncMock()
+    quiz_repo.get_version.return_value = 1
+    quiz_repo.get_by_id_with_version.return_value = (quiz, 1)
+    return QuizOngoingService(
+        uow=FakeUoW(),
+        attempt_repo=AsyncMock(),
+        attempt_state=InMemoryAttemptStateStore(),
+        quiz_repo=quiz_repo,
+        answer_key_repo=FakeAnswerKeyRepository(),
+        result_repo=AsyncMock(),
+        answer_keys=VersionedLRUCache(max_size=10, ttl=60),
+        clock=lambda: NOW,
+    )
+
+
+async def start(ongoing_service, quiz, user_id=7):
+    attempt = await ongoing_service.start_quiz(quiz.id, user_id)
+    attempt_repo = ongoing_service.attempt_repo
+    attempt_repo.get_by_id.return_value = attempt_repo.add_one.call_args.args[0]
+    return attempt
+
+
+@pytest.mark.asyncio
+async def test_start_quiz_hides_correct_answers(ongoing_service, quiz):
+    attempt = await start(ongoing_service, quiz)
+
+    assert ongoing_service.uow.commited
+    assert attempt.deadline == NOW + timedelta(minutes=30)
+    assert [question.id for question in attempt.questions] == [quiz.questions[0].id]
+    assert not hasattr(attempt.questions[0].answers[0], "is_correct")
+
+
+@pytest.mark.asyncio
+async def test_answer_key_is_built_once_per_version(ongoing_service, quiz):
+    attempt = await start(ongoing_service, quiz)
+    question = quiz.questions[0]
+
+    await ongoing_service.answer_question(attempt.id, 7, question.id, [question.answers[1].id])
+    await ongoing_service.answer_question(attempt.id, 7, question.id, [question.answers[0].id])
+
+    assert ongoing_service.quiz_repo.get_by_id_with_version.await_count == 1
+    answers = await ongoing_service.attempt_state.get_answers(attempt.id)
+    assert answers == {question.id: frozenset([question.answers[0].id])}
+
+
+@pytest.mark.asyncio
+async def test_answer_question_checks_owner_and_answers(ongoing_service, quiz):
+    attempt = await start(ongoing_service, quiz)
+    question = quiz.questions[0]
+
+    with pytest.raises(ForbiddenResourceForUser):
+        await ongoing_service.answer_question(attempt.id, 8, question.id, [question.answers[0].id])
+    with pytest.raises(UnprocessableItem):
+        await ongoing_service.answer_question(attempt.id, 7, question.id, [uuid4()])
+    assert await ongoing_service.attempt_state.get_answers(attempt.id) == {}
+
+
+@pytest.mark.asyncio
+async def test_end_ongoing_quiz_scores_answers(ongoing_service, quiz):
+    attempt = await start(ongoing_service, quiz)
+    question = quiz.questions[0]
+    await ongoing_service.answer_question(attempt.id, 7, question.id, [question.answers[0].id])
+
+    result = await ongoing_service.end_ongoing_quiz(attempt.id, 7)
+
+    assert result.score == 1
+    assert result.question_count == 1
+    assert result.finished_at == NOW
+    assert ongoing_service.attempt_repo.finish.called
+    ongoing_service.result_repo.add_finished_attempt.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_result_reads_from_replica(ongoing_service, quiz):
+    ongoing_service.attempt_repo.get_finished.return_value = []
+
+    assert await ongoing_service.get_quiz_result(quiz.id, 7) == []
+    assert ongoing_service.uow.read_only_used
+
+
+def make_new_version(quiz):
+    """Like PUT /quiz/<id>: same quiz, new question and answer ids."""
+    return Quiz(
+        id=quiz.id,
+        name=quiz.name,
+        description=quiz.description,
+        _time=quiz.time,
+        difficulty=quiz.difficulty,
+        subject=quiz.subject,
+        _questions=[
+            ChoiceQuestion(
+                id=uuid4(),
+                text="Question 1",
+                _answers=[
+                    ChoiceAnswer(id=uuid4(), text="Right", is_correct=True),
+                    ChoiceAnswer(id=uuid4(), text="Wrong", is_correct=False),
+                ],
+            )
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_attempt_keeps_its_questions_after_quiz_update_and_cache_loss(ongoing_service, quiz):
+    attempt = await start(ongoing_service, quiz)
+    question = quiz.questions[0]
+    quiz_repo = ongoing_service.quiz_repo
+    quiz_repo.get_version.return_value = 2
+    quiz_repo.get_by_id_with_version.return_value = (make_new_version(quiz), 2)
+    # Как после перезапуска процесса или вытеснения из кэша.
+    ongoing_service.answer_keys = VersionedLRUCache(max_size=10, ttl=60)
+
+    await ongoing_service.answer_question(attempt.id, 7, question.id, [question.answers[0].id])
+    result = await ongoing_service.end_ongoing_quiz(attempt.id, 7)
+
+    assert result.score == 1
+    assert quiz_repo.get_by_id_with_version.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_attempt_without_snapshot_is_a_conflict(ongoing_service, quiz):
+    attempt = await start(ongoing_service, quiz)
+    ongoing_service.answer_key_repo.keys.clear()
+    ongoing_service.answer_keys = VersionedLRUCache(max_size=10, ttl=60)
+    ongoing_service.quiz_repo.get_by_id_with_version.return_value = (make_new_version(quiz), 2)
+
+    with pytest.raises(ItemDataConflict):
+        await ongoing_service.answer_question(attempt.id, 7, quiz.questions[0].id, [])
+    assert ongoing_service.quiz_repo.get_by_id_with_version.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_new_attempts_start_on_the_new_version(ongoing_service, quiz):
+    await start(ongoing_service, quiz)
+    new_quiz = make_new_version(quiz)
+    ongoing_service.quiz_repo.get_version.return_value = 2
+    ongoing_service.quiz_repo.get_by_id_with_version.return_value = (new_quiz, 2)
+
+    attempt = await start(ongoing_service, quiz)
+
+    assert [question.id for question in attempt.questions] == [new_quiz.questions[0].id]
+    assert set(ongoing_service.answer_key_repo.keys) == {(quiz.id, 1), (quiz.id, 2)}
@@ -0,0 +1,47 @@
+from unittest.mock import AsyncMock
+from uuid import uuid4
+import pytest
+
+from src.application.domain.quiz import Difficulty
+from src.application.ports.quiz_result import DifficultyResultSummary, QuizResultSummary
+from src.application.quiz_results import QuizResultsService
+from tests.unit.test_quiz_admin import FakeUoW
+
+
+@pytest.fixture(name="results_service")
+def results_service_fixture():
+    return QuizResultsService(uow=FakeUoW(), repo=AsyncMock())
+
+
+def summary(quiz_id):
+    return QuizResultSummary(
+        id=quiz_id,
+        name="quiz",
+        subject_name="subject",
+        difficulty=Difficulty.EASY,
+        attempt_count=2,
+        average_score=1.5,
+        average_correct_ratio=0.75,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_page(results_service):
+    summaries = [summary(uuid4()) for _ in range(3)]
+    results_service.repo.get_quiz_page.return_value = summaries
+
+    page = await results_service.get_quiz_page(2)
+
+    results_service.repo.get_quiz_page.assert_awaited_once_with(3, None)
+    assert page.items == summaries[:2]
+    assert page.next_key == summaries[1].id
+    assert results_service.uow.read_only_used
+
+
+@pytest.mark.asyncio
+async def test_get_by_difficulty(results_service):
+    rollups = [DifficultyResultSummary(Difficulty.HARD, 1, 3.0, 0.3)]
+    results_service.repo.get_by_difficulty.return_value = rollups
+
+    assert await results_service.get_by_difficulty() == rollups
+    assert results_service.uow.read_only_used